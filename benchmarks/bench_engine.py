@@ -0,0 +1,388 @@
+"""
+Benchmarks of the hot paths of the engine, run headless with the SDL dummy drivers.
+
+One `Game` is created in the process and put in the hotel, then every benchmark times its cases: the collisions
+and the animation of the player, the wrapping and rendering of the longest dialogue bodies, the lookup of the
+dialogue nodes, the loading of the interactions of every scene, `Game.load_map`, the frames of every video and a
+full frame of `Game.draw` in every scene. Each case is called in rounds long enough to be timed reliably, and the
+median time of a call over the rounds is kept. Run from the root of the repository:
+
+    python benchmarks/bench_engine.py run                     # Writes logs/benchmarks/<date>.json
+    python benchmarks/bench_engine.py run --filter dialogue   # Only the cases whose name contains "dialogue"
+    python benchmarks/bench_engine.py run --save-baseline     # Also writes benchmarks/baseline.json
+    python benchmarks/bench_engine.py compare logs/benchmarks/<date>.json --threshold 10
+
+`compare` exits with status 1 if a case is slower than the baseline by more than the threshold, in percent, so
+that it can run in CI. The baseline is only meaningful on the machine it was measured on.
+
+Functions:
+    - create_game: Creates the game, headless, and returns it in the hotel.
+    - enter_scene: Moves the game to a scene.
+    - longest_bodies: Returns the longest dialogue bodies of the scripts.
+    - bench_player: Cases of `Player.check_collision` and `Player.animate`.
+    - bench_dialogue: Cases of `DialogueBox.wrap_text`, `DialogueBox.render_text` and `DialogueManager.find_node`.
+    - bench_loading: Cases of `load_scene_interactions` and `Game.load_map`.
+    - bench_videos: Cases of `Video.draw`, one per video.
+    - bench_frames: Cases of `Game.draw`, one per scene.
+    - measure: Times a case.
+    - run: Runs the benchmarks and returns the results.
+    - load_results: Reads a results file.
+    - compare: Compares results with a baseline.
+    - main: Runs the command given on the command line.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_DIR = os.path.join(ROOT, "logs", "benchmarks")
+
+SCENES = ["room_101", "floor_1", "floor_0", "underground"]
+BODIES = 5  # Longest dialogue bodies wrapped and rendered
+ROUND_SECONDS = 0.05  # Minimum duration of a round of calls
+
+
+def create_game():
+    """Creates the game with the SDL dummy drivers and starts a new game in Room 101, the preloads done.
+
+    Returns:
+        Game: The game, playing.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import main
+    game = main.Game()
+    game.menu_state = "new_game"
+    game.menu_state = "game"  # Builds Room 101 with `load_map`
+    for name in game.preloader.groups:
+        game.preloader.wait(name)
+    return game
+
+
+def enter_scene(game, name: str) -> None:
+    """Moves the game to a scene, as when the player walks through a door.
+
+    Args:
+        game (Game): The game.
+        name (str): Name of the scene.
+    """
+    scene = game.scenes.get(name)
+    if scene is not game.current_scene:
+        game.change_map(game.current_scene, scene)
+        game.current_scene = scene
+    game.update()
+
+
+def longest_bodies(count: int = BODIES) -> list[str]:
+    """Returns the longest dialogue bodies of the scripts of the scenes.
+
+    Args:
+        count (int, optional): Bodies returned. Defaults to `BODIES`.
+
+    Returns:
+        list[str]: The bodies, the longest first.
+    """
+    from settings import SCRIPTS_DIR
+    from src.engine.script_bundle import script_bundle
+    bodies = set()
+    for name in SCENES:
+        for graph in script_bundle.get_scene(f"{SCRIPTS_DIR}/{name}").values():
+            bodies.update(node['body'] for node in graph['nodes'] if node.get('body'))
+    return sorted(bodies, key=len, reverse=True)[:count]
+
+
+def bench_player(game) -> dict:
+    """Cases of the collisions of the player in every scene, and of its animation.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        dict: Case name -> callable.
+    """
+    player = game.player
+    cases = {}
+    for name in SCENES:
+        def check_collision(name=name) -> None:
+            if game.current_scene.name != name:
+                enter_scene(game, name)
+            player.check_collision(game.all_sprites)
+        cases[f"player.check_collision[{name}]"] = check_collision
+
+    def animate(moving: bool) -> None:
+        player.facing = 'down'
+        player.y_change = 1 if moving else 0
+        player.animate()
+    cases["player.animate[idle]"] = lambda: animate(False)
+    cases["player.animate[walking]"] = lambda: animate(True)
+    return cases
+
+
+def bench_dialogue(game) -> dict:
+    """Cases of the wrapping and the rendering of the longest dialogue bodies, and of the lookup of the nodes.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        dict: Case name -> callable.
+    """
+    from src.ui.interaction import DialogueBox
+    box = DialogueBox.for_screen(game.screen)
+    cases = {}
+    for index, body in enumerate(longest_bodies()):
+        cases[f"dialogue.wrap_text[{index}]"] = lambda body=body: box.wrap_text(body)
+
+        def render_text(body=body, cached: bool = False) -> None:
+            box.set_text(body)
+            if not cached:
+                box.line_surfaces = {}  # Every line rendered, as on the frame revealing them
+            box.new_text = False
+            box.current_time = -10**9  # Fully revealed
+            box.render_text()
+        cases[f"dialogue.render_text[{index}]"] = render_text
+        cases[f"dialogue.render_text_revealed[{index}]"] = lambda body=body: render_text(body, cached=True)
+
+    managers = [manager for name in SCENES for manager in game.scenes.get(name).dialogue_managers.values()]
+    titles = [(manager, node['title']) for manager in managers for node in manager.dialogue_data]
+
+    def find_node() -> None:
+        for manager, title in titles:
+            manager.find_node(title)
+    cases[f"dialogue.find_node[{len(titles)} titles]"] = find_node
+    return cases
+
+
+def bench_loading(game) -> dict:
+    """Cases of the loading of the interactions of every scene, and of `Game.load_map`.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        dict: Case name -> callable.
+    """
+    from settings import SCRIPTS_DIR
+    from src.ui.interaction import load_scene_interactions
+    cases = {}
+    for name in SCENES:
+        path = f"{SCRIPTS_DIR}/{name}"
+        cases[f"load_scene_interactions[{name}]"] = lambda path=path: load_scene_interactions(path, game.screen)
+
+    def load_map() -> None:
+        # A new game: the registry forgets the scenes, Room 101 is built again and its neighbours are preloaded
+        scene = game.load_map()
+        game.change_map(game.current_scene, scene)
+        game.current_scene = scene
+    cases["game.load_map"] = load_map
+    return cases
+
+
+def bench_videos(game) -> dict:
+    """Cases of the drawing of the frames of every video, a call drawing the next frame.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        dict: Case name -> callable.
+    """
+    import src.ui.animated_sequence as animated_sequence
+    from src.ui.animated_sequence import Video
+    cases = {}
+    for name, video in vars(animated_sequence).items():
+        if not isinstance(video, Video):
+            continue
+        frames = len(video.sequence)
+
+        def draw(video=video, frames=frames, frame=[0]) -> None:
+            status, count = video.status, video.count
+            video.status, video.count = True, frame[0]
+            video.draw(game.screen)
+            video.status, video.count = status, count
+            frame[0] = (frame[0] + 1) % frames
+        cases[f"video.draw[{name}]"] = draw
+    return cases
+
+
+def bench_frames(game) -> dict:
+    """Cases of a full frame of `Game.draw` in every scene, presented to the dummy display.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        dict: Case name -> callable.
+    """
+    cases = {}
+    for name in SCENES:
+        def draw(name=name) -> None:
+            if game.current_scene.name != name:
+                enter_scene(game, name)
+            game.draw()
+        cases[f"game.draw[{name}]"] = draw
+    return cases
+
+
+# Benchmarks run in this order, `Game.load_map` last as it builds the scenes again
+BENCHMARKS = [bench_player, bench_dialogue, bench_videos, bench_frames, bench_loading]
+
+
+def measure(case, repeat: int = 5, round_seconds: float = ROUND_SECONDS) -> dict:
+    """Times a case: calls it once to warm it up, then in `repeat` rounds of at least `round_seconds`.
+
+    Args:
+        case (Callable[[], Any]): The case.
+        repeat (int, optional): Rounds timed. Defaults to 5.
+        round_seconds (float, optional): Minimum duration of a round. Defaults to `ROUND_SECONDS`.
+
+    Returns:
+        dict: The median, min and max milliseconds of a call over the rounds, the rounds and the calls per round.
+    """
+    start = time.perf_counter()
+    case()
+    first = time.perf_counter() - start
+    number = max(1, min(10_000, int(round_seconds / first) if first > 0 else 10_000))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            case()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times), "rounds": repeat,
+            "number": number}
+
+
+def run(game, pattern: str|None = None, repeat: int = 5) -> dict:
+    """Runs the benchmarks.
+
+    Args:
+        game (Game): The game, see `create_game`.
+        pattern (str | None, optional): Only runs the cases whose name contains it, all if None. Defaults to None.
+        repeat (int, optional): Rounds timed per case. Defaults to 5.
+
+    Returns:
+        dict: The environment and the results, case name -> timings.
+    """
+    import pygame
+    results = {}
+    for benchmark in BENCHMARKS:
+        for name, case in benchmark(game).items():
+            if pattern is None or pattern in name:
+                results[name] = measure(case, repeat)
+    return {"time": time.time(), "python": platform.python_version(), "pygame": pygame.version.ver,
+            "platform": platform.platform(), "results": results}
+
+
+def load_results(path: str) -> dict:
+    """Reads a results file written by `run`.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        dict: The results.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a results file.
+    """
+    try:
+        with open(path, encoding='utf8') as file:
+            results = json.load(file)
+    except OSError as error:
+        raise ValueError(f"cannot read {path}: {error.strerror}") from error
+    except json.JSONDecodeError as error:
+        raise ValueError(f"{path} is not valid JSON: {error}") from error
+    valid = isinstance(results, dict) and isinstance(results.get("results"), dict) and all(
+        isinstance(timings, dict) and isinstance(timings.get("median_ms"), (int, float))
+        for timings in results["results"].values())
+    if not valid:
+        raise ValueError(f"{path} is not a results file written by run")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 10.0) -> tuple[list[str], list[str]]:
+    """Compares the median times of the cases with a baseline.
+
+    Args:
+        results (dict): The results, as returned by `run`.
+        baseline (dict): The baseline, results of an earlier run.
+        threshold (float, optional): A case is a regression if slower by more than this, in percent.
+            Defaults to 10.
+
+    Returns:
+        tuple[list[str], list[str]]: A line per case found in both, and the lines of the regressions.
+    """
+    lines, regressions = [], []
+    for name, timings in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before, after = baseline["results"][name]["median_ms"], timings["median_ms"]
+        change = (after - before) / before * 100 if before > 0 else 0.0
+        line = f"{name:<50}  {before:>10.4f}  {after:>10.4f}  {change:>+7.1f}%"
+        lines.append(line)
+        if change > threshold:
+            regressions.append(line)
+    return lines, regressions
+
+
+def main() -> None:
+    """Runs the benchmarks or compares results with the baseline, exits with 1 on a regression."""
+    parser = argparse.ArgumentParser(description="Benchmarks of the hot paths of the engine.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write the results as JSON.")
+    run_parser.add_argument("--filter", help="Only run the cases whose name contains this.")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Rounds timed per case.")
+    run_parser.add_argument("--out", help="Results file, a new file in logs/benchmarks by default.")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Also write the results as the baseline.")
+    run_parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    compare_parser = commands.add_parser("compare", help="Compare results with the baseline.")
+    compare_parser.add_argument("results", help="Results file written by run.")
+    compare_parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file.")
+    compare_parser.add_argument("--threshold", type=float, default=10.0,
+                                help="Slowdown flagged as a regression, in percent.")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        if not os.path.exists(args.baseline):
+            compare_parser.error(f"no baseline at {args.baseline}, run `run --save-baseline` first")
+        try:
+            results = load_results(args.results)
+            baseline = load_results(args.baseline)
+        except ValueError as error:
+            compare_parser.error(str(error))
+        lines, regressions = compare(results, baseline, args.threshold)
+        print(f"{'case':<50}  {'baseline':>10}  {'ms':>10}  {'change':>8}")
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} regressions over {args.threshold:g}%:\n" + "\n".join(regressions))
+            sys.exit(1)
+        return
+
+    results = run(create_game(), args.filter, args.repeat)
+    paths = [args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")]
+    if args.save_baseline:
+        paths.append(BASELINE_PATH)
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf8') as file:
+            json.dump(results, file, indent=2)
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for name, timings in results["results"].items():
+            print(f"{name:<50}  median {timings['median_ms']:>10.4f} ms  min {timings['min_ms']:>10.4f} ms")
+        print(f"results written to {', '.join(paths)}")
+
+
+if __name__ == "__main__":
+    main()
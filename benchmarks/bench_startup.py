@@ -0,0 +1,69 @@
+"""
+Benchmark of the time to first frame: from the first import of the game to the first frame of the main menu.
+
+Every run starts a new Python process, so that nothing is already imported or cached in memory, imports `main`,
+creates the `Game` and runs one frame of the game loop. Run from the root of the repository:
+
+    python benchmarks/bench_startup.py --runs 10
+
+Functions:
+    - first_frame_ms: Measures the time to first frame in a new process.
+    - main: Runs the benchmark and prints the results.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Run in the new process, prints the time to first frame in milliseconds
+CHILD = """
+import time
+start = time.perf_counter()
+import main
+game = main.Game()
+game.handle_events()
+game.update()
+game.draw()
+print(round((time.perf_counter() - start) * 1000, 2))
+"""
+
+
+def first_frame_ms(env: dict|None = None) -> float:
+    """Measures the time to first frame in a new process.
+
+    Args:
+        env (dict | None, optional): Environment of the process, the current one if None. Defaults to None.
+
+    Returns:
+        float: Milliseconds from the first import to the first frame.
+    """
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results, as JSON with --json."""
+    parser = argparse.ArgumentParser(description="Time to the first frame of the main menu.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of processes started.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SDL_AUDIODRIVER", "dummy")  # No sound device needed
+    times = [first_frame_ms(env) for _ in range(args.runs)]
+    results = {"runs": args.runs, "median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times)}
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"time to first frame over {args.runs} runs: median {results['median_ms']:.1f} ms, "
+              f"min {results['min_ms']:.1f} ms, max {results['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,28 @@
 This module contains the main game loop and logic for running the game "Newsun".
 It includes the Game class, which is responsible for managing various game systems such as 
 menus, player interactions, inventory management, scene handling, and the game environment.
+
+Run with `--trace-startup` to time the imports and the initialization until the first frame, with `--watchdog`
+to log the slow frames to `WATCHDOG_LOG_PATH`, with `--profile=cprofile|sample` to profile the session and with
+`--track-allocations` to count the allocations of the frames and with `--memory-report` to diff the surfaces,
+masks and sounds in memory at every change of scene (see `parse_args`). Press F3 in the game to show the frame
+profiler, then F4 to add the memory of each subsystem.
 """
 
+import sys
+import argparse
+from src.engine.startup_trace import startup_trace
+if __name__ == "__main__" and "--trace-startup" in sys.argv:
+    startup_trace.start()  # Before the other imports, to time them
+
 import pygame
 from src.characters.sprites import *
-import sys
+from functools import partial, cached_property
 
 from settings import *
 from src.ui.camera import Camera
 from src.ui.inventory import Item
+from src.ui.hud import HUD
 from src.scenes.main_menu import MainMenu
 from src.scenes.options_menu import OptionsMenu
 from src.scenes.pause_menu import PauseMenu
@@ -18,6 +31,29 @@ from src.scenes.new_game import NewGame
 from src.scenes.ending_menu import EndingMenu
 from src.scenes.death_menu import DeathMenu
 from src.scenes.hotel_scenes import *
+from src.engine.rng import RNGService
+from src.engine.audio import SoundBank, ChannelManager
+from src.engine.music import MusicManager
+from src.engine.state_machine import StateMachine
+from src.engine.scheduler import FrameScheduler
+from src.engine.presenter import FramePresenter
+from src.engine.profiler import profiler
+from src.engine.watchdog import FrameWatchdog
+from src.engine.profile_session import ProfileSession, create_session, PROFILE_MODES
+from src.engine.allocations import AllocationTracker
+from src.engine.gc_scheduler import GCScheduler
+from src.engine.memory_report import MemorySnapshot, MemoryTracker, take_memory_snapshot
+from src.engine.rules import RuleEngine
+from src.scenes.scene_registry import SceneRegistry
+from src.engine.events import event_bus, SceneChanged
+from src.engine.assets import assets
+from src.engine.preloader import Preloader, PreloadGroup, video_steps
+from src.engine.script_bundle import script_bundle
+import src.ui.animated_sequence as animated_sequence
+from src.ui.animated_sequence import (black_bg, skill_desc, dialogue_box_left, video_in, video, video_out,
+                                      status_bar, vid_roll, vid_pass, vid_fail)
+from src.ui.profiler_overlay import ProfilerOverlay
+from src.scenes.game_states import MainMenuState, NewGameState, PlayState, PauseState, OptionsState, EndingState, DeathState
 
 
 class Game:
@@ -38,195 +74,303 @@ class Game:
             cls._instance = super(Game, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self) -> None:
+    def __init__(self, seed: int|None = RNG_SEED) -> None:
         """
         Initializes the game by setting up Pygame, the screen, clock, scenes, and game variables. 
         Also initializes various menus and game elements like the player, camera, and items.
+
+        Args:
+            seed (int | None, optional): Seed of the game's random numbers, a random one is picked if None.
+                Defaults to `RNG_SEED`.
         """
         if not hasattr(self, "initialized"):  # Prevent re-initialization
-            pygame.init()
-            pygame.display.set_caption("Newsun")
-            pygame.display.set_icon(pygame.image.load('assets/images/newsun.jpg'))
-            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            with startup_trace.step("display"):
+                pygame.init()
+                pygame.display.set_caption("Newsun")
+                pygame.display.set_icon(assets.image('assets/images/newsun.jpg', convert=None))
+                self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
             self.clock = pygame.time.Clock()
             self.time=pygame.time.get_ticks()
             self.running = True  # Set a running flag for game control
             
-            # Scene initialization
-            self.main_menu = MainMenu(self.screen) 
-            self.options_menu = OptionsMenu(self.screen)
-            self.pause_menu = PauseMenu(self.screen)
-            self.ending_menu = EndingMenu(self.screen)
-            self.death_menu = DeathMenu(self.screen)
+            # Random numbers (skill checks...), the state can be snapshotted with self.rng.get_state()
+            self.rng = RNGService()
+            if seed is not None:
+                self.rng.reseed(seed)
+            
+            with startup_trace.step("audio"):
+                # Sound effects are decoded once here, so playing them never touches the disk
+                SoundBank().preload()
+                self.audio = ChannelManager()
+                self.music = MusicManager()
+            
+            # Scene initialization, the other menus, the spritesheets and the items are created on first use
+            with startup_trace.step("main menu"):
+                self.main_menu = MainMenu(self.screen)
             
             self.game_scenes = []
             self.all_sprites = pygame.sprite.LayeredUpdates()
             
-            # Character & Camera initialization
-            self.character_spritesheet = SpriteSheet('assets/images/characters/characters.png')
-            self.matilda_spritesheet = SpriteSheet('assets/images/characters/cockroach.png')
+            # Camera initialization
             self.camera = Camera(self, WIDTH, HEIGHT)
-            
-            # Initialize items
-            self.zip_tie = Item('zip_tie', 'assets/images/items/zip_tie.png')
-            self.books = Item('books', 'assets/images/items/books.png')
-            self.toolbox = Item('toolbox', 'assets/images/items/toolbox.png')
-            self.coffee =  Item('coffee', 'assets/images/items/coffee.png')
+            self.hud = HUD()  # Health, reason and inventory, shared by the scenes
             
             # Game variables
-            self.menu_state = "main"
             self.interaction_state = False
             self.current_scene = None
+            self.scenes = SceneRegistry(self)  # Builds the scenes when needed, see load_map
+            pygame.register_quit(self.scenes.close)
             self.elevator_fixed = False
+            with startup_trace.step("rules"):
+                self.rules = RuleEngine(self)  # Quest rules, see scripts/rules.json
+            with startup_trace.step("preloader"):
+                # Preloads the rest of the game on worker threads while the main menu is shown
+                self.preloader = Preloader(self.preload_manifest())
+                self.preloader.start()
+            
+            with startup_trace.step("states"):
+                # Game states, the music follows the changes of state
+                self.states = StateMachine(on_change=self.music.change_state)
+                for state in (MainMenuState(self), NewGameState(self), PlayState(self), PauseState(self),
+                              OptionsState(self), EndingState(self), DeathState(self)):
+                    self.states.add(state)
+                self.menu_state = "main"
+            # Sleeps on static screens and stops rendering in the background
+            self.scheduler = FrameScheduler()
+            # The only place presenting the frames, scenes and menus only draw into the back buffer
+            self.presenter = FramePresenter()
+            # Times the sections of the frames, shown in the overlay toggled with F3
+            self.profiler = profiler
+            self.profiler_overlay = ProfilerOverlay(self.profiler)
+            # Memory snapshots are taken once the frame is over, see end_frame
+            self.memory_requested = False  # F4 was pressed during the frame
+            self.memory_tracker = None  # Diffs the memory at the changes of scene, see track_memory
+            # Runs the garbage collections between the frames, and freezes the objects loaded with a scene
+            self.gc = GCScheduler()
+            event_bus.subscribe(SceneChanged, self.gc.request_freeze)
 
             self.initialized = True  #  Mark as initialized
+    
+    # Created on first use, they are not needed to show the main menu
+    @cached_property
+    def options_menu(self) -> OptionsMenu:
+        return OptionsMenu(self.screen)
+
+    @cached_property
+    def pause_menu(self) -> PauseMenu:
+        return PauseMenu(self.screen)
+
+    @cached_property
+    def ending_menu(self) -> EndingMenu:
+        return EndingMenu(self.screen)
+
+    @cached_property
+    def death_menu(self) -> DeathMenu:
+        return DeathMenu(self.screen)
+
+    @cached_property
+    def character_spritesheet(self) -> SpriteSheet:
+        return SpriteSheet('assets/images/characters/characters.png')
+
+    @cached_property
+    def matilda_spritesheet(self) -> SpriteSheet:
+        return SpriteSheet('assets/images/characters/cockroach.png')
+
+    @cached_property
+    def zip_tie(self) -> Item:
+        return Item('zip_tie', 'assets/images/items/zip_tie.png')
+
+    @cached_property
+    def books(self) -> Item:
+        return Item('books', 'assets/images/items/books.png')
+
+    @cached_property
+    def toolbox(self) -> Item:
+        return Item('toolbox', 'assets/images/items/toolbox.png')
+
+    @cached_property
+    def coffee(self) -> Item:
+        return Item('coffee', 'assets/images/items/coffee.png')
+
+    @property
+    def menu_state(self) -> str:
+        """
+        The name of the current game state ("main", "new_game", "game", "pause", "options", "ending" or "death").
+        """
+        return self.states.current_name
+    
+    @menu_state.setter
+    def menu_state(self, state: str) -> None:
+        """
+        Changes the game state, running its exit and enter hooks.
+
+        Args:
+            state (str): The new game state.
+        """
+        self.states.change(state)
             
     def handle_events(self) -> None:
         """
         Processes and handles all user input events (keyboard, mouse, etc.) during the game.
-        This method also manages the state transitions between different menus and scenes.
+        The events are dispatched to the current game state, which manages the transitions between states.
+        F3 toggles the frame profiler overlay, F4 adds a memory snapshot to it at the end of the frame. The profiled
+        frame starts once the scheduler returns the events, after its sleep on static screens.
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.playing = False
-                self.running = False
-            
-            if self.menu_state == "game":
-                if not pygame.mixer.music.get_busy():
-                    pygame.mixer.music.load('assets/music/newsun_hotel.ogg')
-                    pygame.mixer.music.play(-1)  # Loop the music indefinitely
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.menu_state = "pause"
-                        pygame.mixer.music.pause()
-                
-                # That means Vorakh fixed the elevator
-                if self.floor_0.dialogue_conditions['npc_vorakh'] == 4:
-                    self.elevator_fixed = True
-                    self.floor_0.change_conditions('door', 2)
-                
-                if not self.elevator_fixed:
-                    # If you interacted with the bookshelf and didn't already give the books to Camellia, you have the books
-                    if self.floor_1.dialogue_conditions['bookshelf'] == 2 and not self.player.inventory.has_item(self.books) and self.floor_1.dialogue_conditions['npc_camellia'] != 4:
-                        self.player.inventory.add_item(self.books)
-                        
-                    # If you got the book, Camellia can give you the zip tie
-                    if self.player.inventory.has_item(self.books) and self.floor_1.dialogue_conditions['npc_camellia'] != 1 and self.floor_1.dialogue_conditions['npc_camellia'] != 4:
-                        self.floor_1.change_conditions('npc_camellia', 3)
-                        
-                    # Trade book for zip tie.
-                    if self.floor_1.dialogue_conditions['npc_camellia'] == 4 and not self.player.inventory.has_item(self.zip_tie):
-                        self.player.inventory.remove_item(self.books)
-                        self.player.inventory.add_item(self.zip_tie)
-                        
-                    # If you interacted with the toolbox and didn't already give the toolbox to Vorakh, you have the toolbox
-                    if self.room_101.dialogue_conditions['bed'] == 2 and not self.player.inventory.has_item(self.toolbox) and self.floor_0.dialogue_conditions['npc_vorakh'] != 4:
-                        self.player.inventory.add_item(self.toolbox)
-                        
-                    # If you got the coffee from Efrim and di'nt already give it to Vorakh, you have the coffee
-                    if self.floor_0.dialogue_conditions['npc_efrim'] == 2 and not self.player.inventory.has_item(self.coffee) and self.floor_0.dialogue_conditions['npc_vorakh'] != 4:
-                        self.player.inventory.add_item(self.coffee)
-
-                    if all(item in self.player.inventory.items for item in [self.coffee, self.zip_tie, self.toolbox]) and self.floor_0.dialogue_conditions['npc_vorakh'] != 1:
-                        self.floor_0.change_conditions('npc_vorakh', 3)
-                else:
-                    self.player.inventory.clear_inventory()
-                    
-                
-                event_handled = self.current_scene.handle_event(event)
-                # check if event is a scene change
-                if event_handled in self.current_scene.scene_mapping.values():
-                    self.change_map(self.current_scene, getattr(self, event_handled))
-                    self.current_scene = getattr(self, event_handled)
-                # check if game ended or if you died
-                elif event_handled == "ending":
-                    self.menu_state = "ending"
-                    pygame.mixer.music.stop()
-                elif self.player.health <= 0:
-                    self.death_menu.d_type = "health"
-                    self.menu_state = "death"
-                    pygame.mixer.music.stop()
-                elif self.player.reason <= 0:
-                    self.death_menu.d_type = "reason"
-                    self.menu_state = "death"
-                    pygame.mixer.music.stop()
-                
-            if self.menu_state == "main":
-                if not pygame.mixer.music.get_busy():
-                    pygame.mixer.music.load('assets/music/main.ogg')
-                    pygame.mixer.music.play(-1)  # Loop the music indefinitely
-            
-                selected_option = self.main_menu.handle_event(event)
-                if selected_option == "Start Game":
-                    self.new_game = NewGame(self.screen)
-                    self.menu_state = "new_game"
-                    
-                elif selected_option == "Options":
-                    self.options_menu.previous_screen = "main"
-                    self.menu_state = "options" 
-                elif selected_option == "Exit":
-                    self.running = False  # Exit the game
-            
-            elif self.menu_state == "ending":
-                selected_option = self.ending_menu.handle_event(event)
-                if not pygame.mixer.music.get_busy():
-                    pygame.mixer.music.load('assets/music/credits.ogg')
-                    pygame.mixer.music.play(-1)  # Loop the music indefinitely
-                if selected_option == "quit":
-                    self.running = False
-                    
-            elif self.menu_state == "death":
-                selected_option = self.death_menu.handle_event(event)
-                if not pygame.mixer.music.get_busy():
-                    pygame.mixer.music.load('assets/music/credits.ogg')
-                    pygame.mixer.music.play(-1)  # Loop the music indefinitely
-                if selected_option == "quit":
+        events = self.scheduler.get_events(self.states)
+        self.gc.begin_frame()
+        self.profiler.begin_frame()
+        with self.profiler.section("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.playing = False
                     self.running = False
-            
-            elif self.menu_state == "pause":
-                selected_option = self.pause_menu.handle_event(event)
-                if selected_option == "Resume":
-                    self.menu_state = "game"
-                    pygame.mixer.music.unpause()
-                elif selected_option == "Options":
-                    self.options_menu.previous_screen = "pause"
-                    self.menu_state = "options"
-                elif selected_option == "Exit":
-                    self.running = False
-            
-            elif self.menu_state == "options":
-                selected_option = self.options_menu.handle_event(event)
-                if selected_option == "Back":
-                    self.menu_state = self.options_menu.previous_screen # main menu/pause menu
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    # Shows or hides the overlay on static screens
+                    self.states.current.dirty = True
+                    self.states.current.full_redraw = True
+                    continue
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and self.profiler.enabled:
+                    self.memory_requested = True
+                    continue
                 
-            elif self.menu_state == "new_game":
-                self.new_game.handle_event(event)
-                if self.new_game.dialogue_manager.dialogue_active and not pygame.mixer.music.get_busy():
-                    pygame.mixer.music.load('assets/music/new_game_conversation.ogg')
-                    pygame.mixer.music.play(-1)
-                if self.new_game.game_begin:
-                    self.load_map()
-                    self.menu_state = "game"
-                    self.current_scene = self.room_101
-                    self.player = self.new_game.player
-                    self.player.add_game(self)
-                    self.all_sprites.add(self.player)
-                    self.all_sprites.add(self.current_scene)
-                    for sprite in self.current_scene.scene_sprites:
-                        self.all_sprites.add(sprite)
-                    pygame.mixer.music.stop()
-                    pygame.mixer.Channel(1).play(pygame.mixer.Sound('assets/sounds/door_knock_angry.mp3'))
-            else:
-                pass
-
-    def load_map(self) -> None:
-        """
-        Initializes the different rooms (scenes) in the game, such as Room101, Floor1, Floor0, etc.
-        """
-        self.room_101 = Room101(self.screen)
-        self.floor_1 = Floor1(self.screen, width=self.room_101.rect.topleft[0] + 500, height=self.room_101.rect.topleft[1] - 600)
-        self.floor_0 = Floor0(self.screen, width=self.floor_1.rect.topleft[0] + 500, height=self.floor_1.rect.topleft[1] - 750)
-        self.underground = Underground(self.screen, width=self.floor_0.rect.topleft[0] - 1950, height=self.floor_0.rect.topleft[1] - 750)
+                self.states.handle_event(event)
+        if self.profiler.enabled:
+            self.states.current.dirty = True  # The overlay changes every frame
+
+    @property
+    def activity(self) -> str:
+        """
+        What the player is doing, to profile it separately: "main_menu" in the menus and the character creation,
+        "dialogue" in the introduction and the dialogues of the hotel, "world" while exploring the hotel.
+        """
+        if self.menu_state == "game":
+            return "dialogue" if self.current_scene is not None and self.current_scene.in_dialogue else "world"
+        if self.menu_state == "new_game" and not self.new_game.character_creator_active:
+            return "dialogue"
+        return "main_menu"
+
+    def frame_context(self) -> dict:
+        """
+        Describes where the game is, for the records of the slow frames and the profiling sessions.
+
+        Returns:
+            dict: The game state, the activity and the current scene.
+        """
+        return {"state": self.menu_state, "activity": self.activity,
+                "scene": self.current_scene.name if self.current_scene else None}
+
+    def watch_frames(self, path: str = WATCHDOG_LOG_PATH) -> FrameWatchdog:
+        """
+        Starts logging the slow frames, with the timings of their sections and their sampled stacks.
+        The watchdog stops when pygame quits.
+
+        Args:
+            path (str, optional): The log. Defaults to `WATCHDOG_LOG_PATH`.
+
+        Returns:
+            FrameWatchdog: The watchdog attached to the profiler.
+        """
+        watchdog = FrameWatchdog(path, context=self.frame_context)
+        watchdog.start()
+        self.profiler.watch(watchdog)
+        pygame.register_quit(watchdog.stop)
+        return watchdog
+
+    def profile(self, mode: str, seconds: float|None = None, scene: str|None = None,
+                out_dir: str|None = None) -> ProfileSession:
+        """
+        Starts profiling the frames of the session, by activity. The profiles are written when pygame quits.
+
+        Args:
+            mode (str): "cprofile" or "sample".
+            seconds (float | None, optional): Seconds from the first profiled frame until the game quits,
+                unlimited if None. Defaults to None.
+            scene (str | None, optional): Only profiles the frames of this scene. Defaults to None.
+            out_dir (str | None, optional): Folder of the profiles, a new folder in `PROFILE_DIR` if None.
+                Defaults to None.
+
+        Returns:
+            ProfileSession: The session attached to the profiler.
+        """
+        session = create_session(mode, out_dir, context=self.frame_context, seconds=seconds, scene=scene)
+        session.start()
+        self.profiler.watch(session)
+        pygame.register_quit(session.stop)
+        return session
+
+    def track_allocations(self) -> AllocationTracker:
+        """
+        Starts counting the allocations of the frames, by call site and type. The counts per frame are printed
+        when pygame quits.
+
+        Returns:
+            AllocationTracker: The tracker attached to the profiler.
+        """
+        tracker = AllocationTracker()
+        tracker.start()
+        self.profiler.watch(tracker)
+
+        def report() -> None:
+            print(tracker.report(), file=sys.stderr)
+            tracker.stop()
+        pygame.register_quit(report)
+        return tracker
+
+    def memory_snapshot(self) -> MemorySnapshot:
+        """
+        Lists the surfaces, masks and sounds in memory with their owner. The game is walked first, then the shared
+        videos, the sound bank and the asset registry, which owns the assets nobody else holds.
+
+        Returns:
+            MemorySnapshot: The snapshot.
+        """
+        return take_memory_snapshot([self, animated_sequence, SoundBank(), assets])
+
+    def track_memory(self) -> MemoryTracker:
+        """
+        Prints the changes of the memory at every change of scene, to spot the scenes and caches never released.
+        The last snapshot is printed when pygame quits.
+
+        Returns:
+            MemoryTracker: The tracker, subscribed to the changes of scene.
+        """
+        tracker = MemoryTracker(self.memory_snapshot)
+        tracker.start()
+        pygame.register_quit(tracker.stop)
+        self.memory_tracker = tracker
+        return tracker
+
+    def preload_manifest(self) -> list[PreloadGroup]:
+        """
+        Lists the assets to preload, in the order they are needed: the main menu, the character creation,
+        the first scenes of the hotel, then the skill-check overlays.
+
+        Returns:
+            list[PreloadGroup]: The groups of the manifest.
+        """
+        new_game_decode, new_game_convert = video_steps([skill_desc, dialogue_box_left, video_in, video, video_out])
+        hotel_decode, hotel_convert = video_steps([status_bar])
+        # The scenes are only decoded, they are converted when the SceneRegistry builds them
+        first_scenes = self.scenes.neighbours("room_101", include_self=True)
+        return [
+            PreloadGroup("main_menu", *video_steps([black_bg])),
+            PreloadGroup("new_game", [partial(script_bundle.get, "scripts/new_game/new_game.json")] + new_game_decode,
+                         new_game_convert),
+            PreloadGroup("hotel", [partial(self.scenes.decode, name) for name in first_scenes] + hotel_decode,
+                         hotel_convert),
+            PreloadGroup("skill_checks", *video_steps([vid_roll, vid_pass, vid_fail])),
+        ]
+
+    def load_map(self) -> Scene:
+        """
+        Prepares the scenes of the hotel (Room101, Floor1, Floor0, etc.) for a new game. Only Room 101 is
+        built now: the other scenes are preloaded when the player gets close to them, see `SceneRegistry`.
+
+        Returns:
+            Scene: Room 101, the first scene.
+        """
+        return self.scenes.start("room_101")
     
     def change_map(self, old_map, new_map) -> None:
         """
@@ -243,59 +387,117 @@ class Game:
         self.all_sprites.add(new_map)
         for sprite in new_map.scene_sprites:
             self.all_sprites.add(sprite)
+        event_bus.publish(SceneChanged(old_map.name, new_map.name))
 
     def draw(self) -> None:
         """
-        Renders the game by drawing the current screen and all active sprites.
-        It checks the current menu state and draws the corresponding screen.
+        Renders the current game state and updates the display.
+        Static states (the menus) are only redrawn when something changed, and nothing is drawn
+        while the window is unfocused or minimised. When a static state only changed some areas, the screen
+        is not cleared and only those areas are presented.
         """
-        self.screen.fill((35, 14, 13))
-            
-        if self.menu_state == "main":
-            self.main_menu.draw()
-        elif self.menu_state == "ending":
-            self.ending_menu.draw()
-        elif self.menu_state == "death":
-            self.death_menu.draw()
-        elif self.menu_state == "options":
-            self.options_menu.draw()
-        elif self.menu_state == "new_game":
-            self.new_game.draw()
-        elif self.menu_state == "game":
-            for sprite in self.all_sprites:
-                self.screen.blit(sprite.image, sprite.rect.topleft - self.camera.offset)
-            self.current_scene.draw()
-        elif self.menu_state == "pause":
-            self.pause_menu.draw()
-        else:
-            pass
+        if not self.scheduler.should_render(self.states):
+            return
         
-        pygame.display.flip()  # Update the entire screen
+        # The overlay is drawn over the frame, its previous frame has to be covered whole
+        full_redraw = self.states.needs_full_redraw() or self.profiler.enabled
+        if full_redraw:
+            self.screen.fill((35, 14, 13))
+        with self.profiler.section("draw"):
+            rects = self.states.draw()
+        if self.profiler.enabled:
+            with self.profiler.section("profiler"):
+                self.profiler_overlay.draw(self.screen)
+        with self.profiler.section("present"):
+            self.presenter.present(None if full_redraw else rects)
+        startup_trace.frame_presented()  # Ends the trace at the first frame, if it is running
 
     def update(self) -> None:
         """
-        Updates the game world, including all sprites and camera position.
+        Updates the current game state, e.g. the sprites and the camera position while exploring the hotel.
+        The preloaded assets are converted first, within a time budget.
         """
-        if hasattr(self, 'player') and self.menu_state == "game":
-            self.all_sprites.update()
-            self.camera.box_target_camera(self.player)
-            self.camera.keyboard_control()
+        with self.profiler.section("preloader"):
+            self.preloader.update()
+        with self.profiler.section("update"):
+            self.states.update()
     
+    def end_frame(self) -> None:
+        """
+        Delivers the queued events of the frame and ends the profiled frame, then takes the memory snapshots of
+        the frame: the one asked with F4 and the diff of the memory tracker after a change of scene. Walking the
+        objects outside of the profiled frame keeps it out of the timings and of the counting hook.
+        """
+        with self.profiler.section("event bus"):
+            event_bus.flush()  # Deliver the queued events of the frame
+        self.profiler.end_frame()
+        if self.memory_requested:
+            self.memory_requested = False
+            snapshot = self.memory_snapshot()
+            self.profiler_overlay.memory = snapshot
+            print(snapshot.report(), file=sys.stderr)
+        if self.memory_tracker is not None:
+            self.memory_tracker.end_frame()
+
     def run(self) -> None:
         """
         The main game loop that continuously handles events, updates the game world, 
-        and renders the screen until the game ends.
+        and renders the screen until the game ends. On static screens, `handle_events` sleeps
+        until an event arrives or the next animation frame is due. The garbage is collected between the frames.
         """
+        self.gc.start()
         while self.running:
             self.handle_events()
             self.update()
             self.draw()
-            self.clock.tick(FPS)
+            self.end_frame()
+            self.gc.idle()  # Collects the garbage if the frame left enough time
+            self.clock.tick(self.states.current.fps)
 
+        self.gc.stop()
         pygame.quit()
         sys.exit()
 
 
+def parse_args(argv: list[str]|None = None) -> argparse.Namespace:
+    """Parses the command line of the game.
+
+    Args:
+        argv (list[str] | None, optional): The arguments, `sys.argv` if None. Defaults to None.
+
+    Returns:
+        argparse.Namespace: The options.
+    """
+    parser = argparse.ArgumentParser(description="Newsun")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="Time the imports and the initialization until the first frame.")
+    parser.add_argument("--watchdog", action="store_true", help="Log the slow frames with their sampled stacks.")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="Profile the frames by activity: cProfile .pstats or sampled .collapsed stacks.")
+    parser.add_argument("--profile-seconds", type=float, help="Quit this many seconds after the first profiled frame.")
+    parser.add_argument("--profile-scene", help="Only profile the frames of this scene, e.g. room_101.")
+    parser.add_argument("--profile-dir", help="Folder of the profiles, a new folder in logs/profiles by default.")
+    parser.add_argument("--track-allocations", action="store_true",
+                        help="Count the allocations of the frames by call site and type, printed when quitting.")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Diff the surfaces, masks and sounds in memory at every change of scene.")
+    args = parser.parse_args(argv)
+    if args.watchdog and args.profile == "sample":
+        parser.error("--watchdog and --profile=sample both use the timer signal")
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    # The scenes import Game from main: make it this module, not a second copy with its own Game instance
+    sys.modules["main"] = sys.modules[__name__]
     game = Game()
+    if args.watchdog:
+        game.watch_frames()
+    if args.profile:
+        game.profile(args.profile, args.profile_seconds, args.profile_scene, args.profile_dir)
+    if args.track_allocations:
+        game.track_allocations()
+    if args.memory_report:
+        game.track_memory()
     game.run()
@@ -1,9 +1,12 @@
+import os
+
 # Screen dimensions
 WIDTH = 1050
 HEIGHT = 600
 
 # Frames per second
 FPS = 60
+IDLE_WAIT_MS = 1000 # Longest sleep of the game loop waiting for events on static screens
 
 # Colors
 TEXT_COLOR = (255, 255, 255)
@@ -27,4 +30,53 @@ GROUND_LAYER = 1
 PLAYER_SPEED = 4
 KEYBOARD_SPEED = 6
 
+# Player stats
+STARTING_HEALTH = 4
+STARTING_REASON = 3
+SKILL_POINTS = 8 # Points distributed between the skills in the character creation
+
+# Random numbers (None picks a new seed every session)
+RNG_SEED = None
+
+# Dialogue scripts
+SCRIPTS_DIR = "scripts"
+RULES_PATH = f"{SCRIPTS_DIR}/rules.json" # Quest rules, see src/engine/rules.py
+
+# Hotel scenes: the neighbours of the current scene are preloaded, and the scenes farther away
+# are unloaded (their dialogue state is kept) while the loaded scenes use more than the budget
+SCENE_PRELOAD_DEPTH = 1 # Transitions away from the current scene
+SCENE_MEMORY_BUDGET = 8 * 1024 * 1024 # Bytes of backgrounds and collision masks
+SCENE_DECODE_WORKERS = 4 # Threads reading and decoding the scenes before they are built
+
+# Assets preloaded on worker threads while the main menu is shown
+PRELOAD_WORKERS = 2
+PRELOAD_FRAME_BUDGET_MS = 4 # Time spent converting the preloaded images per frame
+
+# Cache for derived data (compiled scripts, baked assets...)
+CACHE_DIR = "cache"
+SCRIPT_BUNDLE_PATH = f"{CACHE_DIR}/scripts.bundle"
+ASSETS_DIR = "assets"
+BAKE_DIR = f"{CACHE_DIR}/baked" # Display-ready images and packed masks, see src/engine/bake.py
+
+# Music
+MUSIC_FADE_MS = 1500 # Duration of the crossfades between tracks
+
+# Frame profiler overlay, toggled with F3 (see src/engine/profiler.py)
+PROFILER_WINDOW = 120 # Frames the mean, p95 and p99 of the sections are computed on
+PROFILER_COUNT_EVERY = 30 # A frame out of 30 counts the blits, renders and surfaces instead of being timed
+
+# Slow frame watchdog, enabled with `python main.py --watchdog` (see src/engine/watchdog.py)
+WATCHDOG_BUDGET_MS = 2 * 1000 / FPS # Frames longer than this are written to the log
+WATCHDOG_SAMPLE_MS = 1 # Interval of the stack sampler during the frames
+WATCHDOG_LOG_PATH = "logs/slow_frames.jsonl"
+WATCHDOG_LOG_BYTES = 1024 * 1024 # Size of the log before it is rotated
+WATCHDOG_LOG_BACKUPS = 3 # Rotated logs kept
+
+# Profiles written by `python main.py --profile=cprofile|sample` (see src/engine/profile_session.py)
+PROFILE_DIR = "logs/profiles"
+
+# Garbage collection, run between the frames (see src/engine/gc_scheduler.py)
+GC_FORCE_FACTOR = 10 # A collection waiting for idle time is forced once 10 times overdue
 
+# Debug checks (e.g. presenting the display outside of the FramePresenter raises an error)
+DEBUG = os.environ.get("NEWSUN_DEBUG", "0") == "1"
@@ -11,6 +11,7 @@ Functions:
 """
 import pygame
 from settings import *
+from src.engine.assets import assets
 
 class Interactable(pygame.sprite.Sprite):
     """
@@ -96,5 +97,12 @@ class NPC(Interactable): # e.g. Tabastan
             self._layer = PLAYER_LAYER  # If matilda is True, the NPC is assigned to the player's layer
         else:
             self._layer = BLOCK_LAYER  # Otherwise, assigns the NPC to the obstacle layer
-        self.image_hitbox = pygame.image.load('assets/images/characters/player_hitbox.png').convert_alpha()
-        self.mask = pygame.mask.from_surface(self.image_hitbox)
\ No newline at end of file
+        self.image_hitbox = assets.image('assets/images/characters/player_hitbox.png')
+        self.mask = assets.mask('assets/images/characters/player_hitbox.png')
+
+    def release_assets(self) -> None:
+        """
+        Releases the hitbox image and mask of the NPC, when its scene is unloaded.
+        """
+        assets.release(self.image_hitbox)
+        assets.release(self.mask)
\ No newline at end of file
@@ -11,11 +11,13 @@ Key Features:
 """
 
 import pygame
-import numpy as np
 import math
 
 from settings import *
 from src.ui.inventory import Inventory
+from src.engine.rng import RNGService
+from src.engine.assets import assets
+from src.engine.events import event_bus, StatChanged
 
 initial_pos = ((WIDTH-ROOM_WIDTH)//2 + 120, (WIDTH-ROOM_HEIGHT)//2 + 240)
 
@@ -54,7 +56,7 @@ class Player(pygame.sprite.Sprite):
         """
         if not hasattr(self, "initialized"):  # Prevent re-initialization
             self.screen = screen
-            self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 20)
+            self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 20)
             
             # Initial values
             self.x = position[0]
@@ -76,13 +78,39 @@ class Player(pygame.sprite.Sprite):
             self.forbearance = 0
             self.resonance = 0
             self.experience = 0
-            self.health = 4
-            self.reason = 3
+            self._health = STARTING_HEALTH
+            self._reason = STARTING_REASON
             
             self.inventory = Inventory()
             
             self.initialized = True  # Mark as initialized
     
+    @property
+    def health(self) -> int:
+        """
+        The player's health, the player dies when it reaches 0. Changes publish a `StatChanged` event.
+        """
+        return self._health
+
+    @health.setter
+    def health(self, value: int) -> None:
+        old, self._health = self._health, value
+        if value != old:
+            event_bus.publish(StatChanged("health", old, value))
+
+    @property
+    def reason(self) -> int:
+        """
+        The player's reason, the player goes mad when it reaches 0. Changes publish a `StatChanged` event.
+        """
+        return self._reason
+
+    @reason.setter
+    def reason(self, value: int) -> None:
+        old, self._reason = self._reason, value
+        if value != old:
+            event_bus.publish(StatChanged("reason", old, value))
+
     def add_game(self, game) -> None:
         """
         Associates the player with the game instance.
@@ -95,8 +123,8 @@ class Player(pygame.sprite.Sprite):
         
         # Load the player's sprite
         self.image = self.game.character_spritesheet.get_sprite(1, 0, self.width, self.height)
-        self.image_hitbox = pygame.image.load('assets/images/characters/player_hitbox.png').convert_alpha()
-        self.mask = pygame.mask.from_surface(self.image_hitbox)
+        self.image_hitbox = assets.image('assets/images/characters/player_hitbox.png')
+        self.mask = assets.mask('assets/images/characters/player_hitbox.png')
         self.rect = self.image.get_rect()
         self.rect.x = self.x
         self.rect.y = self.y
@@ -256,7 +284,8 @@ class Player(pygame.sprite.Sprite):
 
         This method simulates a skill check by rolling a 20-sided die and adding the player's 
         skill value. The result is compared to the specified difficulty class (DC) to determine 
-        success or failure.
+        success or failure. The die is drawn from the "skill_checks" stream of the seeded `RNGService`,
+        so checks can be reproduced from the game's seed.
 
         Args:
             skill_name (str): The name of the skill to check (e.g., "Eloquence").
@@ -266,7 +295,7 @@ class Player(pygame.sprite.Sprite):
             bool: True if the skill check is successful (roll + skill value >= DC), False otherwise.
         """
         skill_value = getattr(self, skill_name.lower(), 0)  # Get the value of the skill
-        roll = np.random.randint(1, 21)
+        roll = RNGService().stream("skill_checks").d20()
         result = roll + skill_value >= difficulty_class
         """if result:
             print(f"Success! Rolled a {roll} + {skill_value} for {skill_name} check.")
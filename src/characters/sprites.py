@@ -11,6 +11,7 @@ Functions:
 """
 import pygame
 from settings import *
+from src.engine.assets import assets
 
 class SpriteSheet():
     """
@@ -33,11 +34,13 @@ class SpriteSheet():
         Args:
             file (str): The path to the spritesheet image file.
         """
-        self.sheet = pygame.image.load(file).convert()
+        self.sheet = assets.image(file, convert="opaque")
+        self.sprites = {}  # Sprites already extracted, by (x, y, width, height)
 
     def get_sprite(self, x: int, y: int, widht: int, height: int) -> pygame.Surface:
         """
-        Extracts a single sprite from the spritesheet.
+        Extracts a single sprite from the spritesheet. Each sprite is only extracted once: the player's
+        animations ask for the same cells every frame. The sprite is shared and must not be drawn on.
 
         Args:
             x (int): Horizontal position (column) of the sprite in the sheet.
@@ -48,7 +51,10 @@ class SpriteSheet():
         Returns:
             pygame.Surface: The extracted sprite as a surface.
         """
-        sprite = pygame.Surface([widht, height])
-        sprite.blit(self.sheet, (0,0), (x*widht, y*height, widht, height))
-        sprite.set_colorkey(BLUE)
-        return sprite
+        key = (x, y, widht, height)
+        if key not in self.sprites:
+            sprite = pygame.Surface([widht, height])
+            sprite.blit(self.sheet, (0,0), (x*widht, y*height, widht, height))
+            sprite.set_colorkey(BLUE)
+            self.sprites[key] = sprite
+        return self.sprites[key]
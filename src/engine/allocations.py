@@ -0,0 +1,159 @@
+"""
+Debug counter of the allocations of every frame, enabled with `python main.py --track-allocations`.
+
+The `AllocationTracker` watches the frames of the `FrameProfiler`. With `tracemalloc`, it forgets the traces at
+the start of every frame, so that the snapshot taken at its end only holds the memory blocks allocated during
+the frame and still alive: the objects kept (caches, new sprites) and the garbage left for the collector. The
+blocks are counted by call site, the first frame of the game's code in their traceback. The peak of traced
+memory during the frame also shows the temporary allocations freed before its end.
+
+The objects are counted by type with the young generation of the garbage collector, which holds the container
+objects allocated since the last collection: the `GCScheduler` does not collect during the frames.
+
+Tracing the allocations slows the game down a lot, the counts are only meant to compare frames and call sites.
+The surfaces are allocated by SDL and not traced, the profiler overlay counts them.
+
+Classes:
+    - AllocationTracker: Counts the allocations of the frames by call site and by type.
+
+Functions:
+    - call_site: Returns the call site of a traced block in the game's code.
+    - young_types: Counts the objects of the young generation by type.
+"""
+
+import os
+import gc
+import tracemalloc
+from collections import Counter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def call_site(traceback: tracemalloc.Traceback) -> str:
+    """
+    Returns the call site of a traced block: the most recent frame in the game's code, or the most recent frame
+    if the block was allocated outside of it.
+
+    Args:
+        traceback (tracemalloc.Traceback): The traceback of the block, from the oldest frame.
+
+    Returns:
+        str: "file:line", the file relative to the root of the game.
+    """
+    for frame in reversed(traceback):
+        if frame.filename.startswith(ROOT) and "site-packages" not in frame.filename:
+            return f"{os.path.relpath(frame.filename, ROOT)}:{frame.lineno}"
+    frame = traceback[-1]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def young_types() -> Counter:
+    """
+    Counts the objects of the young generation of the garbage collector by type.
+
+    Returns:
+        Counter: Type name -> objects.
+    """
+    return Counter(type(obj).__name__ for obj in gc.get_objects(generation=0))
+
+
+class AllocationTracker:
+    """
+    Counts the blocks allocated during the frames by call site, and the objects by type.
+    """
+    def __init__(self, frames: int = 10) -> None:
+        """
+        Initializes a stopped tracker.
+
+        Args:
+            frames (int, optional): Frames kept in the tracebacks, to find the call site in the game's code.
+                Defaults to 10.
+        """
+        self.traceback_frames = frames
+        self.frames = 0  # Frames counted
+        self.sites = Counter()  # Call site -> blocks, over all the frames
+        self.site_bytes = Counter()  # Call site -> bytes, over all the frames
+        self.types = Counter()  # Type -> objects, over all the frames
+        self.peak = 0  # Largest peak of traced memory in a frame
+        self.last = None  # Counts of the last frame
+        self.types_before = Counter()
+        self.started_tracing = False
+        self.filters = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    def start(self) -> None:
+        """
+        Starts tracing the allocations, if they are not traced already.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self.started_tracing = True
+
+    def stop(self) -> None:
+        """
+        Stops tracing the allocations, if the tracker started it.
+        """
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def begin_frame(self) -> None:
+        """
+        Forgets the traced blocks, so that the frame starts from zero.
+        """
+        self.types_before = young_types()
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+
+    def end_frame(self, duration: float, sections: dict, skip: bool = False) -> dict|None:
+        """
+        Counts the blocks allocated during the frame.
+
+        Args:
+            duration (float): Milliseconds of the frame.
+            sections (dict): Milliseconds of the sections of the frame.
+            skip (bool, optional): If True, the frame is not counted, e.g. the profiler overlay counted its draw
+                calls. Defaults to False.
+
+        Returns:
+            dict | None: The blocks, bytes and peak bytes of the frame, with its call sites and types, None if
+                the frame was skipped or the allocations are not traced.
+        """
+        if skip or not tracemalloc.is_tracing():
+            return None
+        types = young_types() - self.types_before  # Before the snapshot allocates its traces
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.filters)
+        sites, site_bytes = Counter(), Counter()
+        for trace in snapshot.traces:
+            site = call_site(trace.traceback)
+            sites[site] += 1
+            site_bytes[site] += trace.size
+        self.frames += 1
+        self.sites.update(sites)
+        self.site_bytes.update(site_bytes)
+        self.types.update(types)
+        self.peak = max(self.peak, peak)
+        self.last = {"blocks": sum(sites.values()), "bytes": sum(site_bytes.values()), "peak": peak,
+                     "sites": sites, "types": types}
+        return self.last
+
+    def report(self, top: int = 15) -> str:
+        """
+        Formats the allocations per frame, averaged over the frames counted.
+
+        Args:
+            top (int, optional): Call sites and types listed, the most allocating first. Defaults to 15.
+
+        Returns:
+            str: The call sites and the types allocating the most per frame.
+        """
+        frames = max(self.frames, 1)
+        lines = [f"allocations per frame over {self.frames} frames: {sum(self.sites.values()) / frames:.1f} blocks, "
+                 f"{sum(self.site_bytes.values()) / frames / 1024:.1f} KiB kept, peak {self.peak / 1024:.1f} KiB"]
+        lines.append(f"{'call site':<60}  {'blocks':>8}  {'KiB':>8}")
+        for site, blocks in self.sites.most_common(top):
+            lines.append(f"{site:<60}  {blocks / frames:>8.1f}  {self.site_bytes[site] / frames / 1024:>8.2f}")
+        lines.append(f"{'type':<60}  {'objects':>8}")
+        for name, count in self.types.most_common(top):
+            lines.append(f"{name:<60}  {count / frames:>8.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,342 @@
+"""
+Central registry of the assets loaded from disk: images, collision masks, fonts and sounds.
+
+Every loader of the game goes through the registry, which keys the assets by kind, path and load parameters
+(conversion, size, colorkey...). Asking twice for the same asset returns the object already in memory instead
+of decoding the file again. The registry counts the references to every asset: `release` drops one, and the
+asset is forgotten when nobody holds it anymore. `report` lists what is resident and how many bytes it uses.
+
+Images can be decoded ahead of time with `decode`, e.g. on a thread pool: reading and decoding a PNG does not
+need the display and releases the GIL. The decoded pixels are kept until `image` converts them on the main thread.
+
+Images and masks are read from the baked artifacts when they exist and are up to date (see `bake`), which skips
+decoding the PNG, scaling the image or building the mask. Otherwise they are loaded from their source file.
+
+The assets returned are shared, so they must not be modified by their users: an asset that needs another
+colorkey or size is a different asset, asked for with other parameters.
+
+Classes:
+    - AssetEntry: An asset in memory, with its reference count and size.
+    - AssetRegistry: Loads the assets once and counts their references.
+
+Functions:
+    - surface_bytes: Memory used by the pixels of a surface.
+    - mask_bytes: Memory used by the bits of a mask.
+    - sound_bytes: Memory used by the samples of a decoded sound.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+
+import pygame
+
+from src.engine.bake import baked_assets
+
+
+@dataclass
+class AssetEntry:
+    """
+    An asset held by the registry.
+
+    Attributes:
+        kind (str): "image", "mask", "font" or "sound".
+        path (str): The file of the asset.
+        params (tuple): The load parameters, part of the key of the asset.
+        asset (object): The loaded asset.
+        nbytes (int): Memory used by the asset, in bytes.
+        refs (int): Number of references handed out and not released.
+    """
+    kind: str
+    path: str
+    params: tuple
+    asset: object
+    nbytes: int
+    refs: int = 0
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """
+    Returns the memory used by the pixels of a surface.
+
+    Args:
+        surface (pygame.Surface): The surface.
+
+    Returns:
+        int: The size of the pixel buffer, in bytes.
+    """
+    return int(surface.get_pitch() * surface.get_height())
+
+
+def mask_bytes(mask: pygame.mask.Mask) -> int:
+    """
+    Returns the memory used by the bits of a mask.
+
+    Args:
+        mask (pygame.mask.Mask): The mask.
+
+    Returns:
+        int: The size of the bit array, in bytes.
+    """
+    width, height = mask.get_size()
+    return (width * height + 7) // 8
+
+
+def sound_bytes(sound: pygame.mixer.Sound) -> int:
+    """
+    Returns the memory used by the samples of a decoded sound.
+
+    Args:
+        sound (pygame.mixer.Sound): The sound.
+
+    Returns:
+        int: The size of the PCM buffer, in bytes, 0 if the mixer is not initialized.
+    """
+    mixer = pygame.mixer.get_init()
+    if not mixer:
+        return 0
+    frequency, size, channels = mixer
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+class AssetRegistry:
+    """
+    Loads every asset once, keyed by kind, path and load parameters, and counts the references to it.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty registry.
+        """
+        self.entries = {}  # Key (kind, path, params) to AssetEntry
+        self.keys = {}  # id() of the assets to their key, to release them
+        self.lock = threading.Lock()  # Assets can be loaded from background threads
+        self.loads = 0  # Assets read from disk
+        self.hits = 0  # Assets found in memory
+        self.decoded = {}  # Path to the pixels of the images decoded ahead of time, not converted yet
+        self.decodes = 0  # Images decoded ahead of time
+        self.quit_registered = False
+
+    def acquire(self, kind: str, path: str, params: tuple, loader, measure) -> object:
+        """
+        Returns an asset, loading it if it is not in memory, and counts a reference to it.
+
+        Args:
+            kind (str): The kind of asset.
+            path (str): The file of the asset.
+            params (tuple): The load parameters.
+            loader (callable): Loads the asset, called without the lock held.
+            measure (callable): Returns the size in bytes of the loaded asset.
+
+        Returns:
+            object: The asset.
+        """
+        key = (kind, path, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self.hits += 1
+                return entry.asset
+
+        asset = loader()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:  # Not loaded by another thread meanwhile
+                entry = AssetEntry(kind, path, params, asset, measure(asset))
+                self.entries[key] = entry
+                self.keys[id(asset)] = key
+                self.loads += 1
+                if not self.quit_registered:
+                    # Fonts and sounds can not be used once pygame quits, they are loaded again afterwards
+                    pygame.register_quit(self.clear)
+                    self.quit_registered = True
+            entry.refs += 1
+            return entry.asset
+
+    def image(self, path: str, convert: str|None = "alpha", size: tuple[int, int]|None = None,
+              colorkey: tuple[int, int, int]|None = None) -> pygame.Surface:
+        """
+        Returns an image.
+
+        Args:
+            path (str): The image file.
+            convert (str | None, optional): "alpha" for `convert_alpha`, "opaque" for `convert`, None to keep
+                the pixel format of the file (before the display is created). Defaults to "alpha".
+            size (tuple[int, int] | None, optional): Size to scale the image to, None to keep it. Defaults to None.
+            colorkey (tuple[int, int, int] | None, optional): Color to make transparent. Defaults to None.
+
+        Returns:
+            pygame.Surface: The image, shared with the other users of the same path and parameters.
+        """
+        def load():
+            with self.lock:
+                surface = self.decoded.pop(path, None)
+            scaled = False
+            if surface is None and size is not None:
+                surface = baked_assets.image(path, size)  # Baked at the size used by the game
+                scaled = surface is not None
+            if surface is None:
+                surface = self.read_image(path)
+            if convert == "alpha":
+                surface = surface.convert_alpha()
+            elif convert == "opaque":
+                surface = surface.convert()
+            if size is not None and not scaled:
+                surface = pygame.transform.scale(surface, size)
+            if colorkey is not None:
+                surface.set_colorkey(colorkey)
+            return surface
+
+        return self.acquire("image", path, (convert, size, colorkey), load, surface_bytes)
+
+    def read_image(self, path: str) -> pygame.Surface:
+        """
+        Reads an image from its baked pixels, or decodes its source file if it is not baked. The image is not
+        converted and can be read from any thread.
+
+        Args:
+            path (str): The image file.
+
+        Returns:
+            pygame.Surface: The image.
+        """
+        surface = baked_assets.image(path)
+        if surface is None:
+            surface = pygame.image.load(path)
+        return surface
+
+    def decode(self, path: str) -> None:
+        """
+        Reads and decodes an image without converting it, so that `image` only has to convert it. It does not
+        need the display and can be called from any thread.
+
+        Args:
+            path (str): The image file.
+        """
+        with self.lock:
+            if path in self.decoded:
+                return
+        surface = self.read_image(path)
+        with self.lock:
+            if path not in self.decoded:
+                self.decoded[path] = surface
+                self.decodes += 1
+
+    def drop_decoded(self, paths) -> None:
+        """
+        Forgets the images decoded ahead of time and never converted, e.g. for a scene that will not be built.
+
+        Args:
+            paths (Iterable[str]): The image files.
+        """
+        with self.lock:
+            for path in paths:
+                self.decoded.pop(path, None)
+
+    def mask(self, path: str, colorkey: tuple[int, int, int]|None = None) -> pygame.mask.Mask:
+        """
+        Returns the collision mask of an image, built from its opaque pixels or read from the baked bits.
+
+        Args:
+            path (str): The image file.
+            colorkey (tuple[int, int, int] | None, optional): Color of the image that does not collide. Defaults to None.
+
+        Returns:
+            pygame.mask.Mask: The mask, shared with the other users of the same image.
+        """
+        def load():
+            mask = baked_assets.mask(path, colorkey)
+            if mask is not None:
+                return mask
+            surface = self.image(path, colorkey=colorkey)
+            mask = pygame.mask.from_surface(surface)
+            self.release(surface)
+            return mask
+
+        return self.acquire("mask", path, (colorkey,), load, mask_bytes)
+
+    def font(self, path: str, size: int) -> pygame.font.Font:
+        """
+        Returns a font.
+
+        Args:
+            path (str): The font file.
+            size (int): The size of the font.
+
+        Returns:
+            pygame.font.Font: The font, shared with the other users of the same file and size.
+        """
+        return self.acquire("font", path, (size,), lambda: pygame.font.Font(path, size),
+                            lambda font: os.path.getsize(path))
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        """
+        Returns a decoded sound.
+
+        Args:
+            path (str): The sound file.
+
+        Returns:
+            pygame.mixer.Sound: The sound, shared with the other users of the same file.
+        """
+        return self.acquire("sound", path, (), lambda: pygame.mixer.Sound(path), sound_bytes)
+
+    def release(self, asset: object) -> bool:
+        """
+        Drops a reference to an asset, and forgets the asset when it has no reference left.
+
+        Args:
+            asset (object): An asset returned by the registry.
+
+        Returns:
+            bool: True if the asset was forgotten.
+        """
+        with self.lock:
+            key = self.keys.get(id(asset))
+            if key is None:
+                return False
+            entry = self.entries[key]
+            entry.refs -= 1
+            if entry.refs > 0:
+                return False
+            del self.entries[key]
+            del self.keys[id(asset)]
+            return True
+
+    def clear(self) -> None:
+        """
+        Forgets every asset, e.g. when pygame quits.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.keys.clear()
+            self.decoded.clear()
+            self.quit_registered = False
+
+    @property
+    def resident_bytes(self) -> int:
+        """
+        Memory used by the assets in the registry, in bytes.
+        """
+        return sum(entry.nbytes for entry in self.entries.values())
+
+    def report(self) -> str:
+        """
+        Formats the assets in memory, the largest first.
+
+        Returns:
+            str: One line per asset with its kind, references, size and file, then the totals.
+        """
+        with self.lock:
+            entries = sorted(self.entries.values(), key=lambda entry: entry.nbytes, reverse=True)
+        lines = [f"{'kind':<5}  {'refs':>4}  {'bytes':>10}  path"]
+        for entry in entries:
+            params = ", ".join(str(param) for param in entry.params if param is not None)
+            name = f"{entry.path} ({params})" if params else entry.path
+            lines.append(f"{entry.kind:<5}  {entry.refs:>4}  {entry.nbytes:>10}  {name}")
+        lines.append(f"{len(entries)} assets, {self.resident_bytes} bytes, {self.loads} loads, {self.hits} hits")
+        return "\n".join(lines)
+
+
+# Registry shared by every loader of the game
+assets = AssetRegistry()
@@ -0,0 +1,203 @@
+"""
+Sound effects of the game: a bank of decoded sounds and a manager for the mixer channels.
+
+Creating a `pygame.mixer.Sound` from a file decodes the whole file, which is too slow to do in the frame that
+handles a key press. The `SoundBank` decodes every sound effect once, at startup, and keeps the PCM-backed
+`Sound` objects in memory. The `ChannelManager` plays them on a fixed set of mixer channels: each group of
+channels has a voice limit, and when every channel of a group is busy a new sound only plays if it has a
+higher priority than one of the sounds playing, which is then cut off.
+
+Classes:
+    - SoundBank: Singleton holding the decoded sound effects.
+    - ChannelManager: Singleton playing sounds on groups of channels with priorities and voice limits.
+"""
+
+import pygame
+from src.engine.assets import assets
+
+# Sound effects decoded by the bank at startup
+SOUND_EFFECTS = {
+    "check_roll": "assets/sounds/check_roll.mp3",
+    "check_pass": "assets/sounds/check_pass.mp3",
+    "check_fail": "assets/sounds/check_fail.mp3",
+    "door_knock_angry": "assets/sounds/door_knock_angry.mp3",
+}
+
+# Priorities of the sounds, a sound can cut off the ones with a lower priority
+PRIORITY_AMBIENT = 0
+PRIORITY_EVENT = 1
+PRIORITY_UI = 2
+
+# Channel groups and their voice limits (number of channels)
+CHANNEL_GROUPS = {
+    "sfx": 2,
+}
+
+
+class SoundBank:
+    """
+    Singleton holding every sound effect decoded in memory, so that playing one never touches the disk.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Ensures that only one instance of the SoundBank class exists (Singleton pattern).
+
+        Returns:
+            SoundBank: The single instance of the SoundBank class.
+        """
+        if not cls._instance:
+            cls._instance = super(SoundBank, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, paths: dict[str, str] = SOUND_EFFECTS) -> None:
+        """
+        Initializes the bank the first time it is created. Sounds are only decoded by `preload` or on first use.
+
+        Args:
+            paths (dict[str, str], optional): Maps the names of the sounds to their files. Defaults to `SOUND_EFFECTS`.
+        """
+        if not hasattr(self, "initialized"):  # Prevent re-initialization
+            self.paths = dict(paths)
+            self.sounds = {}
+            self.late_loads = 0  # Sounds that had to be decoded when they were played
+            self.initialized = True
+
+    def preload(self, names: list[str]|None = None) -> None:
+        """
+        Decodes sound effects ahead of time, at startup or while a scene is loading.
+
+        Args:
+            names (list[str] | None, optional): Names of the sounds to decode. Defaults to every sound of the bank.
+        """
+        for name in names if names is not None else self.paths:
+            if name not in self.sounds:
+                self.sounds[name] = assets.sound(self.paths[name])
+
+    def get(self, name: str) -> pygame.mixer.Sound:
+        """
+        Returns a decoded sound. Sounds that were not preloaded are decoded now, and counted in `late_loads`.
+
+        Args:
+            name (str): Name of the sound.
+
+        Returns:
+            pygame.mixer.Sound: The decoded sound.
+        """
+        if name not in self.sounds:
+            self.late_loads += 1
+            self.preload([name])
+        return self.sounds[name]
+
+
+class ChannelManager:
+    """
+    Singleton playing the sounds of the `SoundBank` on reserved groups of mixer channels.
+
+    Every group has a fixed number of channels, its voice limit. A sound takes a free channel of its group,
+    or the channel playing the sound with the lowest priority if that priority is lower than its own.
+    Otherwise the sound is dropped.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Ensures that only one instance of the ChannelManager class exists (Singleton pattern).
+
+        Returns:
+            ChannelManager: The single instance of the ChannelManager class.
+        """
+        if not cls._instance:
+            cls._instance = super(ChannelManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, groups: dict[str, int] = CHANNEL_GROUPS) -> None:
+        """
+        Initializes the manager the first time it is created, reserving the channels of every group.
+
+        Args:
+            groups (dict[str, int], optional): Maps the group names to their number of channels. Defaults to `CHANNEL_GROUPS`.
+        """
+        if not hasattr(self, "initialized"):  # Prevent re-initialization
+            self.bank = SoundBank()
+            self.groups = {}
+            self.priorities = {}  # Channel id -> priority of the sound it is playing
+            self.dropped = 0  # Sounds not played because every channel of their group was busy
+            for name, voices in groups.items():
+                self.add_group(name, voices)
+            self.initialized = True
+
+    def add_group(self, name: str, voices: int) -> list[int]:
+        """
+        Reserves a new group of channels after the ones already in use.
+
+        Args:
+            name (str): Name of the group.
+            voices (int): Number of channels of the group.
+
+        Returns:
+            list[int]: The ids of the channels of the group.
+        """
+        first = sum(len(channels) for channels in self.groups.values())
+        if pygame.mixer.get_num_channels() < first + voices:
+            pygame.mixer.set_num_channels(first + voices)
+        pygame.mixer.set_reserved(first + voices)  # Keep Sound.play from using the managed channels
+        self.groups[name] = list(range(first, first + voices))
+        return self.groups[name]
+
+    def get_channel(self, priority: int = PRIORITY_EVENT, group: str = "sfx") -> int|None:
+        """
+        Picks the channel a sound should play on.
+
+        Args:
+            priority (int, optional): Priority of the sound. Defaults to `PRIORITY_EVENT`.
+            group (str, optional): Group of channels to play on. Defaults to "sfx".
+
+        Returns:
+            int | None: The id of a free channel or of the channel playing a lower priority sound, or None.
+        """
+        lowest = None
+        for channel_id in self.groups[group]:
+            if not pygame.mixer.Channel(channel_id).get_busy():
+                return channel_id
+            if lowest is None or self.priorities.get(channel_id, 0) < self.priorities.get(lowest, 0):
+                lowest = channel_id
+        if lowest is not None and self.priorities.get(lowest, 0) < priority:
+            return lowest
+        return None
+
+    def play(self, name: str, priority: int = PRIORITY_EVENT, followed_by: str|None = None, group: str = "sfx") -> pygame.mixer.Channel|None:
+        """
+        Plays a sound of the bank.
+
+        Args:
+            name (str): Name of the sound.
+            priority (int, optional): Priority of the sound. Defaults to `PRIORITY_EVENT`.
+            followed_by (str | None, optional): Name of a sound queued on the same channel after this one. Defaults to None.
+            group (str, optional): Group of channels to play on. Defaults to "sfx".
+
+        Returns:
+            pygame.mixer.Channel | None: The channel playing the sound, or None if it was dropped.
+        """
+        channel_id = self.get_channel(priority, group)
+        if channel_id is None:
+            self.dropped += 1
+            return None
+        channel = pygame.mixer.Channel(channel_id)
+        channel.play(self.bank.get(name))
+        if followed_by is not None:
+            channel.queue(self.bank.get(followed_by))
+        self.priorities[channel_id] = priority
+        return channel
+
+    def set_volume(self, volume: float) -> None:
+        """
+        Sets the volume of every managed channel.
+
+        Args:
+            volume (float): The volume, from 0.0 to 1.0.
+        """
+        for channels in self.groups.values():
+            for channel_id in channels:
+                pygame.mixer.Channel(channel_id).set_volume(volume)
@@ -0,0 +1,358 @@
+"""
+Offline bake of the assets into a cache of display-ready data.
+
+Every launch used to repeat the same work on the source PNGs: decoding them, scaling the item icons and building
+the collision masks. The bake does it once: images are stored as raw RGBA pixels (already scaled when the game
+uses them at another size), which only need a copy to become a surface, and collision masks as packed bits.
+The artifacts are listed in a manifest with the mtime, size and hash of their source file, so baking again only
+rebuilds the artifacts whose source changed.
+
+The runtime loaders of the `AssetRegistry` ask `baked_assets` first and fall back to the source PNG when an asset
+was not baked or its source changed since. Bake with:
+
+    python -m src.engine.bake
+
+Classes:
+    - AssetBaker: Bakes the assets and reads the baked artifacts back.
+
+Functions:
+    - source_stats: Returns the mtime, size and hash of a source file.
+    - mask_to_bytes: Packs the bits of a mask.
+    - mask_from_bytes: Unpacks the bits of a mask.
+    - load_rgba: Decodes a source image into RGBA pixels, scaled like the game scales it.
+    - bake_assets: Bakes the assets folder, rebuilding only what changed.
+"""
+
+import os
+import json
+import glob
+import fnmatch
+import hashlib
+import threading
+
+import pygame
+
+from settings import ASSETS_DIR, BAKE_DIR, BLUE
+
+BAKE_VERSION = 1
+
+# What is baked from the assets folder: (pattern, kind, parameters), the parameters the game loads them with
+BAKE_RULES = [
+    ("images/**/*.png", "image", {}),
+    ("ui/*/*.png", "image", {}),
+    ("images/items/*.png", "image", {"size": (32, 32)}),  # Icons of the inventory, see Item
+    ("images/backgrounds/*_collision.png", "mask", {"colorkey": BLUE}),
+    ("images/characters/*_hitbox.png", "mask", {}),
+]
+BAKE_EXCLUDE = ["ui/*Old/*"]  # Animations not used by the game
+
+
+def source_stats(path: str) -> dict:
+    """
+    Returns the mtime, size and hash of a source file.
+
+    Args:
+        path (str): The source file.
+
+    Returns:
+        dict: The keys 'mtime', 'size' and 'hash'.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    return {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+
+
+def mask_to_bytes(mask: pygame.mask.Mask) -> bytes:
+    """
+    Packs the bits of a mask, row by row, 8 pixels per byte.
+
+    Args:
+        mask (pygame.mask.Mask): The mask.
+
+    Returns:
+        bytes: The packed bits.
+    """
+    import numpy as np  # Only imported when masks are baked or read, it is slow to import
+    surface = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
+    bits = pygame.surfarray.array_alpha(surface).T > 0  # surfarray is indexed by column first
+    return np.packbits(bits).tobytes()
+
+
+def mask_from_bytes(data: bytes, size: tuple[int, int]) -> pygame.mask.Mask:
+    """
+    Unpacks the bits of a mask packed by `mask_to_bytes`.
+
+    Args:
+        data (bytes): The packed bits.
+        size (tuple[int, int]): The width and height of the mask.
+
+    Returns:
+        pygame.mask.Mask: The mask.
+    """
+    import numpy as np
+    width, height = size
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=width * height)
+    # One byte per pixel, the pixels at 0 are transparent
+    surface = pygame.image.frombytes(bits.tobytes(), size, "P")
+    surface.set_colorkey(0)
+    return pygame.mask.from_surface(surface)
+
+
+def load_rgba(path: str, size: tuple[int, int]|None = None) -> pygame.Surface:
+    """
+    Decodes a source image into 32 bit RGBA pixels, scaled like the game scales it.
+
+    Args:
+        path (str): The source image.
+        size (tuple[int, int] | None, optional): Size to scale the image to. Defaults to None.
+
+    Returns:
+        pygame.Surface: The image, not converted to the display format.
+    """
+    source = pygame.image.load(path)
+    surface = pygame.image.frombytes(pygame.image.tobytes(source, "RGBA"), source.get_size(), "RGBA")
+    if size is not None:
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+
+class AssetBaker:
+    """
+    Bakes the assets into display-ready artifacts listed in a manifest, and reads the artifacts back for the
+    runtime loaders while their source files are unchanged.
+    """
+    def __init__(self, assets_dir: str = ASSETS_DIR, bake_dir: str = BAKE_DIR) -> None:
+        """
+        Initializes the baker. The manifest is only read when an artifact is first requested.
+
+        Args:
+            assets_dir (str, optional): Folder of the source assets. Defaults to `ASSETS_DIR`.
+            bake_dir (str, optional): Folder of the artifacts and the manifest. Defaults to `BAKE_DIR`.
+        """
+        self.assets_dir = assets_dir
+        self.bake_dir = bake_dir
+        self.manifest_path = os.path.join(bake_dir, "manifest.json")
+        self.entries = {}  # Key -> entry with the artifact file, its size and the stats of the source
+        self.loaded = False
+        self.lock = threading.Lock()  # Artifacts are read from the decoding threads
+        self.hits = 0  # Assets read from the artifacts
+        self.misses = 0  # Assets that had to be loaded from their source
+
+    @staticmethod
+    def key(kind: str, path: str, params: dict) -> str:
+        """
+        Returns the key of an artifact in the manifest.
+
+        Args:
+            kind (str): "image" or "mask".
+            path (str): The source file.
+            params (dict): The load parameters.
+
+        Returns:
+            str: The key.
+        """
+        params = ",".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+        return f"{kind}:{os.path.normpath(path)}:{params}"
+
+    def load(self) -> None:
+        """
+        Reads the manifest. A missing, corrupted or outdated manifest is ignored.
+        """
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            try:
+                with open(self.manifest_path, encoding='utf8') as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                return
+            if isinstance(data, dict) and data.get('version') == BAKE_VERSION:
+                self.entries = data['entries']
+
+    def save(self) -> None:
+        """
+        Writes the manifest, replacing it atomically.
+        """
+        os.makedirs(self.bake_dir, exist_ok=True)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf8') as file:
+            json.dump({'version': BAKE_VERSION, 'entries': self.entries}, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def fresh(self, entry: dict|None, path: str) -> bool:
+        """
+        Tells whether an artifact was baked from the current content of its source file. The source is only
+        hashed again if its mtime or size changed.
+
+        Args:
+            entry (dict | None): The entry of the artifact in the manifest.
+            path (str): The source file.
+
+        Returns:
+            bool: True if the artifact can be used.
+        """
+        if entry is None or not os.path.exists(os.path.join(self.bake_dir, entry['file'])):
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return True
+        return entry['hash'] == source_stats(path)['hash']
+
+    def read(self, kind: str, path: str, params: dict) -> tuple[bytes, tuple[int, int]]|None:
+        """
+        Returns the data of an artifact, if it is baked and fresh.
+
+        Args:
+            kind (str): "image" or "mask".
+            path (str): The source file.
+            params (dict): The load parameters.
+
+        Returns:
+            tuple[bytes, tuple[int, int]] | None: The data and the size of the asset, None to load the source.
+        """
+        self.load()
+        entry = self.entries.get(self.key(kind, path, params))
+        if not self.fresh(entry, path):
+            self.misses += 1
+            return None
+        with open(os.path.join(self.bake_dir, entry['file']), 'rb') as file:
+            data = file.read()
+        self.hits += 1
+        return data, tuple(entry['width_height'])
+
+    def image(self, path: str, size: tuple[int, int]|None = None) -> pygame.Surface|None:
+        """
+        Returns a baked image, not converted to the display format yet.
+
+        Args:
+            path (str): The source image.
+            size (tuple[int, int] | None, optional): The size the image is scaled to. Defaults to None.
+
+        Returns:
+            pygame.Surface | None: The image, None if it is not baked or its source changed.
+        """
+        baked = self.read("image", path, {"size": size})
+        if baked is None:
+            return None
+        data, size = baked
+        return pygame.image.frombytes(data, size, "RGBA")
+
+    def mask(self, path: str, colorkey: tuple[int, int, int]|None = None) -> pygame.mask.Mask|None:
+        """
+        Returns a baked collision mask.
+
+        Args:
+            path (str): The source image.
+            colorkey (tuple[int, int, int] | None, optional): Color of the image that does not collide.
+                Defaults to None.
+
+        Returns:
+            pygame.mask.Mask | None: The mask, None if it is not baked or its source changed.
+        """
+        baked = self.read("mask", path, {"colorkey": colorkey})
+        if baked is None:
+            return None
+        return mask_from_bytes(*baked)
+
+    def targets(self) -> list[tuple[str, str, dict]]:
+        """
+        Lists the artifacts to bake, following `BAKE_RULES`.
+
+        Returns:
+            list[tuple[str, str, dict]]: The kind, source file and load parameters of each artifact.
+        """
+        targets = []
+        for pattern, kind, params in BAKE_RULES:
+            for path in sorted(glob.glob(os.path.join(self.assets_dir, pattern), recursive=True)):
+                relative = os.path.relpath(path, self.assets_dir)
+                if not any(fnmatch.fnmatch(relative, exclude) for exclude in BAKE_EXCLUDE):
+                    targets.append((kind, os.path.normpath(path), params))
+        return targets
+
+    def bake(self, kind: str, path: str, params: dict) -> dict:
+        """
+        Bakes an artifact and returns its entry in the manifest.
+
+        Args:
+            kind (str): "image" or "mask".
+            path (str): The source file.
+            params (dict): The load parameters.
+
+        Returns:
+            dict: The entry of the artifact.
+        """
+        key = self.key(kind, path, params)
+        if kind == "image":
+            surface = load_rgba(path, params.get("size"))
+            data, size = pygame.image.tobytes(surface, "RGBA"), surface.get_size()
+            extension = ".rgba"
+        else:
+            # Same mask as the one built at runtime from the image and its colorkey
+            surface = load_rgba(path)
+            if params.get("colorkey") is not None:
+                surface.set_colorkey(params["colorkey"])
+            mask = pygame.mask.from_surface(surface)
+            data, size = mask_to_bytes(mask), mask.get_size()
+            extension = ".bits"
+        filename = hashlib.sha1(key.encode('utf8')).hexdigest()[:16] + extension
+        with open(os.path.join(self.bake_dir, filename), 'wb') as file:
+            file.write(data)
+        return dict(source_stats(path), file=filename, width_height=list(size))
+
+    def build(self) -> int:
+        """
+        Bakes the assets whose source changed since the last bake, and deletes the artifacts of the sources
+        that no longer exist.
+
+        Returns:
+            int: The number of artifacts baked.
+        """
+        self.load()
+        os.makedirs(self.bake_dir, exist_ok=True)
+        baked = 0
+        entries = {}
+        for kind, path, params in self.targets():
+            key = self.key(kind, path, params)
+            entry = self.entries.get(key)
+            if not self.fresh(entry, path):
+                entry = self.bake(kind, path, params)
+                baked += 1
+            elif entry['mtime'] != os.stat(path).st_mtime_ns:
+                entry = dict(entry, **source_stats(path))  # Touched but unchanged
+            entries[key] = entry
+        for key, entry in self.entries.items():
+            if key not in entries:
+                try:
+                    os.remove(os.path.join(self.bake_dir, entry['file']))
+                except OSError:
+                    pass
+        self.entries = entries
+        self.save()
+        return baked
+
+
+def bake_assets(assets_dir: str = ASSETS_DIR, bake_dir: str = BAKE_DIR) -> int:
+    """Bakes the assets, rebuilding only the artifacts whose source changed.
+
+    Args:
+        assets_dir (str, optional): Folder of the source assets. Defaults to `ASSETS_DIR`.
+        bake_dir (str, optional): Folder of the artifacts. Defaults to `BAKE_DIR`.
+
+    Returns:
+        int: The number of artifacts baked.
+    """
+    return AssetBaker(assets_dir, bake_dir).build()
+
+
+# Shared baker read by the asset registry, the manifest is read on the first request
+baked_assets = AssetBaker()
+
+
+if __name__ == "__main__":
+    baked = bake_assets()
+    print(f"Baked {baked} asset(s) into {BAKE_DIR}")
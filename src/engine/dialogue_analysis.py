@@ -0,0 +1,296 @@
+"""
+Offline Monte Carlo analysis of the dialogue scripts.
+
+Balancing the `difficulty_class` of the skill checks used to require playing through the dialogues. This module
+simulates many traversals of a compiled dialogue graph at once, following the same rules as `DialogueManager`:
+choices are picked uniformly, skill checks roll a d20 plus the skill against the difficulty class, and the health
+and reason changes of a node are applied when the player leaves it. The starting skills are drawn from every way
+of spending the points of the `NewGame` character creation.
+
+All the walkers of a batch advance together with NumPy arrays, so each step costs a handful of vectorised
+operations instead of one dice roll per walker. Batches can be spread over a process pool.
+
+Usage:
+    python -m src.engine.dialogue_analysis scripts/room_101/tv.json --runs 1000000 --workers 4
+
+Functions:
+    - skill_allocations: Lists every allocation of the character creation points between the skills.
+    - compile_arrays: Converts a compiled dialogue graph into the arrays used by the simulation.
+    - simulate: Simulates a batch of traversals and returns the accumulated statistics.
+    - analyse_script: Runs the whole analysis of a dialogue graph, optionally on several processes.
+    - format_report: Formats the result of an analysis as a table.
+"""
+
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from settings import SKILL_POINTS, STARTING_HEALTH, STARTING_REASON
+
+# Same order as `Player.get_skills`
+SKILLS = ("Eloquence", "Clairvoyance", "Forbearance", "Resonance")
+
+
+def skill_allocations(points: int = SKILL_POINTS, spend_all: bool = True) -> np.ndarray:
+    """Lists every allocation of the character creation points between the skills.
+
+    Args:
+        points (int, optional): Points available in the character creation. Defaults to `SKILL_POINTS`.
+        spend_all (bool, optional): Whether every point must be spent. Defaults to True.
+
+    Returns:
+        np.ndarray: An array of shape (allocations, skills), in the order of `SKILLS`.
+    """
+    allocations = [values for values in itertools.product(range(points + 1), repeat=len(SKILLS))
+                   if sum(values) == points or (not spend_all and sum(values) <= points)]
+    return np.array(allocations, dtype=np.int16)
+
+
+def compile_arrays(graph: dict, condition: int = 1) -> dict:
+    """Converts a compiled dialogue graph into the arrays used by the simulation.
+
+    Nodes with choices point to the nodes of their keys, check nodes point to their "Pass" and "Fail" nodes,
+    and every other node ends the dialogue (e.g. "End" or a change of scene). A target of -1 means the node
+    does not exist, which also ends the dialogue.
+
+    Args:
+        graph (dict): A dialogue graph compiled by the script bundle.
+        condition (int, optional): Dialogue condition selecting the "Start" node, like in `DialogueManager`. Defaults to 1.
+
+    Returns:
+        dict: The node titles and the arrays describing the graph.
+    """
+    nodes = graph['nodes']
+    titles = [node['title'] for node in nodes]
+    index = {}
+    for i, title in enumerate(titles):
+        index.setdefault(title, i)
+
+    n = len(nodes)
+    max_choices = max([len(node.get('key', {})) for node in nodes] + [1])
+    choice_targets = np.full((n, max_choices), -1, dtype=np.int32)
+    choice_count = np.zeros(n, dtype=np.int32)
+    check_skill = np.full(n, -1, dtype=np.int32)
+    check_dc = np.zeros(n, dtype=np.int32)
+    pass_target = np.full(n, -1, dtype=np.int32)
+    fail_target = np.full(n, -1, dtype=np.int32)
+    health_delta = np.zeros(n, dtype=np.int32)
+    reason_delta = np.zeros(n, dtype=np.int32)
+
+    for i, node in enumerate(nodes):
+        title = node['title']
+        if title == "End":
+            continue
+        if "Check" in title and node.get('check_skill') and node.get('difficulty_class'):
+            skill = node['check_skill'].capitalize()
+            # Unknown skills count as 0, like `Player.roll_skill_check` (last column of the skills array)
+            check_skill[i] = SKILLS.index(skill) if skill in SKILLS else len(SKILLS)
+            check_dc[i] = node['difficulty_class']
+            pass_target[i] = index.get(title.replace("Check", "Pass"), -1)
+            fail_target[i] = index.get(title.replace("Check", "Fail"), -1)
+        elif 'key' in node:
+            targets = [index.get(target, -1) for target in node['key'].values()]
+            choice_targets[i, :len(targets)] = targets
+            choice_count[i] = len(targets)
+            health_delta[i] = node.get('health', 0)
+            reason_delta[i] = node.get('reason', 0)
+
+    start_count = sum(1 for title in titles if "Start" in title)
+    start_title = f"Start{condition}" if start_count > 1 else "Start"
+    return {
+        "titles": titles,
+        "start": index.get(start_title, -1),
+        "choice_targets": choice_targets,
+        "choice_count": choice_count,
+        "check_skill": check_skill,
+        "check_dc": check_dc,
+        "pass_target": pass_target,
+        "fail_target": fail_target,
+        "health_delta": health_delta,
+        "reason_delta": reason_delta,
+    }
+
+
+def simulate(arrays: dict, allocations: np.ndarray, runs: int, seed, health: int = STARTING_HEALTH,
+             reason: int = STARTING_REASON, max_steps: int = 200) -> dict:
+    """Simulates a batch of traversals of a dialogue graph.
+
+    Args:
+        arrays (dict): The graph arrays returned by `compile_arrays`.
+        allocations (np.ndarray): The skill allocations the starting skills are drawn from, uniformly.
+        runs (int): Number of traversals to simulate.
+        seed (int | np.random.SeedSequence): Seed of the random generator of the batch.
+        health (int, optional): Starting health. Defaults to `STARTING_HEALTH`.
+        reason (int, optional): Starting reason. Defaults to `STARTING_REASON`.
+        max_steps (int, optional): Traversals still going after this many steps are counted as unfinished. Defaults to 200.
+
+    Returns:
+        dict: Per node counts of walkers that reached it, sums of their health and reason deltas when they
+        first reached it and number of deaths when leaving it, plus the number of deaths and unfinished runs.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(arrays['titles'])
+    counts = {
+        "runs": runs,
+        "reached": np.zeros(n, dtype=np.int64),
+        "health": np.zeros(n, dtype=np.float64),
+        "reason": np.zeros(n, dtype=np.float64),
+        "deaths": np.zeros(n, dtype=np.int64),
+        "unfinished": 0,
+    }
+    if arrays['start'] < 0 or runs <= 0:
+        return counts
+
+    # Starting skills, with an extra column of zeros for unknown skills
+    skills = np.zeros((runs, len(SKILLS) + 1), dtype=np.int16)
+    skills[:, :len(SKILLS)] = allocations[rng.integers(0, len(allocations), runs)]
+
+    walkers = np.arange(runs)
+    node = np.full(runs, arrays['start'], dtype=np.int32)
+    health_delta = np.zeros(runs, dtype=np.int32)
+    reason_delta = np.zeros(runs, dtype=np.int32)
+    reached = np.zeros((runs, n), dtype=bool)
+
+    for _ in range(max_steps):
+        if len(walkers) == 0:
+            break
+        current = node[walkers]
+
+        # Statistics of the walkers reaching a node for the first time
+        first_visit = ~reached[walkers, current]
+        reached[walkers, current] = True
+        counts['reached'] += np.bincount(current[first_visit], minlength=n)
+        counts['health'] += np.bincount(current[first_visit], weights=health_delta[walkers][first_visit], minlength=n)
+        counts['reason'] += np.bincount(current[first_visit], weights=reason_delta[walkers][first_visit], minlength=n)
+
+        next_node = np.full(len(walkers), -1, dtype=np.int32)
+        alive = np.ones(len(walkers), dtype=bool)
+
+        # Skill checks: one batched d20 roll for every walker on a check node
+        is_check = arrays['check_skill'][current] >= 0
+        if is_check.any():
+            check_nodes = current[is_check]
+            rolls = rng.integers(1, 21, is_check.sum())
+            skill_values = skills[walkers[is_check], arrays['check_skill'][check_nodes]]
+            passed = rolls + skill_values >= arrays['check_dc'][check_nodes]
+            next_node[is_check] = np.where(passed, arrays['pass_target'][check_nodes], arrays['fail_target'][check_nodes])
+
+        # Choices: uniform pick among the keys, then the stats of the node are applied
+        is_choice = ~is_check & (arrays['choice_count'][current] > 0)
+        if is_choice.any():
+            choice_nodes = current[is_choice]
+            picks = (rng.random(is_choice.sum()) * arrays['choice_count'][choice_nodes]).astype(np.int32)
+            next_node[is_choice] = arrays['choice_targets'][choice_nodes, picks]
+            choosers = walkers[is_choice]
+            health_delta[choosers] += arrays['health_delta'][choice_nodes]
+            reason_delta[choosers] += arrays['reason_delta'][choice_nodes]
+            dead = (health + health_delta[choosers] <= 0) | (reason + reason_delta[choosers] <= 0)
+            counts['deaths'] += np.bincount(choice_nodes[dead], minlength=n)
+            alive[np.flatnonzero(is_choice)[dead]] = False
+
+        node[walkers] = next_node
+        walkers = walkers[alive & (next_node >= 0)]
+
+    counts['unfinished'] = len(walkers)
+    return counts
+
+
+def _merge(total: dict, counts: dict) -> dict:
+    """Adds the counts of a batch to the running totals."""
+    if total is None:
+        return counts
+    for key in total:
+        total[key] = total[key] + counts[key]
+    return total
+
+
+def analyse_script(graph: dict, runs: int = 1_000_000, workers: int = 1, condition: int = 1, seed: int|None = None,
+                   allocations: np.ndarray|None = None, health: int = STARTING_HEALTH, reason: int = STARTING_REASON,
+                   batch_size: int = 100_000) -> dict:
+    """Runs the Monte Carlo analysis of a dialogue graph.
+
+    Args:
+        graph (dict): A dialogue graph compiled by the script bundle.
+        runs (int, optional): Number of traversals to simulate. Defaults to 1,000,000.
+        workers (int, optional): Number of processes; 1 runs in the current process. Defaults to 1.
+        condition (int, optional): Dialogue condition selecting the "Start" node. Defaults to 1.
+        seed (int | None, optional): Seed of the analysis, for reproducible results. Defaults to None.
+        allocations (np.ndarray | None, optional): Starting skill allocations. Defaults to every allocation
+            spending all the `SKILL_POINTS`.
+        health (int, optional): Starting health. Defaults to `STARTING_HEALTH`.
+        reason (int, optional): Starting reason. Defaults to `STARTING_REASON`.
+        batch_size (int, optional): Traversals simulated at once by each batch. Defaults to 100,000.
+
+    Returns:
+        dict: The report, with one row per node (title, reach probability, mean health and reason deltas when
+        reaching it, death rate when leaving it) and the overall death and unfinished rates.
+    """
+    arrays = compile_arrays(graph, condition)
+    if allocations is None:
+        allocations = skill_allocations()
+    sizes = [min(batch_size, runs - start) for start in range(0, runs, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(arrays, allocations, size, batch_seed, health, reason) for size, batch_seed in zip(sizes, seeds)]
+
+    total = None
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for counts in executor.map(simulate, *zip(*jobs)):
+                total = _merge(total, counts)
+    else:
+        for job in jobs:
+            total = _merge(total, simulate(*job))
+
+    rows = []
+    for i, title in enumerate(arrays['titles']):
+        reached = total['reached'][i]
+        rows.append({
+            "title": title,
+            "reach": reached / runs,
+            "health": total['health'][i] / reached if reached else 0.0,
+            "reason": total['reason'][i] / reached if reached else 0.0,
+            "death_rate": total['deaths'][i] / reached if reached else 0.0,
+        })
+    return {
+        "runs": runs,
+        "nodes": rows,
+        "death_rate": total['deaths'].sum() / runs,
+        "unfinished": total['unfinished'] / runs,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Formats the result of an analysis as a table.
+
+    Args:
+        report (dict): The report returned by `analyse_script`.
+
+    Returns:
+        str: The report as text, one line per node.
+    """
+    lines = [f"{'Node':<28}{'Reach':>9}{'Health':>9}{'Reason':>9}{'Death':>9}"]
+    for row in report['nodes']:
+        lines.append(f"{row['title']:<28}{row['reach']:>9.2%}{row['health']:>+9.3f}{row['reason']:>+9.3f}{row['death_rate']:>9.2%}")
+    lines.append(f"{report['runs']} runs | death rate {report['death_rate']:.2%} | unfinished {report['unfinished']:.2%}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from src.engine.script_bundle import script_bundle
+
+    parser = argparse.ArgumentParser(description="Monte Carlo analysis of a dialogue script.")
+    parser.add_argument("script", help="path to the JSON script, e.g. scripts/room_101/tv.json")
+    parser.add_argument("--runs", type=int, default=1_000_000, help="number of simulated traversals")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes")
+    parser.add_argument("--condition", type=int, default=1, help="dialogue condition selecting the Start node")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible results")
+    parser.add_argument("--health", type=int, default=STARTING_HEALTH, help="starting health")
+    parser.add_argument("--reason", type=int, default=STARTING_REASON, help="starting reason")
+    parser.add_argument("--allow-unspent", action="store_true", help="also draw allocations that leave points unspent")
+    args = parser.parse_args()
+
+    report = analyse_script(script_bundle.get(args.script), args.runs, args.workers, args.condition, args.seed,
+                            skill_allocations(spend_all=not args.allow_unspent), args.health, args.reason)
+    print(format_report(report))
@@ -0,0 +1,158 @@
+"""
+Publish/subscribe event bus for the changes of the game state.
+
+The scenes, the inventory and the player publish typed events when their state changes, so the other
+systems (quest rules, music, HUD, telemetry...) subscribe to them instead of polling every frame.
+A subscriber is called either synchronously, inside `publish`, or queued and called by `flush` at the
+end of the frame. Subscribing to `GameEvent` receives every event.
+
+Classes:
+    - GameEvent: Base class of the events.
+    - ConditionChanged: A dialogue condition of a scene changed.
+    - InventoryChanged: An item was added to or removed from the inventory.
+    - StatChanged: The health or the reason of the player changed.
+    - SceneChanged: The player moved to another scene.
+    - EventBus: Delivers the events to their subscribers.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """
+    Base class of the events published on the bus.
+    """
+
+
+@dataclass(frozen=True)
+class ConditionChanged(GameEvent):
+    """
+    A dialogue condition of a scene changed.
+
+    Attributes:
+        scene (str): Name of the scene, e.g. "floor_1".
+        condition (str): Name of the condition, e.g. "bookshelf".
+        old (int): The previous value.
+        new (int): The new value.
+    """
+    scene: str
+    condition: str
+    old: int
+    new: int
+
+
+@dataclass(frozen=True)
+class InventoryChanged(GameEvent):
+    """
+    An item was added to or removed from the inventory.
+
+    Attributes:
+        item (Item): The item.
+        added (bool): True if the item was added, False if it was removed.
+    """
+    item: object
+    added: bool
+
+
+@dataclass(frozen=True)
+class StatChanged(GameEvent):
+    """
+    A stat of the player changed.
+
+    Attributes:
+        stat (str): Name of the stat, "health" or "reason".
+        old (int): The previous value.
+        new (int): The new value.
+    """
+    stat: str
+    old: int
+    new: int
+
+
+@dataclass(frozen=True)
+class SceneChanged(GameEvent):
+    """
+    The player moved to another scene.
+
+    Attributes:
+        old (str | None): Name of the previous scene, None when the game starts.
+        new (str): Name of the new scene.
+    """
+    old: str|None
+    new: str
+
+
+class EventBus:
+    """
+    Delivers the published events to the subscribers of their type (and of its base classes).
+    """
+    def __init__(self) -> None:
+        """
+        Initializes a bus without subscribers.
+        """
+        self.subscribers = {}  # Event type -> list of (callback, queued)
+        self.queue = []  # (callback, event) waiting for the end of the frame
+        self.published = {}  # Name of the event type -> number of events published
+
+    def subscribe(self, event_type: type, callback, queued: bool = False):
+        """
+        Subscribes a callback to a type of event.
+
+        Args:
+            event_type (type): The type of event, a subclass of `GameEvent` or `GameEvent` itself for every event.
+            callback (callable): Called with the event.
+            queued (bool, optional): If True, the callback is called by `flush` instead of `publish`. Defaults to False.
+
+        Returns:
+            callable: The callback, so that the method can be used as a decorator.
+        """
+        self.subscribers.setdefault(event_type, []).append((callback, queued))
+        return callback
+
+    def unsubscribe(self, event_type: type, callback) -> None:
+        """
+        Removes a callback from the subscribers of a type of event.
+
+        Args:
+            event_type (type): The type of event.
+            callback (callable): The callback.
+        """
+        self.subscribers[event_type] = [(subscriber, queued) for subscriber, queued in self.subscribers.get(event_type, [])
+                                        if subscriber != callback]
+
+    def publish(self, event: GameEvent) -> None:
+        """
+        Publishes an event: calls its synchronous subscribers and queues it for the others.
+
+        Args:
+            event (GameEvent): The event.
+        """
+        name = type(event).__name__
+        self.published[name] = self.published.get(name, 0) + 1
+        for event_type in type(event).__mro__:
+            for callback, queued in tuple(self.subscribers.get(event_type, ())):
+                if queued:
+                    self.queue.append((callback, event))
+                else:
+                    callback(event)
+
+    def flush(self) -> int:
+        """
+        Delivers the queued events, called once at the end of every frame. Events published by the
+        subscribers meanwhile are delivered too.
+
+        Returns:
+            int: The number of queued deliveries made.
+        """
+        delivered = 0
+        while self.queue:
+            queue, self.queue = self.queue, []
+            for callback, event in queue:
+                callback(event)
+            delivered += len(queue)
+        return delivered
+
+
+# Bus shared by the whole game
+event_bus = EventBus()
@@ -0,0 +1,155 @@
+"""
+Scheduling of Python's garbage collector around the frames of the game loop.
+
+Left alone, the cyclic garbage collector runs whenever enough objects were allocated, in the middle of a frame,
+and its full collections walk every object of the game: the loaded scenes, the compiled scripts, the sprites.
+While the game runs, the `GCScheduler` disables the automatic collections and runs them itself after the frames,
+when the frame left enough time before the next one is due:
+
+    - The generation Python would have collected is collected after a frame with enough idle time, the cost of
+      each generation is measured to know whether it fits.
+    - If a collection keeps not fitting, it is forced once it is `force_factor` times overdue, so that the
+      memory stays bounded on slow machines.
+    - After loading (the start of the game, a change of scene), the objects are collected then frozen
+      (`gc.freeze`): they are moved to a permanent generation that the collections no longer walk. The next
+      freeze unfreezes them first, so the scenes unloaded since are collected too.
+
+Classes:
+    - GCScheduler: Runs the garbage collections in the idle time between the frames.
+"""
+
+import gc
+import time
+
+from settings import FPS, GC_FORCE_FACTOR
+
+
+class GCScheduler:
+    """
+    Disables the automatic garbage collections while the game runs and runs them between the frames.
+    """
+    def __init__(self, frame_ms: float = 1000 / FPS, force_factor: int = GC_FORCE_FACTOR) -> None:
+        """
+        Initializes a stopped scheduler.
+
+        Args:
+            frame_ms (float, optional): The period of the frames. Defaults to the period at `FPS`.
+            force_factor (int, optional): A collection is forced once its count reaches `force_factor` times
+                its threshold. Defaults to `GC_FORCE_FACTOR`.
+        """
+        self.frame_ms = frame_ms
+        self.force_factor = force_factor
+        self.running = False
+        self.was_enabled = True
+        self.frame_start = None
+        self.costs = [0.0, 0.0, 0.0]  # Estimated milliseconds of a collection of each generation
+        self.collections = [0, 0, 0]  # Collections run per generation
+        self.forced = 0  # Collections run without enough idle time
+        self.freeze_pending = False
+        self.freezes = 0
+
+    def start(self) -> None:
+        """
+        Disables the automatic collections. The objects loaded until now are frozen after the next frame.
+        """
+        if self.running:
+            return
+        self.was_enabled = gc.isenabled()
+        gc.disable()
+        self.running = True
+        self.freeze_pending = True
+
+    def stop(self) -> None:
+        """
+        Gives the collections back to Python.
+        """
+        if not self.running:
+            return
+        self.running = False
+        if self.was_enabled:
+            gc.enable()
+
+    def request_freeze(self, *args) -> None:
+        """
+        Collects and freezes the objects after the current frame, e.g. when a scene was loaded.
+        Accepts the arguments of an event callback.
+        """
+        self.freeze_pending = True
+
+    def freeze(self) -> float:
+        """
+        Collects all the garbage, including the objects frozen before, then freezes the survivors.
+
+        Returns:
+            float: Milliseconds spent.
+        """
+        start = time.perf_counter()
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        self.freeze_pending = False
+        self.freezes += 1
+        return (time.perf_counter() - start) * 1000
+
+    def begin_frame(self) -> None:
+        """
+        Marks the start of a frame, to know the idle time left at its end.
+        """
+        self.frame_start = time.perf_counter()
+
+    def due_generation(self) -> int|None:
+        """
+        Returns the generation Python would collect now: the oldest one whose count reached its threshold.
+
+        Returns:
+            int | None: The generation, None if no collection is due.
+        """
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        for generation in (2, 1, 0):
+            if thresholds[generation] and counts[generation] >= thresholds[generation]:
+                return generation
+        return None
+
+    def overdue(self, generation: int) -> bool:
+        """
+        Tells whether a collection has waited too long for idle time.
+
+        Args:
+            generation (int): The generation.
+
+        Returns:
+            bool: True if its count reached `force_factor` times its threshold.
+        """
+        return gc.get_count()[generation] >= self.force_factor * gc.get_threshold()[generation]
+
+    def idle(self) -> int|None:
+        """
+        Runs the pending freeze, or the due collection if it fits in the idle time left in the frame.
+        Called after the frame, before the game loop waits for the next one.
+
+        Returns:
+            int | None: The generation collected, -1 for a freeze, None if nothing was collected.
+        """
+        if not self.running:
+            return None
+        if self.freeze_pending:
+            self.freeze()  # After loading, the frame is already late
+            return -1
+        generation = self.due_generation()
+        if generation is None:
+            return None
+        elapsed = (time.perf_counter() - self.frame_start) * 1000 if self.frame_start is not None else 0.0
+        remaining = self.frame_ms - elapsed
+        while generation > 0 and self.costs[generation] > remaining and not self.overdue(generation):
+            generation -= 1  # A younger generation may still fit
+        if self.costs[generation] > remaining:
+            if not self.overdue(generation):
+                return None
+            self.forced += 1
+        start = time.perf_counter()
+        gc.collect(generation)
+        cost = (time.perf_counter() - start) * 1000
+        # Running estimate, the first collection gives the first estimate
+        self.costs[generation] = cost if not self.collections[generation] else 0.8 * self.costs[generation] + 0.2 * cost
+        self.collections[generation] += 1
+        return generation
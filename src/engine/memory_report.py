@@ -0,0 +1,409 @@
+"""
+Memory report of the game's surfaces, masks and sounds, shown with F4 in the profiler overlay or printed at every
+change of scene with `python main.py --memory-report`.
+
+The surfaces and masks of pygame are not tracked by the garbage collector, so they cannot be listed with
+`gc.get_objects`. `take_memory_snapshot` walks the objects reachable from roots (the game, the shared videos, the
+sound bank, the asset registry) and records every surface, mask and sound it finds with its owner: the nearest
+object of the game's own classes on the way, e.g. `Video(assets/ui/Check).frames`, `Floor1(floor_1).image`,
+`SpriteSheet.sprites` or `DialogueBox.line_surfaces`. The roots are walked one after the other and an object is
+only recorded once, so an image shared with the asset registry belongs to the object using it, and the registry
+only owns the assets nobody else holds. The owners are grouped by subsystem, from the module of their class.
+
+Two snapshots can be diffed by owner, to see the scenes that are never released or the caches that keep growing.
+
+Classes:
+    - MemoryItem: A surface, mask or sound found in memory.
+    - MemorySnapshot: The items found by a walk, grouped by owner and subsystem.
+    - MemoryTracker: Diffs the snapshots taken after the changes of scene.
+
+Functions:
+    - subsystem_of: Returns the subsystem of an owner.
+    - describe: Returns the label of an owner.
+    - take_memory_snapshot: Walks the objects reachable from roots and records the surfaces, masks and sounds.
+"""
+
+import gc
+import sys
+import types
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+import pygame
+
+from src.engine.assets import surface_bytes, mask_bytes, sound_bytes
+from src.engine.events import event_bus, SceneChanged
+
+# Subsystem of the owners, from the module of their class (the first prefix matching)
+SUBSYSTEMS = [
+    ("src.ui.animated_sequence", "videos"),
+    ("src.scenes.hotel_scenes", "scenes"),
+    ("src.scenes.scene_registry", "scenes"),
+    ("src.characters", "sprites"),
+    ("src.ui.interaction", "text"),
+    ("src.ui.hud", "text"),
+    ("src.ui.widgets", "text"),
+    ("src.ui", "ui"),
+    ("src.scenes", "menus"),
+    ("src.engine.audio", "sounds"),
+    ("src.engine.music", "sounds"),
+    ("src.engine.assets", "asset cache"),
+    ("src.engine", "engine"),
+]
+
+# Objects not walked: code, classes and modules lead to everything else
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+                 types.CodeType, types.FrameType, str, bytes, bytearray, int, float, complex, bool, range,
+                 pygame.font.Font, threading.Thread, type(threading.Lock()), type(threading.RLock()))
+
+MAX_WALKED = 1_000_000  # Objects walked at most by a snapshot
+
+# The surface class bound at import, matched whatever `pygame.Surface` is bound to later
+_surface_class = pygame.Surface
+
+
+def game_class(obj) -> bool:
+    """
+    Tells whether an object is an instance of one of the game's classes.
+
+    Args:
+        obj (object): The object.
+
+    Returns:
+        bool: True for the classes of the `src` package and of `main`.
+    """
+    module = type(obj).__module__ or ""
+    return module.startswith("src.") or module in ("main", "__main__")
+
+
+def subsystem_of(owner) -> str:
+    """
+    Returns the subsystem of an owner, from the module of its class.
+
+    Args:
+        owner (object | None): The owner, None for the objects found outside of the game's classes.
+
+    Returns:
+        str: E.g. "videos", "scenes", "sprites", "text" or "game".
+    """
+    if owner is None:
+        return "other"
+    module = type(owner).__module__
+    for prefix, subsystem in SUBSYSTEMS:
+        if module.startswith(prefix):
+            return subsystem
+    return "game"
+
+
+def describe(owner) -> str:
+    """
+    Returns the label of an owner: its class, with its name, folder or file if it has one.
+
+    Args:
+        owner (object | None): The owner.
+
+    Returns:
+        str: E.g. "Video(assets/ui/Check)".
+    """
+    if owner is None:
+        return "?"
+    for attribute in ("name", "folder", "path"):
+        value = getattr(owner, attribute, None)
+        if isinstance(value, str):
+            return f"{type(owner).__name__}({value})"
+    return type(owner).__name__
+
+
+@dataclass
+class MemoryItem:
+    """
+    A surface, mask or sound found in memory.
+
+    Attributes:
+        kind (str): "surface", "mask" or "sound".
+        owner (str): The owner and its attribute holding the item, e.g. "Video(assets/ui/Check).frames".
+        subsystem (str): The subsystem of the owner.
+        size (tuple[int, int]): Width and height of a surface or mask, (0, 0) for a sound.
+        format (str): Pixel format of a surface (e.g. "32 bit alpha"), "bits" for a mask, "pcm" for a sound.
+        nbytes (int): Memory used by the pixels, bits or samples.
+    """
+    kind: str
+    owner: str
+    subsystem: str
+    size: tuple[int, int]
+    format: str
+    nbytes: int
+
+
+def surface_format(surface: pygame.Surface) -> str:
+    """
+    Describes the pixel format of a surface.
+
+    Args:
+        surface (pygame.Surface): The surface.
+
+    Returns:
+        str: The bits per pixel, and whether it has per-pixel alpha, a colorkey or shares its parent's pixels.
+    """
+    parts = [f"{surface.get_bitsize()} bit"]
+    if surface.get_flags() & pygame.SRCALPHA:
+        parts.append("alpha")
+    if surface.get_colorkey() is not None:
+        parts.append("colorkey")
+    if surface.get_parent() is not None:
+        parts.append("subsurface")
+    return " ".join(parts)
+
+
+def make_item(obj, owner: str, subsystem: str) -> MemoryItem|None:
+    """
+    Records a surface, mask or sound.
+
+    Args:
+        obj (object): The object found.
+        owner (str): The label of its owner.
+        subsystem (str): The subsystem of its owner.
+
+    Returns:
+        MemoryItem | None: The item, None if the object is not a surface, mask or sound.
+    """
+    if isinstance(obj, _surface_class):
+        # A subsurface shares the pixels of its parent
+        nbytes = 0 if obj.get_parent() is not None else surface_bytes(obj)
+        if obj is pygame.display.get_surface():
+            owner, subsystem = "display", "display"
+        return MemoryItem("surface", owner, subsystem, obj.get_size(), surface_format(obj), nbytes)
+    if isinstance(obj, pygame.mask.Mask):
+        return MemoryItem("mask", owner, subsystem, obj.get_size(), "bits", mask_bytes(obj))
+    if isinstance(obj, pygame.mixer.Sound):
+        return MemoryItem("sound", owner, subsystem, (0, 0), "pcm", sound_bytes(obj))
+    return None
+
+
+def children(obj, owner, label: str) -> list[tuple[object, object, str]]:
+    """
+    Lists the objects referenced by an object, with their owner and label.
+
+    Args:
+        obj (object): The object walked.
+        owner (object | None): The owner of the object.
+        label (str): The label of the owner and its attribute.
+
+    Returns:
+        list[tuple[object, object, str]]: The referenced objects, with their owner and label.
+    """
+    if game_class(obj):
+        # A new owner, its attributes are labelled with their name
+        name = describe(obj)
+        attributes = dict(getattr(obj, "__dict__", {}))
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                attributes[slot] = getattr(obj, slot)
+        return [(value, obj, f"{name}.{attribute}") for attribute, value in attributes.items()]
+    if isinstance(obj, dict):
+        return [(value, owner, label) for value in list(obj.values())] + \
+               [(key, owner, label) for key in list(obj) if not isinstance(key, (str, int, tuple))]
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return [(value, owner, label) for value in list(obj)]
+    if hasattr(obj, "__dict__"):
+        return [(value, owner, label) for value in list(vars(obj).values())]
+    # E.g. a partial or a weak reference
+    return [(value, owner, label) for value in gc.get_referents(obj)]
+
+
+def take_memory_snapshot(roots: list) -> 'MemorySnapshot':
+    """
+    Walks the objects reachable from each root in turn, and records the surfaces, masks and sounds found. The
+    later roots are not walked when an earlier root references them, so that they only own what the earlier roots
+    do not reach.
+
+    Args:
+        roots (list): The objects walked. The instances in the globals of a module are walked for a module.
+
+    Returns:
+        MemorySnapshot: The items found.
+    """
+    pending = {id(root) for root in roots}
+    seen = set()
+    items = []
+    walked = 0
+    for root in roots:
+        pending.discard(id(root))
+        if isinstance(root, types.ModuleType):
+            queue = deque((value, None, root.__name__) for value in vars(root).values())
+        else:
+            queue = deque([(root, None, describe(root))])
+        while queue and walked < MAX_WALKED:
+            obj, owner, label = queue.popleft()
+            if id(obj) in seen or id(obj) in pending or isinstance(obj, SKIPPED_TYPES) or obj is None:
+                continue
+            seen.add(id(obj))
+            walked += 1
+            item = make_item(obj, label, subsystem_of(owner))
+            if item is not None:
+                items.append(item)
+                continue
+            queue.extend(children(obj, owner, label))
+    return MemorySnapshot(items, walked)
+
+
+@dataclass
+class MemorySnapshot:
+    """
+    The surfaces, masks and sounds found by a walk.
+
+    Attributes:
+        items (list[MemoryItem]): The items.
+        walked (int): Objects walked.
+    """
+    items: list = field(default_factory=list)
+    walked: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the items, in bytes.
+        """
+        return sum(item.nbytes for item in self.items)
+
+    def by_subsystem(self) -> dict[str, tuple[int, int]]:
+        """
+        Totals the items by subsystem.
+
+        Returns:
+            dict[str, tuple[int, int]]: Subsystem -> (items, bytes), the largest first.
+        """
+        return self.totals(lambda item: item.subsystem)
+
+    def by_owner(self) -> dict[str, tuple[int, int]]:
+        """
+        Totals the items by owner.
+
+        Returns:
+            dict[str, tuple[int, int]]: Owner -> (items, bytes), the largest first.
+        """
+        return self.totals(lambda item: f"{item.kind} {item.owner}")
+
+    def totals(self, key) -> dict[str, tuple[int, int]]:
+        """
+        Totals the items by a key.
+
+        Args:
+            key (Callable[[MemoryItem], str]): Returns the group of an item.
+
+        Returns:
+            dict[str, tuple[int, int]]: Group -> (items, bytes), the largest first.
+        """
+        totals = {}
+        for item in self.items:
+            count, nbytes = totals.get(key(item), (0, 0))
+            totals[key(item)] = (count + 1, nbytes + item.nbytes)
+        return dict(sorted(totals.items(), key=lambda total: total[1][1], reverse=True))
+
+    def report(self, top: int = 30) -> str:
+        """
+        Formats the totals by subsystem, then the largest owners.
+
+        Args:
+            top (int, optional): Owners listed. Defaults to 30.
+
+        Returns:
+            str: The report.
+        """
+        kinds = {kind: sum(1 for item in self.items if item.kind == kind) for kind in ("surface", "mask", "sound")}
+        lines = [f"{kinds['surface']} surfaces, {kinds['mask']} masks, {kinds['sound']} sounds, "
+                 f"{self.nbytes / 2**20:.1f} MiB ({self.walked} objects walked)",
+                 f"{'subsystem':<60}  {'items':>6}  {'KiB':>9}"]
+        for subsystem, (count, nbytes) in self.by_subsystem().items():
+            lines.append(f"{subsystem:<60}  {count:>6}  {nbytes / 1024:>9.1f}")
+        lines.append(f"{'owner':<60}  {'items':>6}  {'KiB':>9}  formats")
+        for owner, (count, nbytes) in list(self.by_owner().items())[:top]:
+            kind, label = owner.split(" ", 1)
+            formats = sorted({f"{item.size[0]}x{item.size[1]} {item.format}" for item in self.items
+                              if item.kind == kind and item.owner == label})
+            shown = ", ".join(formats[:2]) + (f" (+{len(formats) - 2})" if len(formats) > 2 else "")
+            lines.append(f"{owner[:60]:<60}  {count:>6}  {nbytes / 1024:>9.1f}  {shown}")
+        return "\n".join(lines)
+
+    def diff(self, previous: 'MemorySnapshot') -> str:
+        """
+        Formats the changes since a previous snapshot, by subsystem and owner.
+
+        Args:
+            previous (MemorySnapshot): The previous snapshot.
+
+        Returns:
+            str: The owners whose items or memory changed, the largest changes first.
+        """
+        lines = [f"{(self.nbytes - previous.nbytes) / 1024:+.1f} KiB, now {self.nbytes / 2**20:.1f} MiB"]
+        for title, now, before in (("subsystem", self.by_subsystem(), previous.by_subsystem()),
+                                   ("owner", self.by_owner(), previous.by_owner())):
+            changes = []
+            for key in now.keys() | before.keys():
+                count, nbytes = now.get(key, (0, 0))
+                old_count, old_nbytes = before.get(key, (0, 0))
+                if count != old_count or nbytes != old_nbytes:
+                    changes.append((key, count - old_count, nbytes - old_nbytes))
+            changes.sort(key=lambda change: abs(change[2]), reverse=True)
+            if changes:
+                lines.append(f"{title:<60}  {'items':>6}  {'KiB':>9}")
+                lines += [f"{key[:60]:<60}  {count:>+6}  {nbytes / 1024:>+9.1f}" for key, count, nbytes in changes]
+        return "\n".join(lines)
+
+
+class MemoryTracker:
+    """
+    Takes a memory snapshot after the frames that changed the scene, and prints the changes since the previous one.
+    The game calls `end_frame` once the frame is over, so the walk is neither timed nor counted by the profiler.
+    """
+    def __init__(self, snapshot, out=None) -> None:
+        """
+        Args:
+            snapshot (Callable[[], MemorySnapshot]): Takes a snapshot of the game.
+            out (TextIO | None, optional): Where the diffs are printed, stderr if None. Defaults to None.
+        """
+        self.snapshot = snapshot
+        self.out = out
+        self.last = None
+        self.changes = []  # Changes of scene of the frame, not diffed yet
+        self.diffs = []  # (old scene, new scene, diff)
+
+    def start(self) -> None:
+        """
+        Takes the first snapshot and diffs the next ones after the changes of scene, at the end of their frame.
+        """
+        self.last = self.snapshot()
+        event_bus.subscribe(SceneChanged, self.scene_changed)
+
+    def stop(self) -> None:
+        """
+        Stops diffing and prints the last snapshot.
+        """
+        event_bus.unsubscribe(SceneChanged, self.scene_changed)
+        if self.last is not None:
+            print(self.snapshot().report(), file=self.out or sys.stderr)
+
+    def scene_changed(self, event: SceneChanged) -> None:
+        """
+        Records a change of scene, diffed at the end of the frame.
+
+        Args:
+            event (SceneChanged): The change of scene.
+        """
+        self.changes.append(event)
+
+    def end_frame(self) -> None:
+        """
+        Prints the changes since the previous snapshot, if the frame changed the scene. Several changes in a frame
+        are diffed once, from the first old scene to the last new one.
+        """
+        if not self.changes:
+            return
+        old, new = self.changes[0].old, self.changes[-1].new
+        self.changes = []
+        current = self.snapshot()
+        diff = current.diff(self.last)
+        self.diffs.append((old, new, diff))
+        print(f"memory after {old} -> {new}: {diff}", file=self.out or sys.stderr)
+        self.last = current
@@ -0,0 +1,232 @@
+"""
+Background music of the game, driven by the changes of game state.
+
+The `MusicManager` is only told when the game state changes, it never runs for input events. It decodes the
+tracks on a background thread (the decoder releases the GIL), ahead of time when the next one is predictable,
+e.g. the credits when the player is about to die. Tracks are crossfaded on two reserved mixer channels, the fades
+being run by the mixer's own thread.
+
+Classes:
+    - MusicManager: Singleton playing, prefetching and crossfading the music tracks.
+"""
+
+import logging
+import threading
+
+import pygame
+
+from settings import MUSIC_FADE_MS
+from src.engine.audio import ChannelManager
+from src.engine.assets import assets
+
+logger = logging.getLogger(__name__)
+
+# Music tracks, decoded in the background
+MUSIC_TRACKS = {
+    "main": "assets/music/main.ogg",
+    "new_game": "assets/music/new_game_conversation.ogg",
+    "hotel": "assets/music/newsun_hotel.ogg",
+    "credits": "assets/music/credits.ogg",
+}
+
+# Track played when entering a game state, states not listed keep the current music
+STATE_MUSIC = {
+    "main": "main",
+    "game": "hotel",
+    "ending": "credits",
+    "death": "credits",
+}
+
+# Track that will most likely be needed after a state, decoded ahead of time
+NEXT_MUSIC = {
+    "main": "new_game",
+    "new_game": "hotel",
+}
+
+
+class MusicManager:
+    """
+    Singleton playing the music tracks on two reserved channels, crossfading from one to the other.
+
+    Decoded tracks are kept in memory, up to `max_resident` of them besides the one playing. A track is decoded
+    whole (a few minutes of PCM take 10 to 20 MB), so only the track prefetched for the next state is kept by
+    default: going back to a track dropped before decodes it again, in the background, before it crossfades.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Ensures that only one instance of the MusicManager class exists (Singleton pattern).
+
+        Returns:
+            MusicManager: The single instance of the MusicManager class.
+        """
+        if not cls._instance:
+            cls._instance = super(MusicManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, tracks: dict[str, str] = MUSIC_TRACKS, fade_ms: int = MUSIC_FADE_MS, max_resident: int = 1) -> None:
+        """
+        Initializes the manager the first time it is created and reserves its two channels.
+
+        Args:
+            tracks (dict[str, str], optional): Maps the names of the tracks to their files. Defaults to `MUSIC_TRACKS`.
+            fade_ms (int, optional): Duration of the crossfades in milliseconds. Defaults to `MUSIC_FADE_MS`.
+            max_resident (int, optional): Decoded tracks kept in memory besides the current one. Defaults to 1.
+        """
+        if not hasattr(self, "initialized"):  # Prevent re-initialization
+            self.tracks = dict(tracks)
+            self.fade_ms = fade_ms
+            self.max_resident = max_resident
+            self.channel_ids = ChannelManager().add_group("music", 2)
+            self.active = 0  # Index of the channel playing the current track
+            self.sounds = {}  # Decoded tracks, the most recently used last
+            self.loading = {}  # Tracks being decoded -> thread
+            self.lock = threading.RLock()
+            self.current = None
+            self.pending = None  # Track to start as soon as it is decoded
+            self.paused = False
+            self.quit_registered = False  # Whether `shutdown` runs when pygame quits
+            self.initialized = True
+
+    def prefetch(self, name: str) -> None:
+        """
+        Starts decoding a track in the background, unless it is already decoded or being decoded.
+
+        Args:
+            name (str): Name of the track.
+        """
+        with self.lock:
+            if name in self.sounds or name in self.loading:
+                return
+            if not self.quit_registered:
+                # The decoders must be done before the mixer quits
+                pygame.register_quit(self.shutdown)
+                self.quit_registered = True
+            thread = threading.Thread(target=self._decode, args=(name,), daemon=True)
+            self.loading[name] = thread
+            thread.start()
+
+    def _decode(self, name: str) -> None:
+        """
+        Decodes a track (runs on a background thread), then starts it if it was requested meanwhile.
+        A track that cannot be decoded is logged and no longer waited for, it can be requested again.
+
+        Args:
+            name (str): Name of the track.
+        """
+        sound = None
+        try:
+            sound = assets.sound(self.tracks[name])
+        except Exception:
+            logger.exception("Could not decode the music track %r", name)
+        finally:
+            with self.lock:
+                del self.loading[name]
+                if sound is not None:
+                    self.sounds[name] = sound
+                    if self.pending == name:
+                        self._start(name)
+                elif self.pending == name:
+                    self.pending = None
+
+    def _start(self, name: str) -> None:
+        """
+        Crossfades from the current track to a decoded one, on the other music channel.
+
+        Args:
+            name (str): Name of the track.
+        """
+        old_channel = pygame.mixer.Channel(self.channel_ids[self.active])
+        self.active = 1 - self.active
+        new_channel = pygame.mixer.Channel(self.channel_ids[self.active])
+        if self.current is not None:
+            old_channel.fadeout(self.fade_ms)
+        new_channel.play(self.sounds[name], loops=-1, fade_ms=self.fade_ms)
+        self.current = name
+        self.pending = None
+        self.paused = False
+
+        # Keep the most recently used tracks, and always the one playing
+        self.sounds[name] = self.sounds.pop(name)
+        for old_name in list(self.sounds)[:-1 - self.max_resident]:
+            assets.release(self.sounds.pop(old_name))
+
+    def play(self, name: str) -> None:
+        """
+        Crossfades to a track. Nothing happens if it is already playing or about to, and the call never
+        blocks: a track that is not decoded yet starts from the background thread once it is. Asking for the
+        track playing while another one is decoded keeps it playing, and the other one does not start.
+
+        Args:
+            name (str): Name of the track.
+        """
+        with self.lock:
+            if name == self.pending:
+                return
+            if name == self.current:
+                self.pending = None  # Keeps playing it, the track being decoded will not start
+                return
+            self.pending = name
+            if name in self.sounds:
+                self._start(name)
+            else:
+                self.prefetch(name)
+
+    def stop(self) -> None:
+        """
+        Fades out the music.
+        """
+        with self.lock:
+            for channel_id in self.channel_ids:
+                pygame.mixer.Channel(channel_id).fadeout(self.fade_ms)
+            self.current = None
+            self.pending = None
+
+    def shutdown(self) -> None:
+        """
+        Waits for the tracks being decoded and forgets the decoded ones, called when pygame quits.
+        """
+        for thread in list(self.loading.values()):
+            thread.join()
+        with self.lock:
+            for sound in self.sounds.values():
+                assets.release(sound)
+            self.sounds = {}
+            self.current = None
+            self.pending = None
+            self.paused = False
+            self.quit_registered = False
+
+    def pause(self) -> None:
+        """
+        Pauses the music.
+        """
+        for channel_id in self.channel_ids:
+            pygame.mixer.Channel(channel_id).pause()
+        self.paused = True
+
+    def unpause(self) -> None:
+        """
+        Resumes the music after a pause.
+        """
+        for channel_id in self.channel_ids:
+            pygame.mixer.Channel(channel_id).unpause()
+        self.paused = False
+
+    def change_state(self, state: str) -> None:
+        """
+        Updates the music when the game state changes: pauses it in the pause menu, plays the track
+        of the new state if it has one, and prefetches the track likely to come next.
+
+        Args:
+            state (str): The new game state, e.g. "main", "game" or "pause".
+        """
+        if state == "pause":
+            self.pause()
+        elif self.paused and state != "options":
+            self.unpause()
+        if state in STATE_MUSIC:
+            self.play(STATE_MUSIC[state])
+        if state in NEXT_MUSIC:
+            self.prefetch(NEXT_MUSIC[state])
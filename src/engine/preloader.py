@@ -0,0 +1,219 @@
+"""
+Background preloading of the assets of the game, while the main menu is shown.
+
+The preloader works through a manifest of groups, in priority order: the main menu, the character creation, the
+hotel scenes, then the skill-check overlays. Each group has decode steps, which read and decode files and run on
+worker threads (they do not need the display, and decoding releases the GIL), and convert steps, which run on
+the main thread once the group is decoded, a few per frame within a time budget. A worker posts a `PRELOADED`
+event after each step, so the main menu wakes up from its sleep to convert what is ready.
+
+The game asks whether a group is `ready` and shows the `progress`; `wait` finishes a group right away, so
+starting a game only waits for what is still missing.
+
+Classes:
+    - PreloadGroup: The steps preloading the assets of a part of the game.
+    - Preloader: Runs the groups of a manifest on worker threads and on the main thread.
+
+Functions:
+    - video_steps: Decode and convert steps loading the frames of videos.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+import pygame
+
+from settings import PRELOAD_WORKERS, PRELOAD_FRAME_BUDGET_MS
+from src.engine.assets import assets
+
+# Posted by the workers after each decode step, to wake up the game loop
+PRELOADED = pygame.event.custom_type()
+
+
+@dataclass
+class PreloadGroup:
+    """
+    The steps preloading the assets of a part of the game.
+
+    Attributes:
+        name (str): Name of the group, e.g. "main_menu".
+        decode (list[Callable]): Steps reading and decoding files, run on the worker threads.
+        convert (list[Callable]): Steps run on the main thread once every decode step is done,
+            e.g. converting the decoded images to the pixel format of the display.
+    """
+    name: str
+    decode: list = field(default_factory=list)
+    convert: list = field(default_factory=list)
+
+
+def video_steps(videos) -> tuple[list, list]:
+    """
+    Returns the steps loading the frames of videos: decoding each frame on a worker, then converting them one
+    at a time into the video.
+
+    Args:
+        videos (Iterable[Video]): The videos.
+
+    Returns:
+        tuple[list, list]: The decode steps and the convert steps.
+    """
+    decode, convert = [], []
+    for video in videos:
+        decode.extend(partial(assets.decode, path) for path in video.paths)
+        convert.extend(partial(video.load, 1) for _ in video.paths)
+    return decode, convert
+
+
+class Preloader:
+    """
+    Runs the decode steps of a manifest on worker threads, in priority order, and its convert steps on the main
+    thread within a time budget per frame.
+    """
+    def __init__(self, groups: list[PreloadGroup], workers: int = PRELOAD_WORKERS,
+                 frame_budget_ms: float = PRELOAD_FRAME_BUDGET_MS) -> None:
+        """
+        Args:
+            groups (list[PreloadGroup]): The manifest, the first groups are preloaded first.
+            workers (int, optional): Worker threads. Defaults to `PRELOAD_WORKERS`.
+            frame_budget_ms (float, optional): Time spent on the convert steps per frame.
+                Defaults to `PRELOAD_FRAME_BUDGET_MS`.
+        """
+        self.groups = {group.name: group for group in groups}
+        self.workers = workers
+        self.frame_budget_ms = frame_budget_ms
+        self.pool = None
+        self.futures = {name: [] for name in self.groups}  # Name -> futures of the decode steps
+        self.converted = {name: 0 for name in self.groups}  # Name -> convert steps done
+        self.waited = set()  # Groups whose decode steps were finished by `wait`
+
+    def start(self) -> None:
+        """
+        Submits the decode steps of every group to the workers, which run them in the order of the manifest.
+        """
+        if self.pool is not None:
+            return
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+        for name, group in self.groups.items():
+            self.futures[name] = [self.pool.submit(self.run_decode, step) for step in group.decode]
+        # Quitting the game does not wait for the steps not started yet
+        pygame.register_quit(self.stop)
+
+    def stop(self) -> None:
+        """
+        Cancels the decode steps not started yet. `wait` runs them on the main thread if needed.
+        """
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def run_decode(self, step) -> None:
+        """
+        Runs a decode step, on a worker thread, and wakes up the game loop.
+
+        Args:
+            step (Callable): The step.
+        """
+        step()
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(PRELOADED))
+
+    def decoded(self, name: str) -> bool:
+        """
+        Tells whether the decode steps of a group are done.
+
+        Args:
+            name (str): Name of the group.
+
+        Returns:
+            bool: True if every decode step finished.
+        """
+        if name in self.waited:
+            return True
+        futures = self.futures[name]
+        return len(futures) == len(self.groups[name].decode) and all(future.done() for future in futures)
+
+    def ready(self, name: str) -> bool:
+        """
+        Tells whether a group is preloaded.
+
+        Args:
+            name (str): Name of the group.
+
+        Returns:
+            bool: True if every step of the group is done.
+        """
+        return self.decoded(name) and self.converted[name] == len(self.groups[name].convert)
+
+    def progress(self, name: str|None = None) -> float:
+        """
+        Returns the share of the steps done, for a group or for the whole manifest.
+
+        Args:
+            name (str | None, optional): Name of the group, None for every group. Defaults to None.
+
+        Returns:
+            float: Between 0 and 1.
+        """
+        names = [name] if name is not None else list(self.groups)
+        done = total = 0
+        for name in names:
+            group = self.groups[name]
+            decoded = len(group.decode) if name in self.waited else sum(future.done() for future in self.futures[name])
+            done += decoded + self.converted[name]
+            total += len(group.decode) + len(group.convert)
+        return done / total if total else 1.0
+
+    def convert_next(self, name: str) -> None:
+        """
+        Runs the next convert step of a decoded group.
+
+        Args:
+            name (str): Name of the group.
+        """
+        self.groups[name].convert[self.converted[name]]()
+        self.converted[name] += 1
+
+    def update(self) -> None:
+        """
+        Runs the convert steps of the decoded groups, in priority order, until the budget of the frame is spent.
+        Called once per frame from the game loop.
+        """
+        deadline = time.perf_counter() + self.frame_budget_ms / 1000
+        for name, group in self.groups.items():
+            if not self.decoded(name):
+                continue
+            if name not in self.waited:
+                self.wait_decode(name)  # Raises the errors of the workers
+            while self.converted[name] < len(group.convert):
+                if time.perf_counter() >= deadline:
+                    return
+                self.convert_next(name)
+
+    def wait_decode(self, name: str) -> None:
+        """
+        Waits for the decode steps of a group, running on the main thread the steps not submitted or cancelled.
+
+        Args:
+            name (str): Name of the group.
+        """
+        futures = self.futures[name] or [None] * len(self.groups[name].decode)  # Not started
+        for step, future in zip(self.groups[name].decode, futures):
+            if future is None or future.cancelled():
+                step()
+            else:
+                future.result()
+        self.waited.add(name)
+
+    def wait(self, name: str) -> None:
+        """
+        Finishes preloading a group now, waiting for its decode steps and running its convert steps.
+
+        Args:
+            name (str): Name of the group.
+        """
+        group = self.groups[name]
+        if name not in self.waited:
+            self.wait_decode(name)
+        while self.converted[name] < len(group.convert):
+            self.convert_next(name)
@@ -0,0 +1,105 @@
+"""
+Presentation of the frames on the display.
+
+The scenes and menus only draw into the back buffer (the display surface), and the `FramePresenter` swaps the
+buffers exactly once per frame. It uses `pygame.display.flip` for OpenGL displays, which can only be presented
+whole, and `pygame.display.update` otherwise, restricted to the areas that changed when they are given.
+
+In debug mode (`DEBUG`, set with the NEWSUN_DEBUG=1 environment variable) the presenter replaces
+`pygame.display.flip` and `pygame.display.update` with guards raising `StrayPresentError` when they are
+called from anywhere else, to catch the draw methods that present the frame themselves.
+
+Classes:
+    - StrayPresentError: Raised in debug mode when the display is presented outside of the presenter.
+    - FramePresenter: Presents every frame once and counts the presents.
+"""
+
+import pygame
+
+from settings import DEBUG
+
+# The real presentation functions, kept before any guard replaces them
+_display_flip = pygame.display.flip
+_display_update = pygame.display.update
+
+
+class StrayPresentError(RuntimeError):
+    """
+    Raised in debug mode when `pygame.display.flip` or `pygame.display.update` is called outside of the presenter.
+    """
+
+
+class FramePresenter:
+    """
+    Owns the presentation of the frames: swaps the buffers once per frame and counts the presents.
+    """
+    def __init__(self, debug: bool = DEBUG) -> None:
+        """
+        Initializes the presenter, installing the guards against stray presents in debug mode.
+
+        Args:
+            debug (bool, optional): Whether to install the guards. Defaults to `DEBUG`.
+        """
+        self.presenting = False
+        self.guarded = False
+        self.presents = 0  # Frames presented
+        self.flips = 0  # Frames presented with flip
+        self.updates = 0  # Frames presented with update
+        if debug:
+            self.install_guard()
+
+    @property
+    def render_mode(self) -> str:
+        """
+        How the frames are presented: "flip" for OpenGL displays, "update" otherwise.
+        """
+        surface = pygame.display.get_surface()
+        if surface is not None and surface.get_flags() & pygame.OPENGL:
+            return "flip"
+        return "update"
+
+    def present(self, rects: list[pygame.Rect]|None = None) -> None:
+        """
+        Presents the frame drawn in the back buffer.
+
+        Args:
+            rects (list[pygame.Rect] | None, optional): The areas that changed, None for the whole screen.
+                Ignored for OpenGL displays. Defaults to None.
+        """
+        self.presenting = True
+        try:
+            if self.render_mode == "flip":
+                _display_flip()
+                self.flips += 1
+            else:
+                if rects is not None:
+                    _display_update(rects)
+                else:
+                    _display_update()
+                self.updates += 1
+        finally:
+            self.presenting = False
+        self.presents += 1
+
+    def install_guard(self) -> None:
+        """
+        Replaces `pygame.display.flip` and `pygame.display.update` with functions raising `StrayPresentError`.
+        """
+        def guard(original):
+            def guarded(*args, **kwargs):
+                if not self.presenting:
+                    raise StrayPresentError(f"pygame.display.{original.__name__} called outside of the FramePresenter")
+                return original(*args, **kwargs)
+            return guarded
+
+        pygame.display.flip = guard(_display_flip)
+        pygame.display.update = guard(_display_update)
+        self.guarded = True
+
+    def uninstall_guard(self) -> None:
+        """
+        Restores the original `pygame.display.flip` and `pygame.display.update`.
+        """
+        pygame.display.flip = _display_flip
+        pygame.display.update = _display_update
+        self.guarded = False
@@ -0,0 +1,276 @@
+"""
+Profiling sessions of the game, run with `python main.py --profile=cprofile|sample`.
+
+A session watches the frames of the `FrameProfiler` and profiles them by activity of the game: the menus
+("main_menu"), the dialogues ("dialogue") and the exploration of the hotel ("world"), each in its own files, so
+that the profiles of two builds can be compared activity by activity. Only the frames are profiled, not the
+sleep of the game loop between them.
+
+    - cprofile: deterministic profile of every call with `cProfile`, written as `<activity>.pstats` files
+      (open them with `python -m pstats` or snakeviz).
+    - sample: stacks sampled on a timer signal by a `StackSampler`, cheaper to run, written as
+      `<activity>.collapsed` files ready for flamegraph.pl, speedscope or inferno.
+
+A session can be limited to the frames of a scene, and to a duration: the game quits that many seconds after the
+first profiled frame, so that the same session gives comparable profiles.
+
+Classes:
+    - ProfileSession: Base class of the sessions, selects the frames and assigns them an activity.
+    - CProfileSession: Profiles the frames with cProfile.
+    - SampleSession: Samples the stacks of the frames.
+
+Functions:
+    - create_session: Creates the session of a profiling mode.
+"""
+
+import os
+import sys
+import time
+import cProfile
+from abc import ABC, abstractmethod
+
+import pygame
+
+from settings import PROFILE_DIR
+from src.engine.sampler import StackSampler, collapse
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class ProfileSession(ABC):
+    """
+    Base class of the profiling sessions: selects the frames to profile and assigns them the activity of the game
+    given by `context`. The subclasses profile the selected frames in `profile_frame` and `pause`.
+    """
+    extension = ""  # Of the files written, one per activity
+
+    def __init__(self, out_dir: str = PROFILE_DIR, context=None, seconds: float|None = None,
+                 scene: str|None = None) -> None:
+        """
+        Initializes a stopped session.
+
+        Args:
+            out_dir (str, optional): Folder of the profiles. Defaults to `PROFILE_DIR`.
+            context (Callable[[], dict] | None, optional): Returns the "activity" and the "scene" of the game.
+                Without it, all the frames are profiled as "world". Defaults to None.
+            seconds (float | None, optional): Seconds from the first profiled frame until the game quits,
+                unlimited if None. Defaults to None.
+            scene (str | None, optional): Only profiles the frames of this scene, all the frames if None.
+                Defaults to None.
+        """
+        self.out_dir = out_dir
+        self.context = context
+        self.seconds = seconds
+        self.scene = scene
+        self.activity = None  # Of the frame being profiled, None if the frame is not selected
+        self.started = None  # perf_counter at the first profiled frame
+        self.profiled = 0.0  # Seconds of the frames profiled
+        self.frames = {}  # Activity -> frames profiled
+        self.running = False
+        self.quit_posted = False
+
+    def start(self) -> None:
+        """
+        Starts profiling the next frames.
+        """
+        self.running = True
+
+    def stop(self) -> list[str]:
+        """
+        Stops profiling and writes the profiles.
+
+        Returns:
+            list[str]: The files written.
+        """
+        if not self.running:
+            return []
+        self.running = False
+        os.makedirs(self.out_dir, exist_ok=True)
+        paths = self.write()
+        for path in paths:
+            print(f"profile written to {path}", file=sys.stderr)
+        return paths
+
+    def select(self) -> str|None:
+        """
+        Returns the activity of the frame starting, if it is profiled.
+
+        Returns:
+            str | None: "main_menu", "dialogue" or "world", None if the frame is not profiled.
+        """
+        if not self.running:
+            return None
+        context = self.context() if self.context is not None else {}
+        if self.scene is not None and context.get("scene") != self.scene:
+            return None
+        return context.get("activity", "world")
+
+    def begin_frame(self) -> None:
+        """
+        Starts profiling the frame, if it is selected.
+        """
+        self.activity = self.select()
+        if self.activity is not None:
+            if self.started is None:
+                self.started = time.perf_counter()
+            self.profile_frame(self.activity)
+
+    def end_frame(self, duration: float, sections: dict, skip: bool = False) -> None:
+        """
+        Stops profiling the frame, and quits the game once the duration of the session is over.
+
+        Args:
+            duration (float): Milliseconds of the frame.
+            sections (dict): Milliseconds of the sections of the frame.
+            skip (bool, optional): Not used, the frames slowed down by the profiler overlay are profiled too.
+                Defaults to False.
+        """
+        if self.activity is None:
+            return
+        self.pause()
+        self.frames[self.activity] = self.frames.get(self.activity, 0) + 1
+        self.profiled += duration / 1000
+        self.activity = None
+        over = self.seconds is not None and time.perf_counter() - self.started >= self.seconds
+        if over and not self.quit_posted:
+            self.quit_posted = True
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def path(self, activity: str) -> str:
+        """
+        Returns the file of the profile of an activity.
+
+        Args:
+            activity (str): The activity.
+
+        Returns:
+            str: The file, in `out_dir`.
+        """
+        return os.path.join(self.out_dir, activity + self.extension)
+
+    @abstractmethod
+    def profile_frame(self, activity: str) -> None:
+        """
+        Starts profiling a selected frame.
+
+        Args:
+            activity (str): The activity of the frame, whose profile gets the frame.
+        """
+
+    @abstractmethod
+    def pause(self) -> None:
+        """
+        Stops profiling until the next selected frame.
+        """
+
+    @abstractmethod
+    def write(self) -> list[str]:
+        """
+        Writes the profile of every activity in `out_dir`.
+
+        Returns:
+            list[str]: The files written.
+        """
+
+
+class CProfileSession(ProfileSession):
+    """
+    Profiles every call of the frames with cProfile, in a profile per activity.
+    """
+    extension = ".pstats"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.profiles = {}  # Activity -> cProfile.Profile
+        self.current = None  # Profile enabled during the frame
+
+    def profile_frame(self, activity: str) -> None:
+        if activity not in self.profiles:
+            self.profiles[activity] = cProfile.Profile()
+        self.current = self.profiles[activity]
+        self.current.enable()
+
+    def pause(self) -> None:
+        if self.current is not None:
+            self.current.disable()
+            self.current = None
+
+    def write(self) -> list[str]:
+        self.pause()
+        paths = []
+        for activity, profile in self.profiles.items():
+            profile.dump_stats(self.path(activity))
+            paths.append(self.path(activity))
+        return paths
+
+
+class SampleSession(ProfileSession):
+    """
+    Samples the stacks of the frames on a timer signal, and counts them per activity in the collapsed format.
+    """
+    extension = ".collapsed"
+
+    def __init__(self, *args, interval: float = 0.001, **kwargs) -> None:
+        """
+        Args:
+            interval (float, optional): Seconds between two samples. Defaults to 0.001.
+        """
+        super().__init__(*args, **kwargs)
+        self.sampler = StackSampler(interval)
+        self.stacks = {}  # Activity -> Counter of the collapsed stacks
+
+    def start(self) -> None:
+        """
+        Starts the sampler, paused between the frames.
+
+        Raises:
+            RuntimeError: If timer signals are not available (Windows, or not the main thread).
+        """
+        if not self.sampler.start():
+            raise RuntimeError("The sampling profiler needs timer signals, use --profile=cprofile")
+        self.sampler.pause()
+        super().start()
+
+    def profile_frame(self, activity: str) -> None:
+        self.sampler.take()
+        self.sampler.resume()
+
+    def pause(self) -> None:
+        self.sampler.pause()
+        samples = self.sampler.take()
+        if self.activity is not None and samples:
+            self.stacks.setdefault(self.activity, collapse([])).update(collapse(samples))
+
+    def write(self) -> list[str]:
+        self.sampler.stop()
+        paths = []
+        for activity, stacks in self.stacks.items():
+            with open(self.path(activity), 'w', encoding='utf8') as file:
+                for stack, count in stacks.most_common():
+                    file.write(f"{stack} {count}\n")
+            paths.append(self.path(activity))
+        return paths
+
+
+def create_session(mode: str, out_dir: str|None = None, **kwargs) -> ProfileSession:
+    """
+    Creates the session of a profiling mode, writing into a new folder by default.
+
+    Args:
+        mode (str): "cprofile" or "sample".
+        out_dir (str | None, optional): Folder of the profiles, `PROFILE_DIR/<mode>-<date>` if None.
+            Defaults to None.
+        **kwargs: The `context`, `seconds` and `scene` of the session.
+
+    Returns:
+        ProfileSession: The session, not started.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    sessions = {"cprofile": CProfileSession, "sample": SampleSession}
+    if mode not in sessions:
+        raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {', '.join(PROFILE_MODES)}")
+    if out_dir is None:
+        out_dir = os.path.join(PROFILE_DIR, f"{mode}-{time.strftime('%Y%m%d-%H%M%S')}")
+    return sessions[mode](out_dir, **kwargs)
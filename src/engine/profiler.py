@@ -0,0 +1,264 @@
+"""
+Frame-time profiler of the game loop, shown by the profiler overlay (toggled with F3).
+
+The game loop and the states time named sections of the frame (`with profiler.section("camera"): ...`), and the
+profiler keeps the durations of the last frames of every section to report their rolling mean, p95 and p99, and
+the history of the frame times for the graph. A section can run several times in a frame, its durations add up,
+and sections can be nested: the "update" section of the game loop contains the "camera" section of the states.
+
+Every `count_every` frames, the profiler counts the blits, the `Font.render` calls and the surfaces allocated
+by copies, conversions, transforms and renders during the frame instead of timing it: the counting hook (`sys.setprofile`) slows the frame down, so the timings
+of the counted frames are not recorded.
+
+Watchers, such as the `FrameWatchdog` or a profiling session, can be attached with `watch`: the sections are then
+timed even while the overlay is hidden, and the watchers are told when every frame begins and ends, with its
+timings. The draw calls are not counted while another profile function is installed (e.g. by cProfile).
+
+While the profiler is disabled and no watcher is attached, `section` returns a shared context manager doing
+nothing and the frame hooks return right away, so the sections can stay in the loop.
+
+Classes:
+    - Section: Times a section of the frame.
+    - FrameProfiler: Times the sections of the frames and counts the draw calls.
+
+Functions:
+    - percentile: Returns a percentile of durations, by the nearest rank.
+"""
+
+import sys
+import math
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from settings import PROFILER_WINDOW, PROFILER_COUNT_EVERY
+
+# Methods returning a new surface, counted as allocations. The profile function does not see the constructor
+# (calling a type is not a "c_call"), so the surfaces created with `pygame.Surface(...)` are not counted.
+SURFACE_METHODS = {"copy", "convert", "convert_alpha", "subsurface"}
+SURFACE_FUNCTIONS = {"scale", "smoothscale", "rotate", "rotozoom", "flip", "scale2x", "scale_by", "smoothscale_by",
+                     "chop", "laplacian", "grayscale"}  # Of pygame.transform
+
+_disabled_section = nullcontext()  # Returned by `section` while the profiler is disabled
+
+
+def percentile(durations: list[float], rank: float) -> float:
+    """
+    Returns a percentile of durations, by the nearest rank.
+
+    Args:
+        durations (list[float]): The durations, sorted.
+        rank (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The duration, 0 if there is none.
+    """
+    if not durations:
+        return 0.0
+    return durations[max(0, min(len(durations) - 1, math.ceil(rank / 100 * len(durations)) - 1))]
+
+
+class Section:
+    """
+    Context manager timing a section of the frame.
+    """
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        profiler.frame.setdefault(self.name, 0.0)  # The sections are listed in the order they start
+        profiler.depths.setdefault(self.name, profiler.depth)
+        profiler.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.frame[self.name] += (time.perf_counter() - self.start) * 1000
+        self.profiler.depth -= 1
+
+
+class FrameProfiler:
+    """
+    Times the named sections of the frames over a rolling window, and counts the blits, font renders and surface
+    allocations of one frame every `count_every` frames. Disabled until `toggle` is called.
+    """
+    def __init__(self, window: int = PROFILER_WINDOW, count_every: int = PROFILER_COUNT_EVERY) -> None:
+        """
+        Initializes a disabled profiler.
+
+        Args:
+            window (int, optional): Number of frames the statistics are computed on. Defaults to `PROFILER_WINDOW`.
+            count_every (int, optional): A frame out of `count_every` counts the draw calls instead of being timed.
+                Defaults to `PROFILER_COUNT_EVERY`.
+        """
+        self.enabled = False
+        self.window = window
+        self.count_every = count_every
+        self.sections = {}  # Name -> durations (ms) of the last frames, in the order the sections first ran
+        self.frame_times = deque(maxlen=window)  # Durations (ms) of the last frames
+        self.frame = {}  # Name -> duration (ms) of the sections in the current frame
+        self.depths = {}  # Name -> nesting level of the section
+        self.depth = 0  # Sections being timed
+        self.frame_start = None  # perf_counter at the start of the current frame, None outside of a frame
+        self.frames = 0
+        self.counting = False  # The current frame counts the draw calls
+        self.counts = {"blits": 0, "renders": 0, "surfaces": 0}  # Of the last counted frame
+        self.frame_counts = dict(self.counts)
+        self.watchers = []  # Get the timings of every frame, see `watch`
+
+    def toggle(self) -> None:
+        """
+        Enables or disables the profiler. The statistics start over when it is enabled.
+        """
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+
+    def watch(self, watcher) -> None:
+        """
+        Attaches a watcher told when every frame begins and ends. It has the methods `begin_frame()` and
+        `end_frame(duration, sections, skip)`, like the `FrameWatchdog`.
+
+        Args:
+            watcher (FrameWatchdog | ProfileSession): The watcher.
+        """
+        self.watchers.append(watcher)
+
+    def unwatch(self, watcher) -> None:
+        """
+        Detaches a watcher.
+
+        Args:
+            watcher (FrameWatchdog | ProfileSession): The watcher.
+        """
+        if watcher in self.watchers:
+            self.watchers.remove(watcher)
+
+    def reset(self) -> None:
+        """
+        Forgets the timings and the counts.
+        """
+        self.sections.clear()
+        self.depths.clear()
+        self.frame_times.clear()
+        self.frames = 0
+        self.counts = {"blits": 0, "renders": 0, "surfaces": 0}
+
+    def section(self, name: str):
+        """
+        Times a section of the current frame.
+
+        Args:
+            name (str): The section, e.g. "camera".
+
+        Returns:
+            ContextManager: The block to time.
+        """
+        if self.frame_start is None:  # Disabled, or outside of a frame
+            return _disabled_section
+        return Section(self, name)
+
+    def begin_frame(self) -> None:
+        """
+        Starts a frame, counting its draw calls if it is the turn of this frame.
+        """
+        if not self.enabled and not self.watchers:
+            return
+        self.frames += 1
+        self.frame = {}
+        self.depth = 0
+        for watcher in self.watchers:
+            watcher.begin_frame()
+        self.counting = self.enabled and self.frames % self.count_every == 0 and sys.getprofile() is None
+        if self.counting:
+            self.start_counting()
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        """
+        Ends the frame and records its timings, or its counts, and passes the timings to the watchers. A frame
+        started before the profiler was disabled is still ended, so that the counting hooks are removed.
+        """
+        if self.frame_start is None:
+            return
+        duration = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_start = None
+        counted = self.counting
+        if counted:
+            self.stop_counting()
+            self.counts = self.frame_counts
+        for watcher in reversed(self.watchers):
+            watcher.end_frame(duration, self.frame, skip=counted)
+        if counted:
+            return
+        if not self.enabled:
+            return
+        self.frame_times.append(duration)
+        for name, section_duration in self.frame.items():
+            if name not in self.sections:
+                self.sections[name] = deque(maxlen=self.window)
+            self.sections[name].append(section_duration)
+
+    def start_counting(self) -> None:
+        """
+        Installs the profile function counting the calls of pygame's drawing functions. pygame itself is left
+        untouched, so the type checks of the frame are not affected.
+        """
+        self.frame_counts = {"blits": 0, "renders": 0, "surfaces": 0}
+        sys.setprofile(self.count_call)
+
+    def stop_counting(self) -> None:
+        """
+        Removes the profile function counting the draw calls.
+        """
+        sys.setprofile(None)
+        self.counting = False
+
+    def count_call(self, frame, event: str, arg) -> None:
+        """
+        Profile function counting the calls of pygame's drawing functions.
+
+        Args:
+            frame (FrameType): The calling frame.
+            event (str): The profile event, only "c_call" is counted.
+            arg: The called function.
+        """
+        if event != "c_call":
+            return
+        name = arg.__name__
+        owner = getattr(arg, "__self__", None)
+        if isinstance(owner, pygame.Surface):
+            if name in ("blit", "blits", "fblits"):
+                self.frame_counts["blits"] += 1
+            elif name in SURFACE_METHODS:
+                self.frame_counts["surfaces"] += 1
+        elif name == "render" and isinstance(owner, pygame.font.Font):
+            self.frame_counts["renders"] += 1
+            self.frame_counts["surfaces"] += 1
+        elif name in SURFACE_FUNCTIONS and getattr(arg, "__module__", None) == "pygame.transform":
+            self.frame_counts["surfaces"] += 1
+
+    def stats(self) -> list[tuple[str, float, float, float]]:
+        """
+        Computes the statistics of the sections on the window.
+
+        Returns:
+            list[tuple[str, float, float, float]]: The name, mean, p95 and p99 (ms) of every section, and of the
+                whole frame first, named "frame".
+        """
+        rows = []
+        for name, durations in [("frame", self.frame_times), *self.sections.items()]:
+            ordered = sorted(durations)
+            mean = sum(ordered) / len(ordered) if ordered else 0.0
+            rows.append((name, mean, percentile(ordered, 95), percentile(ordered, 99)))
+        return rows
+
+
+# Profiler of the game loop, toggled by the profiler overlay
+profiler = FrameProfiler()
@@ -0,0 +1,168 @@
+"""
+Seeded random number service for the game.
+
+Every random draw of the game goes through the `RNGService` owned by `Game`, instead of NumPy's global state,
+so that a session can be reproduced from its seed. Each subsystem (skill checks, ambient events...) draws from
+its own named stream, whose generator is derived from the seed and the stream name only: adding a new stream
+or drawing more from one does not change the numbers of the others. Streams generate their numbers in blocks
+to avoid paying NumPy's call overhead on every draw, and the whole state, blocks included, can be snapshotted
+and restored to replay the exact same draws.
+
+Classes:
+    - RandomStream: A named stream of random integers drawn in blocks.
+    - RNGService: Singleton owning the seed and the streams of every subsystem.
+"""
+
+import zlib
+import secrets
+
+from settings import RNG_SEED
+
+
+class RandomStream:
+    """
+    A stream of random integers for one subsystem, backed by its own `numpy.random.Generator`.
+
+    Numbers are generated in blocks of `block_size` for each range and handed out one by one.
+    """
+    def __init__(self, seed: int, name: str, block_size: int = 64) -> None:
+        """
+        Initializes the stream.
+
+        Args:
+            seed (int): Seed of the RNG service.
+            name (str): Name of the stream, e.g. "skill_checks".
+            block_size (int, optional): Number of values generated at once for each range. Defaults to 64.
+        """
+        self.name = name
+        self.block_size = block_size
+        import numpy as np  # Only imported with the first stream, it is slow to import and not needed to start
+        # The stream only depends on the seed and its name (crc32 is stable across runs, unlike hash)
+        sequence = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()),))
+        self.generator = np.random.Generator(np.random.PCG64(sequence))
+        self.blocks = {}  # (low, high) -> list of values left, in reverse order
+        self.refills = 0
+
+    def roll(self, low: int, high: int) -> int:
+        """
+        Draws a random integer from `low` (inclusive) to `high` (exclusive), like `np.random.randint`.
+
+        Args:
+            low (int): Lowest value that can be drawn.
+            high (int): One above the highest value that can be drawn.
+
+        Returns:
+            int: The value drawn.
+        """
+        block = self.blocks.get((low, high))
+        if not block:
+            # Reversed so that values are popped from the end in the order they were generated
+            block = self.generator.integers(low, high, self.block_size).tolist()[::-1]
+            self.blocks[(low, high)] = block
+            self.refills += 1
+        return block.pop()
+
+    def d20(self) -> int:
+        """
+        Rolls a 20-sided die.
+
+        Returns:
+            int: A value from 1 to 20.
+        """
+        return self.roll(1, 21)
+
+    def get_state(self) -> dict:
+        """
+        Returns the state of the stream, including the values already generated but not drawn yet.
+
+        Returns:
+            dict: The state of the stream, made of plain Python types.
+        """
+        return {
+            "bit_generator": self.generator.bit_generator.state,
+            "blocks": [[low, high, list(block)] for (low, high), block in self.blocks.items()],
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`.
+
+        Args:
+            state (dict): The state of the stream.
+        """
+        self.generator.bit_generator.state = state['bit_generator']
+        self.blocks = {(low, high): list(block) for low, high, block in state['blocks']}
+
+
+class RNGService:
+    """
+    Singleton service owning the seed of the game and the random streams of each subsystem.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Ensures that only one instance of the RNGService class exists (Singleton pattern).
+
+        Returns:
+            RNGService: The single instance of the RNGService class.
+        """
+        if not cls._instance:
+            cls._instance = super(RNGService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, seed: int|None = RNG_SEED) -> None:
+        """
+        Initializes the service the first time it is created. Later calls return the same instance untouched.
+
+        Args:
+            seed (int | None, optional): Seed of every stream, a random one is picked if None. Defaults to `RNG_SEED`.
+        """
+        if not hasattr(self, "initialized"):  # Prevent re-initialization
+            self.reseed(seed)
+            self.initialized = True
+
+    def reseed(self, seed: int|None = None) -> None:
+        """
+        Restarts every stream from a new seed.
+
+        Args:
+            seed (int | None, optional): The new seed, a random one is picked if None. Defaults to None.
+        """
+        # The seed is always explicit so it can be stored with a save or a recorded session
+        self.seed = seed if seed is not None else secrets.randbits(64)
+        self.streams = {}
+
+    def stream(self, name: str) -> RandomStream:
+        """
+        Returns the stream of a subsystem, creating it on first use.
+
+        Args:
+            name (str): Name of the stream, e.g. "skill_checks" or "ambient".
+
+        Returns:
+            RandomStream: The stream of the subsystem.
+        """
+        if name not in self.streams:
+            self.streams[name] = RandomStream(self.seed, name)
+        return self.streams[name]
+
+    def get_state(self) -> dict:
+        """
+        Takes a snapshot of the seed and of every stream.
+
+        Returns:
+            dict: The snapshot, made of plain Python types so it can be saved.
+        """
+        return {"seed": self.seed, "streams": {name: stream.get_state() for name, stream in self.streams.items()}}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a snapshot returned by `get_state`.
+
+        Args:
+            state (dict): The snapshot to restore.
+        """
+        self.reseed(state['seed'])
+        for name, stream_state in state['streams'].items():
+            self.stream(name).set_state(stream_state)
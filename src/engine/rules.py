@@ -0,0 +1,236 @@
+"""
+Declarative rule engine for the quests: which items the player gets and how the dialogues unlock.
+
+The rules are read from a data file (`scripts/rules.json`). A rule has a list of conditions on its inputs
+(`when`) and a list of actions (`then`) run when all of them hold. The inputs are:
+
+    - {"condition": "floor_1.bookshelf", "eq": 2}: a dialogue condition of a scene, compared with
+      "eq", "ne", "in" or "not_in".
+    - {"item": "books", "has": true}: whether the player has an item.
+    - {"flag": "elevator_fixed", "eq": false}: a flag of the game.
+
+and the actions are "add_item", "remove_item", "set_condition" (with a "value"), "set_flag" (with a "value")
+and "clear_inventory". The rules are compiled into a dependency index mapping every input to the rules that
+read it. The engine subscribes to the `ConditionChanged` and `InventoryChanged` events of the event bus, and a
+rule is only evaluated when one of its inputs changes, in the order of the file.
+
+Classes:
+    - Rule: A compiled rule.
+    - RuleEngine: Evaluates the rules when their inputs change, and counts the evaluations.
+
+Functions:
+    - load_rules: Loads the rules from a data file.
+"""
+
+import json
+
+from settings import RULES_PATH
+from src.engine.events import event_bus, ConditionChanged, InventoryChanged
+
+
+def load_rules(path: str = RULES_PATH) -> list[dict]:
+    """
+    Loads the rules from a data file.
+
+    Args:
+        path (str, optional): Path to the JSON file with the rules. Defaults to `RULES_PATH`.
+
+    Returns:
+        list[dict]: The rules, in the order of the file.
+    """
+    with open(path, 'r', encoding='utf8') as file:
+        return json.load(file)
+
+
+def input_key(test: dict) -> str:
+    """
+    Returns the key of the input read by a condition of a rule, or written by an action.
+
+    Args:
+        test (dict): The condition, e.g. {"condition": "floor_1.bookshelf", "eq": 2}.
+
+    Returns:
+        str: The key of the input, e.g. "condition:floor_1.bookshelf".
+    """
+    for kind in ("condition", "item", "flag"):
+        if kind in test:
+            return f"{kind}:{test[kind]}"
+    raise ValueError(f"Rule condition without input: {test}")
+
+
+class Rule:
+    """
+    A rule compiled from its data: its conditions, actions and the keys of its inputs.
+    """
+    def __init__(self, index: int, data: dict) -> None:
+        """
+        Compiles a rule.
+
+        Args:
+            index (int): Position of the rule in the file, the rules are evaluated in that order.
+            data (dict): The rule, with a "name", its conditions ("when") and its actions ("then").
+        """
+        self.index = index
+        self.name = data['name']
+        self.conditions = data['when']
+        self.actions = data['then']
+        self.inputs = {input_key(test) for test in self.conditions}
+
+
+class RuleEngine:
+    """
+    Evaluates the rules against the state of the game when their inputs change.
+
+    The inputs are read from the game: the dialogue conditions of `game.scenes.state(<scene>)` (kept while
+    the scene is not loaded), `game.player.inventory` with the
+    items `game.<item>`, and the flags `game.<flag>`. The engine is started once the map is loaded, it does
+    not listen to the changes before that.
+    """
+    def __init__(self, game, rules: list[dict]|None = None) -> None:
+        """
+        Compiles the rules and their dependency index.
+
+        Args:
+            game (Game): The game instance holding the inputs of the rules.
+            rules (list[dict] | None, optional): The rules. Defaults to the rules of `RULES_PATH`.
+        """
+        self.game = game
+        self.rules = [Rule(index, data) for index, data in enumerate(rules if rules is not None else load_rules())]
+        self.dependencies = {}  # Input key -> rules reading it
+        for rule in self.rules:
+            for key in rule.inputs:
+                self.dependencies.setdefault(key, []).append(rule)
+        self.evaluations = {rule.name: 0 for rule in self.rules}
+        self.fired = {rule.name: 0 for rule in self.rules}
+        self.pending = set()  # Rules to evaluate
+        self.running = False  # Whether rules are being evaluated, to queue the changes made by their actions
+        self.active = False
+
+    def start(self) -> None:
+        """
+        Subscribes the engine to the changes of its inputs and evaluates every rule once.
+        """
+        if not self.active:
+            event_bus.subscribe(ConditionChanged, self.condition_changed)
+            event_bus.subscribe(InventoryChanged, self.item_changed)
+            self.active = True
+        self.pending.update(self.rules)
+        self.run()
+
+    def stop(self) -> None:
+        """
+        Unsubscribes the engine from the changes of its inputs.
+        """
+        event_bus.unsubscribe(ConditionChanged, self.condition_changed)
+        event_bus.unsubscribe(InventoryChanged, self.item_changed)
+        self.active = False
+
+    def notify(self, key: str) -> None:
+        """
+        Evaluates the rules depending on an input that changed.
+
+        Args:
+            key (str): The key of the input, e.g. "condition:floor_1.bookshelf" or "item:books".
+        """
+        if not self.active:
+            return
+        self.pending.update(self.dependencies.get(key, ()))
+        self.run()
+
+    def condition_changed(self, event: ConditionChanged) -> None:
+        """
+        Evaluates the rules depending on a dialogue condition that changed.
+
+        Args:
+            event (ConditionChanged): The event of the change.
+        """
+        self.notify(f"condition:{event.scene}.{event.condition}")
+
+    def item_changed(self, event: InventoryChanged) -> None:
+        """
+        Evaluates the rules depending on an item added to or removed from the inventory.
+
+        Args:
+            event (InventoryChanged): The event of the change.
+        """
+        self.notify(f"item:{event.item.name}")
+
+    def run(self) -> None:
+        """
+        Evaluates the pending rules in the order of the file, until none is left. The changes made by
+        the actions of a rule add the rules depending on them to the pending ones.
+        """
+        if self.running:
+            return
+        self.running = True
+        try:
+            while self.pending:
+                rule = min(self.pending, key=lambda rule: rule.index)
+                self.pending.discard(rule)
+                self.evaluations[rule.name] += 1
+                if all(self.check(test) for test in rule.conditions):
+                    self.fired[rule.name] += 1
+                    for action in rule.actions:
+                        self.apply(action)
+        finally:
+            self.running = False
+
+    def check(self, test: dict) -> bool:
+        """
+        Checks a condition of a rule against the state of the game.
+
+        Args:
+            test (dict): The condition.
+
+        Returns:
+            bool: Whether the condition holds.
+        """
+        if "item" in test:
+            return self.game.player.inventory.has_item(getattr(self.game, test['item'])) == test['has']
+        if "condition" in test:
+            scene, condition = test['condition'].split('.')
+            value = self.game.scenes.state(scene).dialogue_conditions[condition]
+        else:
+            value = getattr(self.game, test['flag'])
+        if "eq" in test:
+            return value == test['eq']
+        if "ne" in test:
+            return value != test['ne']
+        if "in" in test:
+            return value in test['in']
+        return value not in test['not_in']
+
+    def apply(self, action: dict) -> None:
+        """
+        Runs an action of a rule. The scenes and the inventory notify the engine of their changes.
+
+        Args:
+            action (dict): The action.
+        """
+        inventory = self.game.player.inventory
+        if "add_item" in action:
+            inventory.add_item(getattr(self.game, action['add_item']))
+        elif "remove_item" in action:
+            inventory.remove_item(getattr(self.game, action['remove_item']))
+        elif "clear_inventory" in action:
+            inventory.clear_inventory()
+        elif "set_condition" in action:
+            scene, condition = action['set_condition'].split('.')
+            self.game.scenes.state(scene).change_conditions(condition, action['value'])
+        elif "set_flag" in action:
+            if getattr(self.game, action['set_flag']) != action['value']:
+                setattr(self.game, action['set_flag'], action['value'])
+                self.notify(f"flag:{action['set_flag']}")
+
+    def report(self) -> str:
+        """
+        Formats how many times each rule was evaluated and fired.
+
+        Returns:
+            str: One line per rule, in the order of the file.
+        """
+        width = max((len(rule.name) for rule in self.rules), default=0)
+        lines = [f"{'rule':<{width}}  evaluated  fired"]
+        for rule in self.rules:
+            lines.append(f"{rule.name:<{width}}  {self.evaluations[rule.name]:>9}  {self.fired[rule.name]:>5}")
+        return "\n".join(lines)
@@ -0,0 +1,158 @@
+"""
+Sampling profiler of the main thread, driven by a timer signal.
+
+The `StackSampler` arms an interval timer (`signal.setitimer`) and, on every SIGALRM, records the Python stack the
+main thread was running. Sampling costs a stack walk every interval instead of a hook on every call, so the game
+runs at its normal speed while it is sampled. Python only runs the signal handler between bytecodes: a sample
+falling during a long call into C (decoding an image, loading a sound) is taken when the call returns, and still
+shows the Python line that made it.
+
+Timer signals are only available on Unix, and only the main thread can install the handler: elsewhere the sampler
+is not `available` and records nothing.
+
+Classes:
+    - StackSampler: Samples the stacks of the main thread on a timer signal.
+
+Functions:
+    - frame_name: Formats a frame of a stack.
+    - collapse: Counts the stacks in the collapsed format of the flamegraph tools.
+"""
+
+import os
+import signal
+import threading
+from collections import Counter
+
+# A frame of a sampled stack: (file, function, line)
+Frame = tuple[str, str, int]
+
+
+def frame_name(frame: Frame, lines: bool = False) -> str:
+    """
+    Formats a frame of a stack as "file:function", with the file relative to the working directory.
+
+    Args:
+        frame (Frame): The file, function and line.
+        lines (bool, optional): If True, adds the line: "file:function:line". Defaults to False.
+
+    Returns:
+        str: The frame.
+    """
+    filename, function, line = frame
+    try:
+        filename = os.path.relpath(filename)
+    except ValueError:  # Another drive on Windows
+        pass
+    return f"{filename}:{function}:{line}" if lines else f"{filename}:{function}"
+
+
+def collapse(stacks: list[tuple[Frame, ...]], lines: bool = False) -> Counter:
+    """
+    Counts the stacks in the collapsed format of the flamegraph tools: the frames from the root, joined by ";".
+
+    Args:
+        stacks (list[tuple[Frame, ...]]): The sampled stacks, from the root.
+        lines (bool, optional): If True, the frames include their line. Defaults to False.
+
+    Returns:
+        Counter: Collapsed stack -> number of samples.
+    """
+    return Counter(";".join(frame_name(frame, lines) for frame in stack) for stack in stacks)
+
+
+class StackSampler:
+    """
+    Samples the stacks of the main thread every `interval` seconds while it runs.
+    """
+    def __init__(self, interval: float = 0.002, max_samples: int = 100_000) -> None:
+        """
+        Initializes a stopped sampler.
+
+        Args:
+            interval (float, optional): Seconds between two samples. Defaults to 0.002.
+            max_samples (int, optional): Samples kept until `take` is called, the next ones are dropped.
+                Defaults to 100_000.
+        """
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples = []  # Stacks from the root, as tuples of frames
+        self.dropped = 0
+        self.running = False
+        self.previous_handler = None
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the stacks can be sampled: on Unix, from the main thread.
+        """
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def sample(self, signum, frame) -> None:
+        """
+        Handler of the timer signal, records the interrupted stack.
+
+        Args:
+            signum (int): The signal.
+            frame (FrameType): The frame running when the signal arrived.
+        """
+        if len(self.samples) >= self.max_samples:
+            self.dropped += 1
+            return
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_name, frame.f_lineno))
+            frame = frame.f_back
+        stack.reverse()
+        self.samples.append(tuple(stack))
+
+    def start(self) -> bool:
+        """
+        Installs the signal handler and arms the timer.
+
+        Returns:
+            bool: False if the sampler is not available.
+        """
+        if self.running:
+            return True
+        if not self.available:
+            return False
+        self.previous_handler = signal.signal(signal.SIGALRM, self.sample)
+        signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+        """
+        Disarms the timer and restores the previous signal handler.
+        """
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self.previous_handler or signal.SIG_DFL)
+        self.running = False
+
+    def pause(self) -> None:
+        """
+        Disarms the timer, keeping the signal handler, e.g. while the game loop sleeps between frames.
+        """
+        if self.running:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def resume(self) -> None:
+        """
+        Arms the timer again after `pause`.
+        """
+        if self.running:
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+
+    def take(self) -> list[tuple[Frame, ...]]:
+        """
+        Returns the samples taken so far and starts a new batch.
+
+        Returns:
+            list[tuple[Frame, ...]]: The sampled stacks, from the root.
+        """
+        samples, self.samples = self.samples, []
+        self.dropped = 0
+        return samples
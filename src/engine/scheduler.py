@@ -0,0 +1,102 @@
+"""
+Frame scheduler of the game loop, to save power on the static screens and when the window is in the background.
+
+The menus only change on key presses and when their background animation moves to its next frame. Instead of
+polling the events 30 or 60 times per second, the `FrameScheduler` blocks in `pygame.event.wait` until an event
+arrives or the next animation frame is due, whichever comes first. When the window loses its focus or is
+minimised, nothing is rendered and the loop only wakes up for events (or every `IDLE_WAIT_MS`).
+
+Classes:
+    - FrameScheduler: Collects the events of each frame, sleeping when nothing has to be updated.
+"""
+
+import pygame
+
+from settings import IDLE_WAIT_MS
+
+# Window events changing whether the game has to be rendered
+FOCUS_EVENTS = {
+    pygame.WINDOWFOCUSLOST: ("focused", False),
+    pygame.WINDOWFOCUSGAINED: ("focused", True),
+    pygame.WINDOWMINIMIZED: ("visible", False),
+    pygame.WINDOWHIDDEN: ("visible", False),
+    pygame.WINDOWRESTORED: ("visible", True),
+    pygame.WINDOWSHOWN: ("visible", True),
+}
+
+
+class FrameScheduler:
+    """
+    Decides, for every frame of the game loop, whether to sleep waiting for events and whether to render.
+    """
+    def __init__(self, max_wait_ms: int = IDLE_WAIT_MS) -> None:
+        """
+        Initializes the scheduler, for a focused and visible window.
+
+        Args:
+            max_wait_ms (int, optional): Longest sleep without events. Defaults to `IDLE_WAIT_MS`.
+        """
+        self.max_wait_ms = max_wait_ms
+        self.focused = True
+        self.visible = True
+        self.waits = 0  # Frames that slept in pygame.event.wait
+        self.idle_ms = 0  # Total time slept
+        self.rendered = 0  # Frames rendered
+        self.skipped = 0  # Frames not rendered
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the window is focused and visible, i.e. whether the game is rendered.
+        """
+        return self.focused and self.visible
+
+    def get_events(self, states) -> list[pygame.event.Event]:
+        """
+        Returns the events of the frame. If there is none yet and the current state does not have to be
+        updated now (or the window is in the background), sleeps until an event arrives or the state's deadline.
+
+        Args:
+            states (StateMachine): The game states, whose current state gives the deadline.
+
+        Returns:
+            list[pygame.event.Event]: The events of the frame.
+        """
+        timeout = states.idle_timeout() if self.active else self.max_wait_ms
+        # Not pygame.event.peek(): it drops the attributes of the events posted with pygame.event.post
+        events = pygame.event.get()
+        if timeout and not events:
+            start = pygame.time.get_ticks()
+            event = pygame.event.wait(min(timeout, self.max_wait_ms))
+            self.waits += 1
+            self.idle_ms += pygame.time.get_ticks() - start
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+                events.extend(pygame.event.get())
+
+        for event in events:
+            lost = event.type == pygame.WINDOWEXPOSED  # The window content has to be presented again
+            if event.type in FOCUS_EVENTS:
+                attribute, value = FOCUS_EVENTS[event.type]
+                setattr(self, attribute, value)
+                lost = self.active  # The window content may have been lost
+            if lost:
+                states.current.dirty = True
+                states.current.full_redraw = True
+        return events
+
+    def should_render(self, states) -> bool:
+        """
+        Tells whether the frame has to be rendered, and counts the frames rendered and skipped.
+
+        Args:
+            states (StateMachine): The game states.
+
+        Returns:
+            bool: True if the window is in the foreground and the current state has to be redrawn.
+        """
+        if self.active and states.needs_redraw():
+            self.rendered += 1
+            return True
+        self.skipped += 1
+        return False
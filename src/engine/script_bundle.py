@@ -0,0 +1,237 @@
+"""
+Module for compiling the dialogue scripts into a single cached bundle.
+
+Instead of listing every scene folder and parsing one JSON file per interaction each time a scene is built,
+the scripts are compiled once into dialogue graphs and stored in one binary bundle together with the mtime,
+size and hash of their source files. Loading the bundle is a single read, and only the scripts whose source
+changed since the last build are compiled again. The bundle can be read from the threads decoding the scenes.
+
+Classes:
+    - ScriptBundle: Loads, validates and incrementally rebuilds the compiled script bundle.
+
+Functions:
+    - get_key_to_node: Maps the titles of the dialogue nodes to their choice keys.
+    - compile_script: Compiles a list of dialogue nodes into a dialogue graph.
+    - build_bundle: Compiles every script under the scripts folder and writes the bundle to disk.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import threading
+
+from settings import SCRIPTS_DIR, SCRIPT_BUNDLE_PATH
+
+BUNDLE_VERSION = 1
+
+
+def get_key_to_node(interactions: list) -> dict:
+    """Extracts the dialogue options and returns a mapping of titles to the next node keys.
+
+    Args:
+        interactions (list): List containing the interactions data.
+
+    Returns:
+        dict: A mapping of interaction titles to the keys that point to the next dialogue node.
+    """
+    return {interaction['title']: interaction['key'] for interaction in interactions if 'key' in interaction}
+
+
+def compile_script(nodes: list) -> dict:
+    """Compiles the nodes of a dialogue script into a dialogue graph.
+
+    The graph keeps the original nodes, the key-to-node mapping used for navigation and an index of the
+    nodes by title, so that finding a node does not need to scan the whole script. When two nodes share
+    a title, the first one wins, just like a linear search would.
+
+    Args:
+        nodes (list): The dialogue nodes loaded from a JSON script.
+
+    Returns:
+        dict: The compiled graph, with the keys 'nodes', 'key_to_node' and 'node_index'.
+    """
+    node_index = {}
+    for node in nodes:
+        node_index.setdefault(node['title'], node)
+    return {"nodes": nodes, "key_to_node": get_key_to_node(nodes), "node_index": node_index}
+
+
+class ScriptBundle:
+    """
+    Compiled dialogue scripts backed by a binary bundle on disk.
+
+    Each entry of the bundle stores a compiled graph along with the mtime, size and hash of its source file.
+    Scene folders also store their mtime and list of scripts, so an unchanged folder is not listed again.
+    Entries are validated against the source files when requested and recompiled only if their content changed.
+    """
+    def __init__(self, scripts_dir: str = SCRIPTS_DIR, bundle_path: str = SCRIPT_BUNDLE_PATH) -> None:
+        """
+        Initializes the ScriptBundle. The bundle file is only read when a script is first requested.
+
+        Args:
+            scripts_dir (str, optional): Folder containing the scene script folders. Defaults to `SCRIPTS_DIR`.
+            bundle_path (str, optional): Path of the bundle file. Defaults to `SCRIPT_BUNDLE_PATH`.
+        """
+        self.scripts_dir = scripts_dir
+        self.bundle_path = bundle_path
+        self.scripts = {}  # Script path -> entry with the compiled graph and source stats
+        self.folders = {}  # Folder path -> entry with its mtime and the scripts it contains
+        self.loaded = False
+        self.dirty = False
+        self.compiled_count = 0  # Number of scripts compiled since the bundle was loaded
+        self.lock = threading.RLock()  # The scenes are decoded on a thread pool, see `SceneRegistry`
+
+    def load(self) -> None:
+        """
+        Reads the bundle from disk. A missing, corrupted or outdated bundle is discarded,
+        and the scripts will be compiled again from their sources.
+        """
+        self.loaded = True
+        try:
+            with open(self.bundle_path, 'rb') as file:
+                data = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == BUNDLE_VERSION:
+            self.scripts = data['scripts']
+            self.folders = data['folders']
+
+    def save(self) -> None:
+        """
+        Writes the bundle to disk if anything changed since it was loaded.
+        The file is replaced atomically so a crash never leaves a half-written bundle behind.
+        """
+        if not self.dirty:
+            return
+        folder = os.path.dirname(self.bundle_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_path = self.bundle_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump({'version': BUNDLE_VERSION, 'scripts': self.scripts, 'folders': self.folders},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.bundle_path)
+        self.dirty = False
+
+    def _get(self, script_path: str) -> dict:
+        """
+        Returns the compiled graph of a script, compiling it again only if its source changed.
+
+        Args:
+            script_path (str): Path to the JSON script.
+
+        Returns:
+            dict: The compiled dialogue graph.
+        """
+        if not self.loaded:
+            self.load()
+        stat = os.stat(script_path)
+        entry = self.scripts.get(script_path)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['graph']
+
+        # The file was touched, only recompile it if the content actually changed
+        with open(script_path, 'rb') as file:
+            source = file.read()
+        digest = hashlib.sha256(source).hexdigest()
+        if not entry or entry['hash'] != digest:
+            entry = {'hash': digest, 'graph': compile_script(json.loads(source.decode('utf8')))}
+            self.compiled_count += 1
+        entry['mtime'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        self.scripts[script_path] = entry
+        self.dirty = True
+        return entry['graph']
+
+    def _list_folder(self, scripts_path: str) -> list[str]:
+        """
+        Returns the names of the JSON scripts in a folder, listing it only if it changed.
+
+        Args:
+            scripts_path (str): Path to the folder containing the scripts of a scene.
+
+        Returns:
+            list[str]: The sorted file names of the scripts in the folder.
+        """
+        if not self.loaded:
+            self.load()
+        mtime = os.stat(scripts_path).st_mtime_ns
+        entry = self.folders.get(scripts_path)
+        if entry and entry['mtime'] == mtime:
+            return entry['files']
+        files = sorted(filename for filename in os.listdir(scripts_path) if filename.endswith('.json'))
+        self.folders[scripts_path] = {'mtime': mtime, 'files': files}
+        self.dirty = True
+        return files
+
+    def get(self, script_path: str) -> dict:
+        """
+        Returns the compiled graph of a single script, saving the bundle if it had to be updated.
+
+        Args:
+            script_path (str): Path to the JSON script.
+
+        Returns:
+            dict: The compiled dialogue graph.
+        """
+        with self.lock:
+            graph = self._get(script_path)
+            self.save()
+        return graph
+
+    def get_scene(self, scripts_path: str) -> dict[str, dict]:
+        """
+        Returns the compiled graphs of every script of a scene, saving the bundle if it had to be updated.
+
+        Args:
+            scripts_path (str): Path to the folder containing the scripts of a scene.
+
+        Returns:
+            dict[str, dict]: The compiled graphs, keyed by the script name without the extension.
+        """
+        graphs = {}
+        with self.lock:
+            for filename in self._list_folder(scripts_path):
+                graphs[filename.split('.')[0]] = self._get(os.path.join(scripts_path, filename))
+            self.save()
+        return graphs
+
+    def build(self) -> int:
+        """
+        Compiles every script folder under the scripts directory and writes the bundle.
+
+        Returns:
+            int: The number of scripts that had to be compiled.
+        """
+        with self.lock:
+            compiled_before = self.compiled_count
+            for name in sorted(os.listdir(self.scripts_dir)):
+                folder = os.path.join(self.scripts_dir, name)
+                if os.path.isdir(folder):
+                    for filename in self._list_folder(folder):
+                        self._get(os.path.join(folder, filename))
+            self.save()
+            return self.compiled_count - compiled_before
+
+
+def build_bundle(scripts_dir: str = SCRIPTS_DIR, bundle_path: str = SCRIPT_BUNDLE_PATH) -> int:
+    """Compiles the scripts and writes the bundle, recompiling only the scripts that changed.
+
+    Args:
+        scripts_dir (str, optional): Folder containing the scene script folders. Defaults to `SCRIPTS_DIR`.
+        bundle_path (str, optional): Path of the bundle file. Defaults to `SCRIPT_BUNDLE_PATH`.
+
+    Returns:
+        int: The number of scripts that had to be compiled.
+    """
+    return ScriptBundle(scripts_dir, bundle_path).build()
+
+
+# Shared bundle used by the scenes, it is read from disk on the first request
+script_bundle = ScriptBundle()
+
+
+if __name__ == "__main__":
+    compiled = build_bundle()
+    print(f"Compiled {compiled} script(s) into {SCRIPT_BUNDLE_PATH}")
@@ -0,0 +1,198 @@
+"""
+Startup trace of the game, enabled with `python main.py --trace-startup`.
+
+The trace times every module imported while the game starts, through an import hook installed before the other
+imports of `main`, and the steps of `Game.__init__`. When the first frame is presented, it prints the time to
+first frame, the init steps in order and the slowest imports to stderr, then removes the import hook.
+
+This module only uses the standard library, so that importing it does not import anything worth timing.
+
+Classes:
+    - StartupRecord: A timed import or init step.
+    - ImportTimer: Import hook timing the execution of the modules.
+    - TimedLoader: Loader timing the execution of a module.
+    - StartupTrace: Collects the records and reports them at the first frame.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib.abc import MetaPathFinder
+
+
+@dataclass
+class StartupRecord:
+    """
+    A timed import or init step.
+
+    Attributes:
+        kind (str): "import" or "init".
+        name (str): The module or the step.
+        start (float): Seconds since the trace started.
+        duration (float): Seconds, including the nested imports and steps.
+        nested (float): Seconds spent in the nested imports and steps.
+        depth (int): Nesting level.
+    """
+    kind: str
+    name: str
+    start: float
+    duration: float = 0.0
+    nested: float = 0.0
+    depth: int = 0
+
+    @property
+    def own(self) -> float:
+        """
+        Seconds spent in the import or step itself, without the nested ones.
+        """
+        return self.duration - self.nested
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Import hook timing the execution of the modules: it finds the modules with the other finders and wraps
+    the `exec_module` of their loaders.
+    """
+    def __init__(self, trace) -> None:
+        """
+        Args:
+            trace (StartupTrace): The trace receiving the records.
+        """
+        self.trace = trace
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                loader = spec.loader
+                if loader is not None and hasattr(loader, "exec_module"):
+                    spec.loader = TimedLoader(loader, self.trace)
+                return spec
+        return None
+
+
+class TimedLoader:
+    """
+    Loader wrapping another one to time the execution of the module.
+    """
+    def __init__(self, loader, trace) -> None:
+        self.loader = loader
+        self.trace = trace
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        with self.trace.record("import", module.__name__):
+            self.loader.exec_module(module)
+
+
+class StartupTrace:
+    """
+    Collects the imports and init steps of the startup and reports them when the first frame is presented.
+    Does nothing until `start` is called.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes a disabled trace.
+        """
+        self.active = False
+        self.origin = 0.0
+        self.records = []
+        self.stack = []  # Records being timed
+        self.timer = ImportTimer(self)
+        self.first_frame = None  # Seconds from the start to the first frame
+
+    def start(self) -> None:
+        """
+        Starts timing, and installs the import hook before the finders of Python.
+        """
+        self.active = True
+        self.origin = time.perf_counter()
+        sys.meta_path.insert(0, self.timer)
+
+    def stop(self) -> None:
+        """
+        Stops timing and removes the import hook.
+        """
+        self.active = False
+        if self.timer in sys.meta_path:
+            sys.meta_path.remove(self.timer)
+
+    @contextmanager
+    def record(self, kind: str, name: str):
+        """
+        Times the code run in the block, when the trace is active.
+
+        Args:
+            kind (str): "import" or "init".
+            name (str): The module or the step.
+        """
+        if not self.active:
+            yield
+            return
+        record = StartupRecord(kind, name, time.perf_counter() - self.origin, depth=len(self.stack))
+        self.stack.append(record)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            record.duration = time.perf_counter() - self.origin - record.start
+            if self.stack:
+                self.stack[-1].nested += record.duration
+            self.records.append(record)
+
+    def step(self, name: str):
+        """
+        Times a step of the initialization.
+
+        Args:
+            name (str): The step, e.g. "menus".
+
+        Returns:
+            ContextManager: The block to time.
+        """
+        return self.record("init", name)
+
+    def frame_presented(self) -> None:
+        """
+        Ends the trace at the first frame and prints the report.
+        """
+        if not self.active:
+            return
+        self.first_frame = time.perf_counter() - self.origin
+        self.stop()
+        print(self.report(), file=sys.stderr)
+
+    def report(self, imports: int = 15) -> str:
+        """
+        Formats the trace.
+
+        Args:
+            imports (int, optional): Number of imports listed, the slowest first. Defaults to 15.
+
+        Returns:
+            str: The time to first frame, the init steps in order and the slowest imports.
+        """
+        lines = []
+        if self.first_frame is not None:
+            lines.append(f"first frame after {self.first_frame * 1000:.1f} ms")
+        lines.append(f"{'init step':<40}  {'total ms':>9}  {'self ms':>8}")
+        for record in sorted((r for r in self.records if r.kind == "init"), key=lambda r: r.start):
+            lines.append(f"{'  ' * record.depth + record.name:<40}  {record.duration * 1000:>9.1f}  "
+                         f"{record.own * 1000:>8.1f}")
+        top = sorted((r for r in self.records if r.kind == "import"), key=lambda r: r.own, reverse=True)
+        lines.append(f"{'import':<40}  {'total ms':>9}  {'self ms':>8}")
+        for record in top[:imports]:
+            lines.append(f"{record.name:<40}  {record.duration * 1000:>9.1f}  {record.own * 1000:>8.1f}")
+        return "\n".join(lines)
+
+
+# Trace of the game's startup, started by main when run with --trace-startup
+startup_trace = StartupTrace()
@@ -0,0 +1,242 @@
+"""
+Generic state machine for the modes of the game (menus, character creation, exploration...).
+
+Every mode is a `State` with `enter`, `exit`, `handle_event`, `update` and `draw` hooks. The `StateMachine`
+dispatches to the current state through a table of states, and runs the `exit` and `enter` hooks exactly once
+per transition, so the work of entering a mode is never repeated for every event. Each state also declares
+its frame rate and whether it is static, i.e. only redrawn after something changed. A static state that is
+redrawn without a full redraw returns the areas it changed, and only those are presented.
+
+Classes:
+    - State: Base class of the states, with hooks that do nothing.
+    - StateMachine: Holds the states and dispatches to the current one.
+"""
+
+import pygame
+
+from settings import FPS
+
+
+class State:
+    """
+    Base class of the states of a `StateMachine`.
+
+    `handle_event` and `update` return the name of the state to change to, or None to stay in this one.
+
+    Attributes:
+        fps (int): Frame rate of the game loop while this state is current.
+        static (bool): If True, the state is only redrawn when it is `dirty`: after entering it,
+            after an event, or when its `update` sets `dirty`.
+        full_redraw (bool): If True, the next draw changes the whole screen: after entering the state, or when
+            the window content was lost.
+    """
+    fps = FPS
+    static = False
+
+    def __init__(self, name: str) -> None:
+        """
+        Initializes the state.
+
+        Args:
+            name (str): Name of the state in its state machine.
+        """
+        self.name = name
+        self.dirty = True
+        self.full_redraw = True
+
+    def enter(self, previous: str|None) -> None:
+        """
+        Called once when the state becomes the current one.
+
+        Args:
+            previous (str | None): Name of the previous state, None for the first state.
+        """
+        pass
+
+    def exit(self, next_state: str) -> None:
+        """
+        Called once when the state stops being the current one.
+
+        Args:
+            next_state (str): Name of the next state.
+        """
+        pass
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        """
+        Handles an input event.
+
+        Args:
+            event (pygame.event.Event): The event.
+
+        Returns:
+            str | None: Name of the next state, or None to stay in this one.
+        """
+        return None
+
+    def update(self) -> str|None:
+        """
+        Updates the state once per frame.
+
+        Returns:
+            str | None: Name of the next state, or None to stay in this one.
+        """
+        return None
+
+    def draw(self) -> list[pygame.Rect]|None:
+        """
+        Draws the state on the screen.
+
+        Returns:
+            list[pygame.Rect] | None: The areas changed since the last draw, None if the whole screen changed.
+        """
+        return None
+
+    def needs_redraw(self) -> bool:
+        """
+        Tells whether the state has to be drawn this frame.
+
+        Returns:
+            bool: Always True for dynamic states, True for static states that are dirty.
+        """
+        return not self.static or self.dirty
+
+    def needs_full_redraw(self) -> bool:
+        """
+        Tells whether the next draw changes the whole screen, i.e. whether the screen has to be cleared first
+        and presented whole.
+
+        Returns:
+            bool: Always True for dynamic states, True for static states after entering them or losing the window.
+        """
+        return not self.static or self.full_redraw
+
+    def idle_timeout(self) -> int|None:
+        """
+        Tells how long the game loop can sleep waiting for events before this state has to be updated again.
+
+        Returns:
+            int | None: Milliseconds to sleep at most, None if the state has to be updated every frame.
+        """
+        return None
+
+
+class StateMachine:
+    """
+    Holds the states of the game and dispatches the events, updates and draws to the current one.
+    """
+    def __init__(self, on_change=None) -> None:
+        """
+        Initializes an empty state machine.
+
+        Args:
+            on_change (callable, optional): Called with the name of the new state after every transition. Defaults to None.
+        """
+        self.states = {}
+        self.current = None
+        self.on_change = on_change
+        self.transitions = 0
+
+    @property
+    def current_name(self) -> str|None:
+        """
+        The name of the current state, None before the first transition.
+        """
+        return self.current.name if self.current is not None else None
+
+    def add(self, state: State) -> State:
+        """
+        Adds a state to the table of states.
+
+        Args:
+            state (State): The state.
+
+        Returns:
+            State: The state added.
+        """
+        self.states[state.name] = state
+        return state
+
+    def change(self, name: str) -> None:
+        """
+        Changes the current state, running the `exit` hook of the old one and the `enter` hook of the new one.
+        Changing to the current state does nothing.
+
+        Args:
+            name (str): Name of the new state.
+        """
+        if name == self.current_name:
+            return
+        state = self.states[name]
+        previous = self.current_name
+        if self.current is not None:
+            self.current.exit(name)
+        self.current = state
+        state.dirty = True
+        state.full_redraw = True
+        state.enter(previous)
+        self.transitions += 1
+        if self.on_change is not None:
+            self.on_change(name)
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """
+        Passes an event to the current state and changes state if it asks to.
+
+        Args:
+            event (pygame.event.Event): The event.
+        """
+        state = self.current
+        next_state = state.handle_event(event)
+        state.dirty = True
+        if next_state is not None:
+            self.change(next_state)
+
+    def update(self) -> None:
+        """
+        Updates the current state and changes state if it asks to.
+        """
+        next_state = self.current.update()
+        if next_state is not None:
+            self.change(next_state)
+
+    def needs_redraw(self) -> bool:
+        """
+        Tells whether the current state has to be drawn this frame.
+
+        Returns:
+            bool: Whether the current state has to be drawn.
+        """
+        return self.current.needs_redraw()
+
+    def idle_timeout(self) -> int|None:
+        """
+        Tells how long the game loop can sleep waiting for events, see `State.idle_timeout`.
+
+        Returns:
+            int | None: Milliseconds to sleep at most, None if the current state has to be updated now.
+        """
+        if self.current.needs_redraw():
+            return None
+        return self.current.idle_timeout()
+
+    def needs_full_redraw(self) -> bool:
+        """
+        Tells whether the current state changes the whole screen when it is drawn this frame.
+
+        Returns:
+            bool: Whether the screen has to be cleared and presented whole.
+        """
+        return self.current.needs_full_redraw()
+
+    def draw(self) -> list[pygame.Rect]|None:
+        """
+        Draws the current state.
+
+        Returns:
+            list[pygame.Rect] | None: The areas changed by the state, None if the whole screen changed.
+        """
+        rects = self.current.draw()
+        self.current.dirty = False
+        self.current.full_redraw = False
+        return rects
@@ -0,0 +1,145 @@
+"""
+Watchdog of the slow frames, enabled with `python main.py --watchdog`.
+
+The averages of the profiler hide the hitches (the first skill check, the `load_map` transition, a music load).
+While the watchdog is watching the `FrameProfiler`, the profiler times the sections of every frame and a
+`StackSampler` samples the Python stacks during the frames. When a frame takes longer than the budget, the
+watchdog writes a line of JSON to a rotating log with:
+
+    - time, frame, duration_ms, budget_ms: when it happened and how slow it was
+    - the context given by the game, e.g. the state and the scene
+    - sections: the milliseconds of each section of the frame
+    - samples, stacks: the sampled stacks, collapsed ("file:function:line;..." -> samples)
+
+The watchdog does not use the display, it also runs with the SDL dummy drivers.
+
+Classes:
+    - FrameWatchdog: Logs the sections and the sampled stacks of the slow frames.
+
+Functions:
+    - read_slow_frames: Reads the records of a log.
+"""
+
+import os
+import json
+import time
+import logging
+from logging.handlers import RotatingFileHandler
+
+from settings import (WATCHDOG_BUDGET_MS, WATCHDOG_SAMPLE_MS, WATCHDOG_LOG_PATH, WATCHDOG_LOG_BYTES,
+                      WATCHDOG_LOG_BACKUPS)
+from src.engine.sampler import StackSampler, collapse
+
+
+def read_slow_frames(path: str = WATCHDOG_LOG_PATH) -> list[dict]:
+    """
+    Reads the records of a slow frames log.
+
+    Args:
+        path (str, optional): The log. Defaults to `WATCHDOG_LOG_PATH`.
+
+    Returns:
+        list[dict]: The slow frames, oldest first.
+    """
+    with open(path, encoding='utf8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class FrameWatchdog:
+    """
+    Logs the frames taking longer than the budget, with the timings of their sections and their sampled stacks.
+    """
+    def __init__(self, path: str = WATCHDOG_LOG_PATH, budget_ms: float = WATCHDOG_BUDGET_MS,
+                 sample_ms: float = WATCHDOG_SAMPLE_MS, max_bytes: int = WATCHDOG_LOG_BYTES,
+                 backups: int = WATCHDOG_LOG_BACKUPS, context=None) -> None:
+        """
+        Initializes a stopped watchdog. The log is opened on the first slow frame.
+
+        Args:
+            path (str, optional): The log. Defaults to `WATCHDOG_LOG_PATH`.
+            budget_ms (float, optional): Frames longer than this are logged. Defaults to `WATCHDOG_BUDGET_MS`.
+            sample_ms (float, optional): Interval of the stack sampler. Defaults to `WATCHDOG_SAMPLE_MS`.
+            max_bytes (int, optional): Size of the log before it is rotated. Defaults to `WATCHDOG_LOG_BYTES`.
+            backups (int, optional): Rotated logs kept. Defaults to `WATCHDOG_LOG_BACKUPS`.
+            context (Callable[[], dict] | None, optional): Returns the context of a slow frame, added to its
+                record. Defaults to None.
+        """
+        self.path = path
+        self.budget_ms = budget_ms
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.context = context
+        self.sampler = StackSampler(sample_ms / 1000)
+        self.handler = None  # Rotating log, opened on the first slow frame
+        self.frames = 0
+        self.slow_frames = 0
+
+    def start(self) -> None:
+        """
+        Starts the stack sampler, paused until the first frame begins. Without timer signals, the slow frames
+        are logged without their stacks.
+        """
+        if self.sampler.start():
+            self.sampler.pause()
+
+    def stop(self) -> None:
+        """
+        Stops the stack sampler and closes the log.
+        """
+        self.sampler.stop()
+        if self.handler is not None:
+            self.handler.close()
+            self.handler = None
+
+    def begin_frame(self) -> None:
+        """
+        Samples the stacks of the frame starting.
+        """
+        self.sampler.take()
+        self.sampler.resume()
+
+    def end_frame(self, duration: float, sections: dict, skip: bool = False) -> dict|None:
+        """
+        Stops sampling, and logs the frame if it was slow.
+
+        Args:
+            duration (float): Milliseconds of the frame.
+            sections (dict): Milliseconds of the sections of the frame.
+            skip (bool, optional): If True, the frame is not checked, e.g. it was slowed down by the profiler.
+                Defaults to False.
+
+        Returns:
+            dict | None: The record of the slow frame, None if the frame was on time.
+        """
+        self.sampler.pause()
+        self.frames += 1
+        if skip or duration <= self.budget_ms:
+            return None
+        samples = self.sampler.take()
+        record = {
+            "time": time.time(),
+            "frame": self.frames,
+            "duration_ms": round(duration, 3),
+            "budget_ms": round(self.budget_ms, 3),
+        }
+        if self.context is not None:
+            record.update(self.context())
+        record["sections"] = {name: round(ms, 3) for name, ms in sections.items()}
+        record["samples"] = len(samples)
+        record["stacks"] = dict(collapse(samples, lines=True).most_common())
+        self.write(record)
+        self.slow_frames += 1
+        return record
+
+    def write(self, record: dict) -> None:
+        """
+        Appends a record to the log, rotating it when it is full.
+
+        Args:
+            record (dict): The slow frame.
+        """
+        if self.handler is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backups,
+                                               encoding='utf8')
+        self.handler.handle(logging.makeLogRecord({"msg": json.dumps(record)}))
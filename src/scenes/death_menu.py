@@ -6,7 +6,22 @@ It provides options for displaying the reason for the player's death and allows
 """
 
 import pygame
+from src.engine.assets import assets
 from src.ui.animated_sequence import black_bg
+from src.ui.widgets import Label, Paragraph, draw_widgets
+
+# Text shown for each type of death
+DEATH_TEXTS = {
+    "health": "You were never the most athletic.\n"
+              "Your death is not a surprise,\n"
+              "it takes strength, however,\n"
+              "to die in such a dumb way.",
+    "reason": "A dark void fills your heart,\n"
+              "you feel nothing. It's pointless.\n"
+              "Darkness fills your mind and\n"
+              "your sanity is quickly drained\n"
+              "by the eternal worm.",
+}
 
 class DeathMenu:
     """
@@ -23,12 +38,35 @@ class DeathMenu:
             d_type (str, optional): Type of death ("health" or "reason"). Defaults to an empty string.
         """
         self.screen = screen
-        self.title_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 60)
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 20)
-        self.small_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 14)
+        self.title_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 60)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 20)
+        self.small_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 14)
         self.default_color = (255, 255, 255)
         self.d_type = d_type
 
+        # Widgets, rendered once (the death text again if the type of death changes)
+        center_x, center_y = self.screen.get_width() // 2, self.screen.get_height() // 2
+        self.death_text = Paragraph(self.font, self.get_death_text(), (center_x, center_y - 30), 30,
+                                    self.default_color, align="center")
+        self.widgets = [
+            self.death_text,
+            Label(self.title_font, "NEWSUN", self.default_color, center=(center_x, 150)),
+            Label(self.font, "Thanks for playing! Good luck in your next attempt.", self.default_color,
+                  center=(center_x, center_y + 200)),
+            Label(self.small_font, "A Game by Artur Krause, Bruno Rosa, Gustavo Silva, Gustavo Santos, and Henrique Beltrão",
+                  self.default_color, center=(center_x, 50)),
+            Label(self.font, "Press 'Q' to Quit", self.default_color, center=(center_x, center_y + 250)),
+        ]
+
+    def get_death_text(self) -> str:
+        """
+        Returns the text describing the death of the player.
+
+        Returns:
+            str: The lines of the text, separated by new lines.
+        """
+        return DEATH_TEXTS.get(self.d_type, "You lost.")  # "You lost." is an impossible case
+
     def update(self) -> str|None:
         """
         Updates the death menu state and checks for events.
@@ -56,58 +94,16 @@ class DeathMenu:
             if event.key == pygame.K_q:
                 return "quit"
     
-    def draw(self) -> None:
+    def draw(self) -> list[pygame.Rect]:
         """
         Draws the death menu on the screen, including the title, death message,
         and options (such as quitting the game by pressing 'Q').
+
+        Returns:
+            list[pygame.Rect]: The areas of the widgets that changed since the last draw.
         """
         black_bg.draw(self.screen)
         black_bg.animate()
         
-        # Display title
-        newsun = self.title_font.render("NEWSUN", True, self.default_color)
-        rect_newsun = newsun.get_rect(center=(self.screen.get_width() // 2, 150))
-        
-        # Display developer name
-        dev_name = self.small_font.render("A Game by Artur Krause, Bruno Rosa, Gustavo Silva, Gustavo Santos, and Henrique Beltrão", True, self.default_color)
-        rect_dev_name = dev_name.get_rect(center=(self.screen.get_width() // 2, 50))
-        
-        # Display thanks for playing
-        thanks_text = self.font.render("Thanks for playing! Good luck in your next attempt.", True, self.default_color)
-        rect_thanks_text = thanks_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 200))
-                
-        # Display options
-        quit_text = self.font.render("Press 'Q' to Quit", True, self.default_color)
-        rect_quit = quit_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 250))
-        
-        # Display lost text
-        if self.d_type == "health":
-            text_lines = [
-            "You were never the most athletic.",
-            "Your death is not a surprise,",
-            "it takes strength, however,",
-            "to die in such a dumb way."
-            ]
-        elif self.d_type == "reason":
-            text_lines = [
-            "A dark void fills your heart,",
-            "you feel nothing. It's pointless.",
-            "Darkness fills your mind and",
-            "your sanity is quickly drained",
-            "by the eternal worm."
-            ]
-        else:  # Impossible case
-            text_lines = ["You lost."]
-
-        # Render and blit each line of text
-        for i, line in enumerate(text_lines):
-            text = self.font.render(line, True, self.default_color)
-            rect_death_text = text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + (i - 1) * 30))
-            self.screen.blit(text, rect_death_text)
-        
-        # Draw other texts
-        self.screen.blit(text, rect_death_text)
-        self.screen.blit(newsun, rect_newsun)
-        self.screen.blit(thanks_text, rect_thanks_text)
-        self.screen.blit(dev_name, rect_dev_name)
-        self.screen.blit(quit_text, rect_quit)
+        self.death_text.set_text(self.get_death_text())
+        return draw_widgets(self.screen, self.widgets)
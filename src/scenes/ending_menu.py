@@ -7,7 +7,9 @@ the game. The user can quit by pressing the 'Q' key.
 
 
 import pygame
+from src.engine.assets import assets
 from src.ui.animated_sequence import black_bg
+from src.ui.widgets import Label, draw_widgets
 
 class EndingMenu:
     """
@@ -23,11 +25,21 @@ class EndingMenu:
             screen (pygame.Surface): The surface where the ending menu will be drawn.
         """
         self.screen = screen
-        self.title_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 60)
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 20)
-        self.small_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 14)
+        self.title_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 60)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 20)
+        self.small_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 14)
         self.default_color = (255, 255, 255)
 
+        # Widgets, rendered once
+        center_x, center_y = self.screen.get_width() // 2, self.screen.get_height() // 2
+        self.widgets = [
+            Label(self.title_font, "NEWSUN", self.default_color, center=(center_x, center_y)),
+            Label(self.font, "Thanks for playing!", self.default_color, center=(center_x, center_y + 50)),
+            Label(self.small_font, "A Game by Artur Krause, Bruno Rosa, Gustavo Silva, Gustavo Santos, and Henrique Beltrão",
+                  self.default_color, center=(center_x, 50)),
+            Label(self.font, "Press 'Q' to Quit", self.default_color, center=(center_x, center_y + 250)),
+        ]
+
     def update(self) -> str|None:
         """
         Updates the state of the ending menu.
@@ -59,7 +71,7 @@ class EndingMenu:
             if event.key == pygame.K_q:
                 return "quit"
     
-    def draw(self) -> None:
+    def draw(self) -> list[pygame.Rect]:
         """
         Renders the ending menu on the screen.
 
@@ -67,29 +79,13 @@ class EndingMenu:
         developer names, a thank you message, and the option to quit. It also handles background 
         animations.
 
-        The background is animated using `black_bg` and redrawn each time this method is called.
+        The background is animated using `black_bg` and redrawn each time this method is called, the texts
+        are only rendered once.
+
+        Returns:
+            list[pygame.Rect]: The areas of the widgets that changed since the last draw.
         """
         black_bg.draw(self.screen)
         black_bg.animate()
         
-        # Display title
-        newsun = self.title_font.render("NEWSUN", True, self.default_color)
-        rect_newsun = newsun.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2))
-        
-        self.screen.blit(newsun, rect_newsun)
-        
-        # Display developer name
-        dev_name = self.small_font.render("A Game by Artur Krause, Bruno Rosa, Gustavo Silva, Gustavo Santos, and Henrique Beltrão", True, self.default_color)
-        rect_dev_name = dev_name.get_rect(center=(self.screen.get_width() // 2, 50))
-        
-        # Display thanks for playing
-        thanks_text = self.font.render("Thanks for playing!", True, self.default_color)
-        rect_thanks_text = thanks_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 50))
-        
-        self.screen.blit(thanks_text, rect_thanks_text)
-        self.screen.blit(dev_name, rect_dev_name)
-        
-        # Display options
-        quit_text = self.font.render("Press 'Q' to Quit", True, self.default_color)
-        rect_quit = quit_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 250))
-        self.screen.blit(quit_text, rect_quit)
+        return draw_widgets(self.screen, self.widgets)
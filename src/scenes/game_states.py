@@ -0,0 +1,328 @@
+"""
+States of the game, one per menu or mode, run by the game's `StateMachine`.
+
+Each state wraps the scene of its mode (`MainMenu`, `NewGame`, the hotel scenes...) and turns the options
+selected in it into state changes. The work done when entering a mode, such as creating the character
+creation scene or loading the map, runs in the `enter` hooks, once per transition.
+
+Classes:
+    - MenuState: Base class of the static menus drawn over the animated black background.
+    - MainMenuState: The main menu.
+    - NewGameState: The character creation and the introduction dialogue.
+    - PlayState: The exploration of the hotel.
+    - PauseState: The pause menu.
+    - OptionsState: The options menu, opened from the main menu or the pause menu.
+    - EndingState: The ending screen.
+    - DeathState: The death screen.
+"""
+
+import pygame
+
+from src.engine.state_machine import State
+from src.engine.audio import PRIORITY_EVENT
+from src.engine.events import event_bus, StatChanged, SceneChanged
+from src.engine.profiler import profiler
+from src.scenes.new_game import NewGame
+from src.ui.animated_sequence import black_bg
+
+
+class MenuState(State):
+    """
+    Base class of the menus: they only change on key presses and when the background animation
+    moves to its next frame, so they are static and run at a lower frame rate. A key press only
+    redraws the widgets it changed, a new frame of the background redraws the whole screen.
+    """
+    fps = 30
+    static = True
+
+    def __init__(self, name: str, game) -> None:
+        """
+        Initializes the state.
+
+        Args:
+            name (str): Name of the state.
+            game (Game): The game instance.
+        """
+        super().__init__(name)
+        self.game = game
+        self.background_frame = None  # Frame of the background animation drawn last
+
+    def update(self) -> str|None:
+        """
+        Marks the menu as dirty when the background animation has a new frame.
+
+        Returns:
+            str | None: Always None.
+        """
+        if black_bg.frame_due():
+            self.dirty = True
+        return None
+
+    def idle_timeout(self) -> int|None:
+        """
+        The menu can sleep until the next frame of the background animation.
+
+        Returns:
+            int | None: Milliseconds before the next frame of the background.
+        """
+        return black_bg.next_frame_in()
+
+    def needs_full_redraw(self) -> bool:
+        """
+        The whole screen changes when the background animation is not on the frame drawn last.
+
+        Returns:
+            bool: True after entering the menu or losing the window, or with a new background frame.
+        """
+        return super().needs_full_redraw() or black_bg.count != self.background_frame
+
+    def draw(self) -> list[pygame.Rect]|None:
+        """
+        Draws the menu over the background animation.
+
+        Returns:
+            list[pygame.Rect] | None: The areas of the widgets that changed since the last draw.
+        """
+        self.background_frame = black_bg.count  # The frame the menu draws, before it animates the background
+        return self.draw_menu()
+
+    def draw_menu(self) -> list[pygame.Rect]|None:
+        """
+        Draws the menu scene.
+
+        Returns:
+            list[pygame.Rect] | None: The areas of the widgets that changed since the last draw.
+        """
+        return None
+
+
+class MainMenuState(MenuState):
+    """
+    The main menu, from which a new game is started.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("main", game)
+
+    def enter(self, previous: str|None) -> None:
+        self.game.preloader.wait("main_menu")  # Usually preloaded already, except when the game starts
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        selected_option = self.game.main_menu.handle_event(event)
+        if selected_option == "Start Game":
+            return "new_game"
+        elif selected_option == "Options":
+            self.game.options_menu.previous_screen = "main"
+            return "options"
+        elif selected_option == "Exit":
+            self.game.running = False  # Exit the game
+        return None
+
+    def draw_menu(self) -> list[pygame.Rect]:
+        return self.game.main_menu.draw()
+
+
+class NewGameState(State):
+    """
+    The character creation and the introduction dialogue, a new `NewGame` scene is created when entering it.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("new_game")
+        self.game = game
+
+    def enter(self, previous: str|None) -> None:
+        self.game.preloader.wait("new_game")  # Only waits for what was not preloaded during the main menu
+        self.game.new_game = NewGame(self.game.screen)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        self.game.new_game.handle_event(event)
+        if self.game.new_game.game_begin:
+            return "game"
+        return None
+
+    def update(self) -> str|None:
+        if self.game.new_game.dialogue_manager.dialogue_active:
+            self.game.music.play("new_game")  # Does nothing once the track is playing
+        return None
+
+    def draw(self) -> None:
+        self.game.new_game.draw()
+
+
+class PlayState(State):
+    """
+    The exploration of the hotel. Entering it from the character creation loads the map and places the player.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("game")
+        self.game = game
+        self.death = None  # Stat that reached 0, checked after each event
+        event_bus.subscribe(StatChanged, self.stat_changed)
+
+    def stat_changed(self, event: StatChanged) -> None:
+        """
+        Records the death of the player, and decodes the credits ahead of time when the player is about to die.
+
+        Args:
+            event (StatChanged): The change of health or reason.
+        """
+        if event.new <= 0 and self.death is None:
+            self.death = event.stat
+        elif event.new <= 1:
+            self.game.music.prefetch("credits")
+
+    def enter(self, previous: str|None) -> None:
+        if previous != "new_game":
+            return  # Back from the pause menu
+        game = self.game
+        game.preloader.wait("hotel")
+        game.current_scene = game.load_map()
+        game.player = game.new_game.player
+        game.player.add_game(game)
+        game.all_sprites.add(game.player)
+        game.all_sprites.add(game.current_scene)
+        for sprite in game.current_scene.scene_sprites:
+            game.all_sprites.add(sprite)
+        # The quest rules now run when a condition or the inventory changes
+        game.rules.start()
+        event_bus.publish(SceneChanged(None, game.current_scene.name))
+        game.audio.play('door_knock_angry', PRIORITY_EVENT)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        game = self.game
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "pause"
+
+        event_handled = game.current_scene.handle_event(event)
+        # check if event is a scene change
+        if event_handled in game.current_scene.scene_mapping.values():
+            new_scene = game.scenes.get(event_handled)  # Usually preloaded already
+            game.change_map(game.current_scene, new_scene)
+            game.current_scene = new_scene
+        # check if game ended or if you died
+        elif event_handled == "ending":
+            return "ending"
+        elif self.death is not None:
+            game.death_menu.d_type = self.death  # "health" or "reason"
+            return "death"
+        return None
+
+    def update(self) -> str|None:
+        game = self.game
+        with profiler.section("scenes"):
+            game.scenes.update()  # Preloads the neighbours of the current scene, one per frame
+        with profiler.section("sprites"):
+            game.all_sprites.update()
+        with profiler.section("camera"):
+            game.camera.box_target_camera(game.player)
+            game.camera.keyboard_control()
+        return None
+
+    def draw(self) -> None:
+        game = self.game
+        with profiler.section("world"):
+            # Integer positions, without a Vector2 per sprite and frame
+            offset_x, offset_y = int(game.camera.offset.x), int(game.camera.offset.y)
+            game.screen.blits([(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                               for sprite in game.all_sprites], doreturn=False)
+        with profiler.section("scene"):
+            game.current_scene.draw()
+
+
+class PauseState(MenuState):
+    """
+    The pause menu, opened with Escape while exploring the hotel.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("pause", game)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        selected_option = self.game.pause_menu.handle_event(event)
+        if selected_option == "Resume":
+            return "game"
+        elif selected_option == "Options":
+            self.game.options_menu.previous_screen = "pause"
+            return "options"
+        elif selected_option == "Exit":
+            self.game.running = False
+        return None
+
+    def draw_menu(self) -> list[pygame.Rect]:
+        return self.game.pause_menu.draw()
+
+
+class OptionsState(MenuState):
+    """
+    The options menu, going back to the menu it was opened from.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("options", game)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        selected_option = self.game.options_menu.handle_event(event)
+        if selected_option == "Back":
+            return self.game.options_menu.previous_screen  # main menu/pause menu
+        return None
+
+    def draw_menu(self) -> list[pygame.Rect]:
+        return self.game.options_menu.draw()
+
+
+class EndingState(MenuState):
+    """
+    The ending screen, shown after the last dialogue of the game.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("ending", game)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        if self.game.ending_menu.handle_event(event) == "quit":
+            self.game.running = False
+        return None
+
+    def draw_menu(self) -> list[pygame.Rect]:
+        return self.game.ending_menu.draw()
+
+
+class DeathState(MenuState):
+    """
+    The death screen, shown when the health or the reason of the player reaches 0.
+    """
+    def __init__(self, game) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+        """
+        super().__init__("death", game)
+
+    def handle_event(self, event: pygame.event.Event) -> str|None:
+        if self.game.death_menu.handle_event(event) == "quit":
+            self.game.running = False
+        return None
+
+    def draw_menu(self) -> list[pygame.Rect]:
+        return self.game.death_menu.draw()
@@ -9,24 +9,58 @@ Classes:
 - `Floor1`: Represents the first floor of the hotel, where the player can explore.
 - `Floor0`: Represents the lobby or ground floor of the hotel.
 - `Underground`: Represents the underground area, typically used for the final scenes or transitions.
+
+Functions:
+- `get_collision_path`: Returns the collision image that goes with a background.
 """
 
 
+import os
 import pygame
 
 from src.ui.interaction import load_scene_interactions
 from src.ui.animated_sequence import status_bar
 from src.characters.player import Player
 from src.characters.npc import NPC, Object
-from main import Game
+from src.engine.events import event_bus, ConditionChanged
+from src.engine.assets import assets
 from settings import *
 
+# Titles of the dialogue nodes that move the player to another scene
+SCENE_MAPPING = {
+    "GoToRoom": 'room_101',
+    "GoToCorridor": 'floor_1',
+    "Upstairs": 'floor_1',
+    "Downstairs": 'floor_0',
+    "EnterElevator": 'underground'
+}
+
+def get_collision_path(background_path: str) -> str:
+    """
+    Returns the path of the collision image of a background, e.g. "room_collision.png" for "room_full.png".
+
+    Args:
+        background_path (str): The path to the background image.
+
+    Returns:
+        str: The path to the collision image.
+    """
+    return background_path.replace("full.png", "collision.png")
+
+
 class Scene(pygame.sprite.Sprite):
     """
     Base class for a hotel scene in the game. Responsible for managing background images, 
     interactions, NPCs, objects, and scene transitions.
+
+    The subclasses declare the initial values of their dialogue conditions in `default_conditions` and the
+    positions of their interactive objects in `objects_positions`.
     """
-    def __init__(self, screen: pygame.Surface, background_path: str, scripts_path: str, width: int, height: int) -> None:
+    default_conditions = {}
+    objects_positions = {}
+
+    def __init__(self, screen: pygame.Surface, background_path: str, scripts_path: str, width: int, height: int,
+                 dialogue_managers: dict|None = None) -> None:
         """
         Initializes the Scene object with the given parameters and prepares all necessary assets 
         such as the background image, collision mask, dialogue managers, and NPCs.
@@ -37,17 +71,24 @@ class Scene(pygame.sprite.Sprite):
             scripts_path (str): The path to the scripts that define the dialogues and interactions for the scene.
             width (int): The width of the scene in pixels.
             height (int): The height of the scene in pixels.
+            dialogue_managers (dict | None, optional): The dialogue managers of a scene built before, keeping
+                their state. Loaded from the scripts if None. Defaults to None.
         """
-        # Initialize the screen, and load the dialogue managers from the scripts
+        # Initialize the screen, and load the dialogue managers from the scripts if the scene is new
         self.screen = screen
-        self.dialogue_managers = load_scene_interactions(scripts_path, self.screen)
+        self.name = os.path.basename(scripts_path)  # e.g. "room_101", the name of the scene in the game
+        if dialogue_managers is None:
+            dialogue_managers = load_scene_interactions(scripts_path, self.screen)
+        self.dialogue_managers = dialogue_managers
         self.in_dialogue = False
         self.player = Player(screen) # Singleton pattern to draw the player in the right order
+        from main import Game  # Imported here, main imports the scenes
         self.game = Game() # Singleton pattern to access the game instance
         self._layer = GROUND_LAYER
-        self.groups = self.game.all_sprites
-        pygame.sprite.Sprite.__init__(self, self.groups)
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 20)
+        # Not added to the sprites of the game here: only the current scene is, see `Game.change_map`
+        pygame.sprite.Sprite.__init__(self)
+        self.dialogue_conditions = dict(self.default_conditions)
+        self.hud = self.game.hud  # Shared by the scenes, the hotbar is only loaded once
         
         # Center the scene on the screen
         self.width = width
@@ -56,37 +97,21 @@ class Scene(pygame.sprite.Sprite):
         self.y = (HEIGHT-self.height)//2
         
         # Load and set up the background image
-        self.image = pygame.image.load(background_path).convert_alpha()
-        self.image.set_colorkey(BLUE)
-        
-        # Load and set up the background image
-        self.inventory_hotbar = pygame.image.load("assets/ui/hotbar.png").convert_alpha()
-        self.scaled_hotbar = pygame.transform.scale(self.inventory_hotbar, (3*self.inventory_hotbar.get_width() // 4, 3*self.inventory_hotbar.get_height() // 4))
+        self.image = assets.image(background_path, colorkey=BLUE)
         
-        # Prepare collision image and mask (used for collision detection)
-        collision_path = background_path.replace("full.png", "collision.png")
-        self.image_collision = pygame.image.load(collision_path).convert_alpha()
-        self.image_collision.set_colorkey(BLUE)
-        self.mask = pygame.mask.from_surface(self.image_collision)
+        # Prepare the collision mask (used for collision detection), the collision image is not kept
+        self.mask = assets.mask(get_collision_path(background_path), colorkey=BLUE)
         
         # Set the position of the scene on the screen
         self.rect = self.image.get_rect()
         self.rect.x = self.x
         self.rect.y = self.y
         
-        self.scene_mapping = {
-            "GoToRoom": 'room_101',
-            "GoToCorridor": 'floor_1',
-            "Upstairs": 'floor_1',
-            "Downstairs": 'floor_0',
-            "EnterElevator": 'underground'
-        }
+        self.scene_mapping = SCENE_MAPPING
         
         self.people = []
         self.objects = []
         self.scene_sprites = []
-        if not hasattr(self, 'objects_positions'):
-            self.objects_positions = {}
         
         self.npc_positionns = {
             "npc_tabastan": [(1940, 680), (10,0)],
@@ -168,15 +193,27 @@ class Scene(pygame.sprite.Sprite):
         
     def change_conditions(self, condition_name: str, value: int) -> None:
         """
-        Changes the value of a specific dialogue condition.
+        Changes the value of a specific dialogue condition, publishing a `ConditionChanged` event if it changed.
 
         Args:
             condition_name (str): The name of the condition to change.
             value (int): The new value to assign to the condition.
         """
-        if condition_name in self.dialogue_conditions:
+        if condition_name in self.dialogue_conditions and self.dialogue_conditions[condition_name] != value:
             # Update the condition value
+            old = self.dialogue_conditions[condition_name]
             self.dialogue_conditions[condition_name] = value
+            event_bus.publish(ConditionChanged(self.name, condition_name, old, value))
+
+    def release_assets(self) -> None:
+        """
+        Releases the background, the collision mask and the NPC hitboxes of the scene, when it is unloaded.
+        The dialogue managers and conditions are not released, they are kept by the scene registry.
+        """
+        assets.release(self.image)
+        assets.release(self.mask)
+        for npc in self.people:
+            npc.release_assets()
 
     def draw(self) -> None:
         """
@@ -189,12 +226,8 @@ class Scene(pygame.sprite.Sprite):
         """
         status_bar.draw(self.screen)
         status_bar.animate()
-        # Display the player's health and reason
-        self.screen.blit(self.font.render(f"Health: {self.player.health}", True, (255, 255, 255)), (20, 18))
-        self.screen.blit(self.font.render(f"Reason: {self.player.reason}", True, (255, 255, 255)), (20, 44))
-        
-        self.screen.blit(self.scaled_hotbar, (20, HEIGHT - 80))
-        self.player.inventory.draw(self.screen)
+        # Display the player's health, reason and inventory, only rendered again when they change
+        self.hud.draw(self.screen, self.player)
         
         # Draw active dialogue elements
         for manager in self.dialogue_managers.values():
@@ -208,7 +241,23 @@ class Room101(Scene):
     interacts with various objects, such as the bed, clock, mirror, and TV. The scene also
     features dialogue interactions with NPCs.
     """
-    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/room_full.png", scripts_path: str = "scripts/room_101", width: int = ROOM_WIDTH, height: int = ROOM_HEIGHT - 400) -> None:
+    default_conditions = {
+        "bed": 1,
+        "mirror": 1,
+        "tv": 1,
+    }
+    objects_positions = {
+        "bed": [(890, 480)],
+        "clock": [(508, 450)],
+        "door": [(870, 675)],
+        "mirror": [(274, 450)],
+        "poster": [(780, 450)],
+        "sink": [(348, 450)],
+        "toilet": [(195, 555)],
+        "tv": [(652, 451)]
+    }
+
+    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/room_full.png", scripts_path: str = "scripts/room_101", width: int = ROOM_WIDTH, height: int = ROOM_HEIGHT - 400, dialogue_managers: dict|None = None) -> None:
         """
         Initializes the Room 101 scene. This constructor sets up the scene with specific objects,
         dialogue conditions, and NPCs. It loads the background and other visual elements unique
@@ -220,23 +269,10 @@ class Room101(Scene):
             scripts_path (str, optional): Path to the dialogue scripts for the room.
             width (int, optional): The width of the scene. Defaults to `ROOM_WIDTH`.
             height (int, optional): The height of the scene. Defaults to `ROOM_HEIGHT - 400`.
+            dialogue_managers (dict | None, optional): The dialogue managers of the scene built before.
+                Defaults to None.
         """
-        self.dialogue_conditions = {
-            "bed": 1,
-            "mirror": 1,
-            "tv": 1,
-        }
-        self.objects_positions = {
-            "bed": [(890, 480)],
-            "clock": [(508, 450)],
-            "door": [(870, 675)],
-            "mirror": [(274, 450)],
-            "poster": [(780, 450)],
-            "sink": [(348, 450)],
-            "toilet": [(195, 555)],
-            "tv": [(652, 451)]
-        }
-        super().__init__(screen, background_path, scripts_path, width, height)
+        super().__init__(screen, background_path, scripts_path, width, height, dialogue_managers)
         
     def handle_event(self, event: pygame.event.Event) -> None|str:
         """
@@ -273,7 +309,21 @@ class Floor1(Scene):
     The class is a subclass of the `Scene` class and includes specific logic for handling events and interactions
     unique to Floor 1.
     """
-    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/hall_full.png", scripts_path: str = "scripts/floor_1", width: int = 0, height: int = 0) -> None:
+    default_conditions = {
+        "npc_tabastan": 1,
+        "npc_camellia": 1,
+        "bookshelf": 1,
+        "stairs_up": 1,
+    }
+    objects_positions = {
+        "door": [(870, 580)],
+        "elevator": [(1965, 600)],
+        "stairs_up": [(2170, 600), (100, 50)],
+        "stairs": [(1750, 600), (110, 50)],
+        "bookshelf": [(1240, 600), (84, 60)],
+    }
+
+    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/hall_full.png", scripts_path: str = "scripts/floor_1", width: int = 0, height: int = 0, dialogue_managers: dict|None = None) -> None:
         """
         Initializes the Floor 1 scene, setting up the objects, dialogue conditions, and NPCs.
         This constructor loads the background and other visual elements unique to Floor 1.
@@ -284,21 +334,10 @@ class Floor1(Scene):
             scripts_path (str, optional): Path to the dialogue scripts for the floor.
             width (int, optional): The width of the scene. Defaults to `ROOM_WIDTH`.
             height (int, optional): The height of the scene. Defaults to `ROOM_HEIGHT`.
+            dialogue_managers (dict | None, optional): The dialogue managers of the scene built before.
+                Defaults to None.
         """
-        self.dialogue_conditions = {
-            "npc_tabastan": 1,
-            "npc_camellia": 1,
-            "bookshelf": 1,
-            "stairs_up": 1,
-        }
-        self.objects_positions = {
-            "door": [(870, 580)],
-            "elevator": [(1965, 600)],
-            "stairs_up": [(2170, 600), (100, 50)],
-            "stairs": [(1750, 600), (110, 50)],
-            "bookshelf": [(1240, 600), (84, 60)],
-        }
-        super().__init__(screen, background_path, scripts_path, width, height)
+        super().__init__(screen, background_path, scripts_path, width, height, dialogue_managers)
 
     def handle_event(self, event: pygame.event.Event) -> None:
         """
@@ -336,8 +375,20 @@ class Floor0(Scene):
     these objects and NPCs, and the scene provides options for transitioning to other areas, such as 
     the stairs or the door.
     """
-    
-    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/lobby_full.png", scripts_path: str = "scripts/floor_0", width: int = 0, height: int = 0) -> None:
+    default_conditions = {
+        "npc_vorakh": 1,
+        "npc_efrim": 1,
+        "npc_ersilia": 1,
+        "sofa": 1,
+        "door": 1
+    }
+    objects_positions = {
+        "door": [(1620, 600), (70, 50)],
+        "stairs": [(1800, 600), (100, 50)],
+        "sofa": [(1595, 900), (290, 60)],
+    }
+
+    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/lobby_full.png", scripts_path: str = "scripts/floor_0", width: int = 0, height: int = 0, dialogue_managers: dict|None = None) -> None:
         """
         Initializes the Floor 0 scene, setting up the objects, dialogue conditions, and NPCs.
         This constructor loads the background and other visual elements unique to Floor 0.
@@ -348,20 +399,10 @@ class Floor0(Scene):
             scripts_path (str, optional): Path to the dialogue scripts for the floor.
             width (int, optional): The width of the scene. Defaults to `ROOM_WIDTH`.
             height (int, optional): The height of the scene. Defaults to `ROOM_HEIGHT`.
+            dialogue_managers (dict | None, optional): The dialogue managers of the scene built before.
+                Defaults to None.
         """
-        self.objects_positions = {
-            "door": [(1620, 600), (70, 50)],
-            "stairs": [(1800, 600), (100, 50)],
-            "sofa": [(1595, 900), (290, 60)],
-        }
-        self.dialogue_conditions = {
-            "npc_vorakh": 1,
-            "npc_efrim": 1,
-            "npc_ersilia": 1,
-            "sofa": 1,
-            "door": 1
-        }
-        super().__init__(screen, background_path, scripts_path, width, height)
+        super().__init__(screen, background_path, scripts_path, width, height, dialogue_managers)
 
     def handle_event(self, event: pygame.event.Event) -> None:
         """
@@ -399,7 +440,7 @@ class Underground(Scene):
     objects specific to this area.
     """
     
-    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/underground_full.png", scripts_path: str = "scripts/underground", width: int = 0, height: int = 0) -> None:
+    def __init__(self, screen: pygame.Surface, background_path: str = "assets/images/backgrounds/underground_full.png", scripts_path: str = "scripts/underground", width: int = 0, height: int = 0, dialogue_managers: dict|None = None) -> None:
         """
         Initializes the Underground scene, loading specific objects, dialogue conditions, and NPCs.
         This constructor sets up the background and other visual elements for the Underground area.
@@ -410,10 +451,10 @@ class Underground(Scene):
             scripts_path (str, optional): Path to the dialogue scripts for the Underground area.
             width (int, optional): The width of the scene. Defaults to `ROOM_WIDTH`.
             height (int, optional): The height of the scene. Defaults to `ROOM_HEIGHT`.
+            dialogue_managers (dict | None, optional): The dialogue managers of the scene built before.
+                Defaults to None.
         """
-        self.dialogue_conditions = {}
-        self.objects_positions = {}
-        super().__init__(screen, background_path, scripts_path, width, height)
+        super().__init__(screen, background_path, scripts_path, width, height, dialogue_managers)
 
     def handle_event(self, event: pygame.event.Event) -> None|str:
         """
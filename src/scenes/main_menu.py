@@ -7,7 +7,9 @@ screen presented to the player, where they can choose between different options
 """
 
 import pygame
+from src.engine.assets import assets
 from src.ui.animated_sequence import black_bg
+from src.ui.widgets import Label, OptionList, draw_widgets
 
 class MainMenu:
     """
@@ -27,38 +29,33 @@ class MainMenu:
         self.screen = screen
         self.options = ["Start Game", "Options", "Exit"]
         self.selected_option = 0
-        self.title_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 52)
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 26)
+        self.title_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 52)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 26)
         self.default_color = (255, 255, 255)
 
-    def draw(self) -> None:
+        # Widgets, rendered once and only redrawn when the selection changes
+        center_x = self.screen.get_width() // 2
+        self.title = Label(self.title_font, "Newsun", self.default_color, center=(center_x, 150))
+        self.keybinds = Label(self.font, "Z to Select | X to Cancel | Arrows to Move", self.default_color,
+                              center=(center_x, 500))
+        self.option_list = OptionList(self.font, self.options, (center_x, 250), 50, self.default_color)
+        self.widgets = [self.title, self.keybinds, self.option_list]
+
+    def draw(self) -> list[pygame.Rect]:
         """
         Draws the main menu screen on the given surface (screen).
 
-        This method renders the menu title, instructions for keybindings, and the list of options. The selected 
+        This method draws the menu title, instructions for keybindings, and the list of options. The selected 
         option is highlighted. It also handles drawing the background animation using `black_bg`.
+
+        Returns:
+            list[pygame.Rect]: The areas of the widgets that changed since the last draw.
         """
         black_bg.draw(self.screen)
         black_bg.animate()
         
-        # Display title and keybinds
-        newsun = self.title_font.render("Newsun", True, self.default_color)
-        rect_newsun = newsun.get_rect(center=(self.screen.get_width() // 2, 150))
-        
-        keybinds = self.font.render("Z to Select | X to Cancel | Arrows to Move", True, self.default_color)
-        rect_keybinds = keybinds.get_rect(center=(self.screen.get_width() // 2, 500))
-        
-        self.screen.blit(newsun, rect_newsun)
-        self.screen.blit(keybinds, rect_keybinds)
-        
-        # Select the current option
-        for i, option in enumerate(self.options):
-            color = self.default_color if i == self.selected_option else (100, 100, 100)
-            text = self.font.render(option, True, color)
-            rect = text.get_rect(center=(self.screen.get_width() // 2, 250 + i * 50))
-            self.screen.blit(text, rect)
-        
-        pygame.display.flip()
+        self.option_list.select(self.selected_option)
+        return draw_widgets(self.screen, self.widgets)
 
     def handle_event(self, event: pygame.event.Event) -> str|None:
         """
@@ -8,11 +8,14 @@ their stats, and the dialogue that follows once character creation is complete.
 
 
 import pygame
-import json
 
-from src.ui.interaction import DialogueManager, get_key_to_node
+from src.engine.assets import assets
+from src.engine.script_bundle import script_bundle
+from src.ui.interaction import DialogueManager
 from src.ui.animated_sequence import black_bg, dialogue_box_left, skill_desc
+from src.ui.widgets import Label, OptionList, Paragraph, draw_widgets
 from src.characters.player import Player
+from settings import SKILL_POINTS
 # from main import Game
 
 class NewGame:
@@ -30,23 +33,48 @@ class NewGame:
             event (pygame.event.Event): The pygame event to handle.
         """
         self.screen = screen
-        self.interactions = json.load(open('scripts/new_game/new_game.json'))
-        # self.interactions = json.load(open('scripts/room_101/mirror.json'))
-        self.key_to_node = get_key_to_node(self.interactions)
-        self.dialogue_manager = DialogueManager(self.screen, self.interactions, self.key_to_node)
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 24)
-        self.small_font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 18)
+        graph = script_bundle.get('scripts/new_game/new_game.json')
+        self.interactions = graph['nodes']
+        self.key_to_node = graph['key_to_node']
+        self.dialogue_manager = DialogueManager(self.screen, self.interactions, self.key_to_node, graph['node_index'])
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 24)
+        self.small_font = assets.font("assets/fonts/Helvetica-Bold.ttf", 18)
         self.player = Player(self.screen)  # Initialize the Player object
         
-        self.points = 8 # Points to distribute
+        self.points = SKILL_POINTS # Points to distribute
         self.stats = self.player.get_skills()  # Get the player stats
         self.descriptions = self.player.get_skills_description()  # Get the player stats descriptions
         self.skill_names = list(self.stats.keys())
         self.selected_skill = 0
+
+        # Widgets of the stats selection screen, rendered again only when the points or the selection change
+        white = (255, 255, 255)
+        bottom = 200 + len(self.skill_names) * 50  # Below the list of stats
+        self.points_label = Label(self.font, f"Available Points: {self.points}", white, topleft=(50, 100))
+        self.stat_list = OptionList(self.font, self.stat_texts(), (50, 200), 50, white, (175, 175, 175), align="left")
+        self.description = Paragraph(self.font, self.descriptions[self.skill_names[self.selected_skill]],
+                                     (500, bottom - 250), 30, white)
+        self.widgets = [
+            Label(self.font, "Choose your stats:", white, topleft=(50, 50)),
+            self.points_label,
+            self.stat_list,
+            self.description,
+            Label(self.small_font, "Use arrow keys to navigate", white, topleft=(50, bottom + 50)),
+            Label(self.font, "Press Z to confirm", white, topleft=(50, bottom + 100)),
+        ]
         
         self.character_creator_active = True
         self.game_begin = False
 
+    def stat_texts(self) -> list[str]:
+        """
+        Returns the texts of the stats in the selection screen.
+
+        Returns:
+            list[str]: The name and value of every stat.
+        """
+        return [f"{stat}: {value}" for stat, value in self.stats.items()]
+
     def handle_event(self, event: pygame.event.Event) -> None:
         """
         Handles user input events during the new game scene. The player can interact with the UI to select 
@@ -71,7 +99,6 @@ class NewGame:
                 # Finish character creation and start the dialogue phase
                 self.character_creator_active = False
                 self.dialogue_manager.dialogue_active = True
-                pygame.mixer.music.stop()
                 self.player.set_skills(self.stats)
                     
         elif self.dialogue_manager.dialogue_active:
@@ -81,7 +108,6 @@ class NewGame:
         if self.dialogue_manager.dialogue_ended:
             # Indicate that the game can begin
             self.game_begin = True
-            pygame.mixer.music.stop()
 
     def draw(self) -> None:
         """
@@ -100,33 +126,13 @@ class NewGame:
             skill_desc.draw(self.screen)
             skill_desc.animate()
             
-            # Display player stats selection screen (8 points to distribute)
-            text = self.font.render("Choose your stats:", True, (255, 255, 255))
-            text_2 = self.font.render(f"Available Points: {self.points}", True, (255, 255, 255))
-
-            self.screen.blit(text, (50, 50))
-            self.screen.blit(text_2, (50, 100))
-
-            # Display player stats using the Player object
-            y_offset = 200
-            for stat, value in self.stats.items():
-                color = (255, 255, 255) if stat == self.skill_names[self.selected_skill] else (175, 175, 175)
-                stat_text = self.font.render(f"{stat}: {value}", True, color)
-                self.screen.blit(stat_text, (50, y_offset))
-                y_offset += 50
-
-            # Display descriptions
-            description_text = self.descriptions[self.skill_names[self.selected_skill]]
-            description_lines = description_text.split('\n')
-            for i, line in enumerate(description_lines):
-                description_surface = self.font.render(line, True, (255, 255, 255))
-                self.screen.blit(description_surface, (500, y_offset - 250 + i * 30))
-                
-            # Display confirm prompt
-            arrow_keys_text = self.small_font.render("Use arrow keys to navigate", True, (255, 255, 255))
-            self.screen.blit(arrow_keys_text, (50, y_offset + 50))
-            confirm_text = self.font.render("Press Z to confirm", True, (255, 255, 255))
-            self.screen.blit(confirm_text, (50, y_offset + 100))
+            # Display player stats selection screen (8 points to distribute), only rendering what changed
+            self.points_label.set_text(f"Available Points: {self.points}")
+            for i, text in enumerate(self.stat_texts()):
+                self.stat_list.set_option(i, text)
+            self.stat_list.select(self.selected_skill)
+            self.description.set_text(self.descriptions[self.skill_names[self.selected_skill]])
+            draw_widgets(self.screen, self.widgets)
         else:
             # Display the dialogue once the character creation is finished
             self.dialogue_manager.draw()
@@ -4,7 +4,10 @@ and navigate back to the previous screen. User interaction is handled by keystro
 and the graphical interface is rendered using Pygame.
 """
 import pygame
+from src.engine.assets import assets
 from src.ui.animated_sequence import black_bg
+from src.engine.audio import ChannelManager
+from src.ui.widgets import OptionList, Slider, draw_widgets
 
 class OptionsMenu:
     """
@@ -19,12 +22,27 @@ class OptionsMenu:
             screen (pygame.Surface): The surface where the game is rendered.
         """
         self.screen = screen
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 26)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 26)
         self.volume = 0.3  # Initial volume level (30%)
-        self.options = ["Volume", "Back"]
+        self.options = [self.volume_text(), "Back"]
         self.selected_option = 0  # Initially, "Volume" is selected
         self.previous_screen = None
 
+        # Widgets, rendered again only when the selection or the volume changes
+        center_x = self.screen.get_width() // 2
+        self.option_list = OptionList(self.font, self.options, (center_x, 250), 50)
+        self.slider = Slider((center_x, 350), 200, self.volume)
+        self.widgets = [self.option_list, self.slider]
+
+    def volume_text(self) -> str:
+        """
+        Returns the text of the volume option.
+
+        Returns:
+            str: The volume as a percentage.
+        """
+        return f"Volume: {int(self.volume * 100)}%"
+
     def handle_event(self, event: pygame.event.Event) -> str|None:
         """
         Handles user input events during the options menu. This includes navigating between menu options 
@@ -46,15 +64,11 @@ class OptionsMenu:
             elif event.key == pygame.K_LEFT and self.selected_option == 0:
                 # Decrease volume when "Volume" option is selected
                 self.volume = max(0.0, self.volume - 0.1)  # Decrease volume
-                pygame.mixer.music.set_volume(self.volume)
-                pygame.mixer.Channel(0).set_volume(self.volume)
-                pygame.mixer.Channel(1).set_volume(self.volume)
+                ChannelManager().set_volume(self.volume)
             elif event.key == pygame.K_RIGHT and self.selected_option == 0:
                 # Increase volume when "Volume" option is selected
                 self.volume = min(1.0, self.volume + 0.1)  # Increase volume
-                pygame.mixer.music.set_volume(self.volume)
-                pygame.mixer.Channel(0).set_volume(self.volume)
-                pygame.mixer.Channel(1).set_volume(self.volume)
+                ChannelManager().set_volume(self.volume)
             elif event.key == pygame.K_z:
                 # Return to the previous screen if "Back" is selected
                 if self.options[self.selected_option] == "Back":
@@ -64,31 +78,20 @@ class OptionsMenu:
                 return "Back"
         return None
 
-    def draw(self) -> None:
+    def draw(self) -> list[pygame.Rect]:
         """
         Draws the options menu to the screen, including the volume slider and available menu options.
+
+        Returns:
+            list[pygame.Rect]: The areas of the widgets that changed since the last draw.
         """
         black_bg.draw(self.screen)
         black_bg.animate()
         
-        for i, option in enumerate(self.options):
-            color = (255, 255, 255) if i == self.selected_option else (100, 100, 100)
-            text = self.font.render(option, True, color)
-            rect = text.get_rect(center=(self.screen.get_width() // 2, 250 + i * 50))
-            self.screen.blit(text, rect)
-            
-        # Draw volume slider if "Volume" is selected
-        if self.selected_option == 0:
-            slider_x = self.screen.get_width() // 2
-            slider_y = 350
-            slider_width = 200
-            slider_height = 10
-            pygame.draw.rect(self.screen, (255, 255, 255), (slider_x - slider_width // 2, slider_y, slider_width, slider_height))
-            handle_x = slider_x - slider_width // 2 + int(self.volume * slider_width)
-            handle_y = slider_y - 5
-            handle_width = 10
-            handle_height = 20
-            pygame.draw.rect(self.screen, (162, 0, 220), (handle_x, handle_y, handle_width, handle_height))
-            
-        # Update the volume option text
-        self.options[0] = f"Volume: {int(self.volume * 100)}%"
+        # Update the volume option text and the slider, drawn only if "Volume" is selected
+        self.options[0] = self.volume_text()
+        self.option_list.set_option(0, self.options[0])
+        self.option_list.select(self.selected_option)
+        self.slider.set_value(self.volume)
+        self.slider.set_visible(self.selected_option == 0)
+        return draw_widgets(self.screen, self.widgets)
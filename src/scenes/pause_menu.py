@@ -6,7 +6,9 @@ Player interaction is handled through keyboard inputs, and the graphical interfa
 """
 
 import pygame
+from src.engine.assets import assets
 from src.ui.animated_sequence import black_bg
+from src.ui.widgets import Label, OptionList, draw_widgets
 
 class PauseMenu:
     """
@@ -22,10 +24,17 @@ class PauseMenu:
             screen (pygame.Surface): The surface where the menu will be drawn.
         """
         self.screen = screen
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 26)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 26)
         self.options = ["Resume", "Options", "Exit"]
         self.selected_option = 0
 
+        # Widgets, rendered once and only redrawn when the selection changes
+        center_x = self.screen.get_width() // 2
+        self.keybinds = Label(self.font, "Z to Select | X to Cancel | Arrows to Move", (255, 255, 255),
+                              center=(center_x, 500))
+        self.option_list = OptionList(self.font, self.options, (center_x, 250), 50)
+        self.widgets = [self.keybinds, self.option_list]
+
     def handle_event(self, event: pygame.event.Event) -> str|None:
         """
         Handles keyboard events for navigating the pause menu and selecting options.
@@ -47,27 +56,21 @@ class PauseMenu:
                 return "Resume"
         return None
 
-    def draw(self) -> None:
+    def draw(self) -> list[pygame.Rect]:
         """
         Draws the pause menu on the screen.
 
-        This method renders the menu options and key instructions to the screen.
+        This method draws the menu options and key instructions to the screen.
         It highlights the currently selected option and displays a set of instructions
         for the player.
 
         Keybinds are displayed at the bottom of the screen.
+
+        Returns:
+            list[pygame.Rect]: The areas of the widgets that changed since the last draw.
         """
         black_bg.draw(self.screen)
         black_bg.animate()
         
-        keybinds = self.font.render("Z to Select | X to Cancel | Arrows to Move", True, (255, 255, 255))
-        rect_keybinds = keybinds.get_rect(center=(self.screen.get_width() // 2, 500))
-        self.screen.blit(keybinds, rect_keybinds)
-        
-        # Draw the menu options, highlighting the selected option
-        for i, option in enumerate(self.options):
-            color = (255, 255, 255) if i == self.selected_option else (100, 100, 100)
-            text = self.font.render(option, True, color)
-            rect = text.get_rect(center=(self.screen.get_width() // 2, 250 + i * 50))
-            self.screen.blit(text, rect)
-        pygame.display.flip()
+        self.option_list.select(self.selected_option)
+        return draw_widgets(self.screen, self.widgets)
@@ -0,0 +1,434 @@
+"""
+Lifecycle of the hotel scenes: lazy construction, preloading of the neighbours and unloading under a budget.
+
+The scenes are not built when a new game starts. The `SceneRegistry` knows how to build each of them
+(`SCENE_SPECS`) and builds a scene the first time it is needed. The transitions between the scenes form a graph,
+derived from the dialogue scripts: a scene leads to another when one of its dialogue nodes has a title of
+`SCENE_MAPPING`. When the player enters a scene, its neighbours in that graph are queued and built one per frame,
+so walking through a door does not have to load anything. The scenes farther away are unloaded, the farthest
+first, while the loaded scenes use more memory than the budget.
+
+Building a scene has two phases. The files of the scene (its dialogue scripts, background and collision image)
+are read and decoded on a thread pool, which does not need the display and releases the GIL, so several scenes
+are decoded at once while the game keeps running. The main thread then only converts the images, builds the
+collision mask and creates the sprites. `timings` keeps how long each phase took for every scene.
+
+The dialogue conditions and dialogue managers of a scene live in its `SceneState`, which is never unloaded: the
+quest rules read and change the conditions of scenes that are not loaded, and a scene built again continues its
+dialogues where they were.
+
+Classes:
+    - SceneSpec: How to build a scene.
+    - SceneState: The state of a scene kept while it is unloaded.
+    - SceneRegistry: Builds, preloads and unloads the scenes.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from settings import (WIDTH, HEIGHT, ROOM_WIDTH, ROOM_HEIGHT, SCRIPTS_DIR, SCENE_PRELOAD_DEPTH, SCENE_MEMORY_BUDGET,
+                      SCENE_DECODE_WORKERS)
+from src.engine.assets import assets, surface_bytes, mask_bytes
+from src.engine.events import event_bus, SceneChanged
+from src.engine.script_bundle import script_bundle
+from src.scenes.hotel_scenes import Scene, Room101, Floor1, Floor0, Underground, SCENE_MAPPING, get_collision_path
+
+
+@dataclass(frozen=True)
+class SceneSpec:
+    """
+    How to build a scene. A scene has either a fixed size, or a size derived from the position of another
+    scene (its anchor) plus an offset, which is how the scenes of the hotel are laid out.
+
+    Attributes:
+        cls (type): The class of the scene.
+        background (str): The path to the background image of the scene.
+        size (tuple[int, int] | None): The width and height of the scene, None to derive them from the anchor.
+        anchor (str | None): Name of the scene whose position gives the size.
+        offset (tuple[int, int]): Added to the position of the anchor.
+    """
+    cls: type
+    background: str
+    size: tuple[int, int]|None = None
+    anchor: str|None = None
+    offset: tuple[int, int] = (0, 0)
+
+
+# The scenes of the hotel, by name (the names of their script folders)
+SCENE_SPECS = {
+    "room_101": SceneSpec(Room101, "assets/images/backgrounds/room_full.png", size=(ROOM_WIDTH, ROOM_HEIGHT - 400)),
+    "floor_1": SceneSpec(Floor1, "assets/images/backgrounds/hall_full.png", anchor="room_101", offset=(500, -600)),
+    "floor_0": SceneSpec(Floor0, "assets/images/backgrounds/lobby_full.png", anchor="floor_1", offset=(500, -750)),
+    "underground": SceneSpec(Underground, "assets/images/backgrounds/underground_full.png", anchor="floor_0",
+                             offset=(-1950, -750)),
+}
+
+
+class SceneState:
+    """
+    The dialogue conditions and managers of a scene, kept while the scene is unloaded.
+    """
+    # Same behavior as the scenes: changes the condition and publishes a `ConditionChanged` event
+    change_conditions = Scene.change_conditions
+
+    def __init__(self, name: str, conditions: dict[str, int]) -> None:
+        """
+        Args:
+            name (str): Name of the scene.
+            conditions (dict[str, int]): Initial values of the dialogue conditions.
+        """
+        self.name = name
+        self.dialogue_conditions = conditions
+        self.dialogue_managers = None  # Created with the scene the first time it is built
+
+
+class SceneRegistry:
+    """
+    Builds the scenes when they are needed, preloads the neighbours of the current scene and unloads the
+    scenes far from it.
+    """
+    def __init__(self, game, specs: dict[str, SceneSpec] = SCENE_SPECS, preload_depth: int = SCENE_PRELOAD_DEPTH,
+                 budget: int = SCENE_MEMORY_BUDGET, workers: int = SCENE_DECODE_WORKERS) -> None:
+        """
+        Args:
+            game (Game): The game instance.
+            specs (dict[str, SceneSpec], optional): The scenes. Defaults to `SCENE_SPECS`.
+            preload_depth (int, optional): Scenes up to this many transitions away are preloaded and never
+                unloaded. Defaults to `SCENE_PRELOAD_DEPTH`.
+            budget (int, optional): Bytes the loaded scenes can use before the far ones are unloaded.
+                Defaults to `SCENE_MEMORY_BUDGET`.
+            workers (int, optional): Threads decoding the scenes. Defaults to `SCENE_DECODE_WORKERS`.
+        """
+        self.game = game
+        self.specs = specs
+        self.preload_depth = preload_depth
+        self.budget = budget
+        self.workers = workers
+        self.pool = None  # Created when the first scene is decoded
+        self.pending = {}  # Name -> Future of the scenes being decoded
+        self.graph = None  # Transitions between the scenes, read from the scripts when first needed
+        self.active = False
+        self.loaded = {}
+        self.reset()
+        event_bus.subscribe(SceneChanged, self.scene_changed)
+
+    def reset(self) -> None:
+        """
+        Forgets every scene and state, for a new game.
+        """
+        for scene in self.loaded.values():
+            scene.release_assets()
+        for future in self.pending.values():
+            future.cancel()
+        wait(self.pending.values())
+        assets.drop_decoded(path for name in self.pending for path in self.paths(name)[1:])
+        self.pending = {}
+        self.loaded = {}  # Name -> Scene
+        self.states = {name: SceneState(name, dict(spec.cls.default_conditions)) for name, spec in self.specs.items()}
+        self.queue = deque()  # Scenes to preload
+        self.current = None
+        self.builds = 0  # Scenes built
+        self.late_builds = 0  # Scenes built when needed because they were not preloaded
+        self.unloads = 0  # Scenes unloaded
+        self.timings = {}  # Name -> seconds spent decoding ("decode") and building ("build") the scene
+
+    def start(self, name: str) -> Scene:
+        """
+        Starts following the scene changes, and returns the first scene.
+
+        Args:
+            name (str): Name of the first scene.
+
+        Returns:
+            Scene: The first scene.
+        """
+        self.reset()
+        self.active = True
+        # The neighbours are decoded on the pool while the first scene is built
+        self.prefetch(self.neighbours(name, include_self=True))
+        return self.get(name)
+
+    def load(self, names: list[str]) -> list[Scene]:
+        """
+        Builds several scenes, decoding all of them at once on the pool.
+
+        Args:
+            names (list[str]): Names of the scenes.
+
+        Returns:
+            list[Scene]: The scenes, in the same order.
+        """
+        self.prefetch(names)
+        return [self.get(name) for name in names]
+
+    def transitions(self) -> dict[str, set[str]]:
+        """
+        Returns the graph of the transitions between the scenes, derived from their dialogue scripts.
+
+        Returns:
+            dict[str, set[str]]: The scenes each scene leads to.
+        """
+        if self.graph is None:
+            self.graph = {}
+            for name in self.specs:
+                neighbours = set()
+                for graph in script_bundle.get_scene(f"{SCRIPTS_DIR}/{name}").values():
+                    for node in graph['nodes']:
+                        if node['title'] in SCENE_MAPPING and SCENE_MAPPING[node['title']] in self.specs:
+                            neighbours.add(SCENE_MAPPING[node['title']])
+                self.graph[name] = neighbours
+        return self.graph
+
+    def distances(self, name: str) -> dict[str, int]:
+        """
+        Returns the number of transitions from a scene to the scenes it leads to, directly or not.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            dict[str, int]: The distance of every reachable scene, 0 for the scene itself.
+        """
+        graph = self.transitions()
+        distances = {name: 0}
+        queue = deque([name])
+        while queue:
+            scene = queue.popleft()
+            for neighbour in sorted(graph[scene]):
+                if neighbour not in distances:
+                    distances[neighbour] = distances[scene] + 1
+                    queue.append(neighbour)
+        return distances
+
+    def neighbours(self, name: str, include_self: bool = False) -> list[str]:
+        """
+        Returns the scenes close enough to a scene to be preloaded with it.
+
+        Args:
+            name (str): Name of the scene.
+            include_self (bool, optional): Whether to list the scene itself first. Defaults to False.
+
+        Returns:
+            list[str]: The scenes up to `preload_depth` transitions away, the closest first.
+        """
+        return [neighbour for neighbour, distance in self.distances(name).items()
+                if (include_self or distance > 0) and distance <= self.preload_depth]
+
+    def size(self, name: str) -> tuple[int, int]:
+        """
+        Returns the width and height a scene is built with.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            tuple[int, int]: The size of the scene.
+        """
+        spec = self.specs[name]
+        if spec.size is not None:
+            return spec.size
+        # A scene is centered on the screen, so its position only depends on its size
+        width, height = self.size(spec.anchor)
+        return (WIDTH - width) // 2 + spec.offset[0], (HEIGHT - height) // 2 + spec.offset[1]
+
+    def state(self, name: str) -> SceneState:
+        """
+        Returns the dialogue conditions and managers of a scene, whether it is loaded or not.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            SceneState: The state of the scene.
+        """
+        return self.states[name]
+
+    def paths(self, name: str) -> tuple[str, str, str]:
+        """
+        Returns the files a scene is built from.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            tuple[str, str, str]: The scripts folder, the background image and the collision image.
+        """
+        background = self.specs[name].background
+        return f"{SCRIPTS_DIR}/{name}", background, get_collision_path(background)
+
+    def decode(self, name: str) -> float:
+        """
+        Reads the scripts and decodes the images of a scene, without converting them. Runs on the pool.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            float: The time it took, in seconds.
+        """
+        start = time.perf_counter()
+        scripts_path, background, collision = self.paths(name)
+        script_bundle.get_scene(scripts_path)
+        assets.decode(background)
+        assets.decode(collision)
+        return time.perf_counter() - start
+
+    def prefetch(self, names) -> None:
+        """
+        Starts decoding scenes on the pool, if they are not loaded or being decoded already.
+
+        Args:
+            names (Iterable[str]): Names of the scenes.
+        """
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scene-decode")
+        for name in names:
+            if name not in self.loaded and name not in self.pending:
+                self.pending[name] = self.pool.submit(self.decode, name)
+
+    def build(self, name: str) -> Scene:
+        """
+        Builds a scene, giving it back its dialogue state if it was built before. Waits for the scene to be
+        decoded if it is being decoded on the pool, and decodes it here if it is not.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            Scene: The scene.
+        """
+        future = self.pending.pop(name, None)
+        decode = future.result() if future is not None else self.decode(name)
+        start = time.perf_counter()
+        width, height = self.size(name)
+        scripts_path, background, collision = self.paths(name)
+        state = self.states[name]
+        # A scene built before gets its dialogue managers back instead of loading new ones
+        scene = self.specs[name].cls(self.game.screen, background_path=background, scripts_path=scripts_path,
+                                     width=width, height=height, dialogue_managers=state.dialogue_managers)
+        scene.dialogue_conditions = state.dialogue_conditions
+        state.dialogue_managers = scene.dialogue_managers
+        # Images that were in memory already did not use their decoded pixels
+        assets.drop_decoded((background, collision))
+        self.loaded[name] = scene
+        self.builds += 1
+        self.timings[name] = {"decode": decode, "build": time.perf_counter() - start}
+        return scene
+
+    def get(self, name: str) -> Scene:
+        """
+        Returns a scene, building it now if it is not loaded.
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            Scene: The scene.
+        """
+        if name in self.loaded:
+            return self.loaded[name]
+        if self.active and self.current is not None:
+            self.late_builds += 1
+        return self.build(name)
+
+    def unload(self, name: str) -> None:
+        """
+        Unloads a scene, releasing its images and masks. Its dialogue state is kept.
+
+        Args:
+            name (str): Name of the scene.
+        """
+        scene = self.loaded.pop(name)
+        scene.release_assets()
+        self.unloads += 1
+
+    def close(self) -> None:
+        """
+        Stops following the scene changes, forgets the scenes and stops the decoding threads.
+        """
+        event_bus.unsubscribe(SceneChanged, self.scene_changed)
+        self.reset()
+        self.active = False
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def scene_bytes(self, scene: Scene) -> int:
+        """
+        Returns the memory used by the background and the collision mask of a scene.
+
+        Args:
+            scene (Scene): The scene.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return surface_bytes(scene.image) + mask_bytes(scene.mask)
+
+    @property
+    def resident_bytes(self) -> int:
+        """
+        Memory used by the loaded scenes, in bytes.
+        """
+        return sum(self.scene_bytes(scene) for scene in self.loaded.values())
+
+    def scene_changed(self, event: SceneChanged) -> None:
+        """
+        Queues the neighbours of the new scene for preloading, and unloads the far scenes over the budget.
+
+        Args:
+            event (SceneChanged): The change of scene.
+        """
+        if not self.active or event.new not in self.specs:
+            return
+        self.current = event.new
+        distances = self.distances(event.new)
+        self.queue = deque(name for name in self.neighbours(event.new) if name not in self.loaded)
+        self.prefetch(self.queue)
+        self.trim(distances)
+
+    def trim(self, distances: dict[str, int]) -> None:
+        """
+        Unloads the scenes farther than `preload_depth` from the current one, the farthest first, until the
+        loaded scenes fit in the budget.
+
+        Args:
+            distances (dict[str, int]): The distances from the current scene.
+        """
+        far = [name for name in self.loaded if distances.get(name, len(self.specs)) > self.preload_depth]
+        far.sort(key=lambda name: distances.get(name, len(self.specs)), reverse=True)
+        for name in far:
+            if self.resident_bytes <= self.budget:
+                break
+            self.unload(name)
+
+    def update(self) -> None:
+        """
+        Preloads the next queued scene once it is decoded, called once per frame so that the scenes are built
+        one at a time. The frame never waits for the pool.
+        """
+        while self.queue:
+            name = self.queue[0]
+            if name in self.loaded:
+                self.queue.popleft()
+                continue
+            future = self.pending.get(name)
+            if future is not None and not future.done():
+                return
+            self.queue.popleft()
+            self.build(name)
+            return
+
+    def report(self) -> str:
+        """
+        Formats the time spent decoding and building each scene.
+
+        Returns:
+            str: One line per scene built, in the order they were built.
+        """
+        lines = [f"{'scene':<12}  {'decode ms':>9}  {'build ms':>8}"]
+        for name, timing in self.timings.items():
+            lines.append(f"{name:<12}  {timing['decode'] * 1000:>9.1f}  {timing['build'] * 1000:>8.1f}")
+        return "\n".join(lines)
@@ -5,17 +5,35 @@ This module provides utilities for loading and displaying sequences of images as
 in a Pygame application. It includes a function for loading PNG sequences and a `Video` class 
 for handling animations such as dialogue boxes, skill descriptions, and more.
 
+The videos only load their frames when they are first drawn, or earlier from the `Preloader`, so importing this
+module does not decode every animation of the game.
+
 Classes:
     - Video: Handles playing and rendering a sequence of images as an animation.
 
 Functions:
+    - get_frame_paths: Lists the PNG files of a sequence, in order.
     - load_png_sequence: Loads a sequence of PNG images from a specified folder.
 """
 
 import os
 import pygame
+from src.engine.assets import assets
 WIDTH, HEIGHT = 1050, 600
 
+def get_frame_paths(folder: str) -> list[str]:
+    """Lists the PNG files of a sequence, in order.
+
+    Args:
+        folder (str): Directory containing PNG files in a sequence (e.g., 'assets/animation/00001.png').
+
+    Returns:
+        list[str]: The paths of the frames.
+    """
+    num_frames = len([name for name in os.listdir(folder) if name.endswith('.png')])
+    return [f'{folder}/{i:05}.png' for i in range(num_frames)]
+
+
 def load_png_sequence(folder: str) -> list[pygame.surface.Surface]:
     """Loads a sequence of PNG images from a specified folder.
 
@@ -25,12 +43,7 @@ def load_png_sequence(folder: str) -> list[pygame.surface.Surface]:
     Returns:
         list[pygame.surface.Surface]: A list of Pygame surfaces representing the images in the sequence.
     """
-    sequence = []
-    num_frames = len([name for name in os.listdir(folder) if name.endswith('.png')])
-    for i in range(num_frames):
-        sequence.append(pygame.image.load(f'{folder}/{i:05}.png').convert_alpha())
-    
-    return sequence
+    return [assets.image(path) for path in get_frame_paths(folder)]
 
 
 class Video():
@@ -58,7 +71,9 @@ class Video():
         """        
         self.screen = screen
         self.x, self.y = x, y
-        self.sequence = load_png_sequence(folder)
+        self.folder = folder
+        self.paths = get_frame_paths(folder)
+        self.frames = []  # Loaded frames, see `load`
         self.start_delay = start_delay # Delay before starting the animation
         self.count = -start_delay # Frame Counter, blank for start_delay frames
         self.delay = delay # Animation Speed
@@ -66,6 +81,32 @@ class Video():
         self.status = status
         self.loop = loop
     
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether every frame of the video is loaded.
+        """
+        return len(self.frames) == len(self.paths)
+
+    def load(self, count: int|None = None) -> None:
+        """Loads the next frames of the video.
+
+        Args:
+            count (int | None, optional): Number of frames to load, None for all the frames left. Defaults to None.
+        """
+        end = len(self.paths) if count is None else min(len(self.paths), len(self.frames) + count)
+        for path in self.paths[len(self.frames):end]:
+            self.frames.append(assets.image(path))
+
+    @property
+    def sequence(self) -> list[pygame.surface.Surface]:
+        """
+        The frames of the video, loaded now if they were not preloaded.
+        """
+        if not self.loaded:
+            self.load()
+        return self.frames
+
     def animate(self) -> None:
         """Updates the animation by advancing to the next frame based on the delay.
 
@@ -92,25 +133,38 @@ class Video():
             # If the animation is still waiting for the initial delay, increment the frame counter
             self.count += 1
 
+    def next_frame_in(self) -> int:
+        """Returns the time left before the next call to `animate` advances the animation.
+
+        Returns:
+            int: Milliseconds before the next frame, 0 if it is due (or the animation is waiting for its start delay).
+        """
+        if self.count < 0:
+            return 0
+        return max(0, self.delay + 1 - (pygame.time.get_ticks() - self.time))
+
+    def frame_due(self) -> bool:
+        """Tells whether the next call to `animate` will advance the animation, i.e. if it has to be redrawn.
+
+        Returns:
+            bool: True if the animation is waiting for its start delay or if the frame delay has passed.
+        """
+        return self.next_frame_in() == 0
+
     def draw(self, targetSurf: pygame.surface.Surface) -> None:
         """Draws the video to the target surface (screen or any other surface).
         
         Args:
             targetSurf (pygame.surface.Surface): the surface where the video will be drawn
         """
-        if self.status:
-            if self.count >= 0:
-                # Blit (copy) the current frame from the sequence to the target surface at (x, y)
-                targetSurf.blit(self.sequence[self.count], (self.x, self.y))
-            else:
-                # If count is less than 0 (during the initial delay), draw a blank (transparent) surface
-                blank_surface = pygame.Surface(self.sequence[0].get_size(), pygame.SRCALPHA)
-                blank_surface.fill((0, 0, 0, 0))  # Transparent
-                targetSurf.blit(blank_surface, (self.x, self.y))
+        # Nothing is drawn while count is less than 0 (during the initial delay)
+        if self.status and self.count >= 0:
+            # Blit (copy) the current frame from the sequence to the target surface at (x, y)
+            targetSurf.blit(self.sequence[self.count], (self.x, self.y))
         
 
-# Loads videos outside of the class to avoid loading them multiple times
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Videos shared by the scenes, their frames are loaded on first use or by the preloader
+screen = None  # The videos are drawn on the surface given to `draw`
 # Calculating the position where the video will be displayed on the screen
 box_x = (7 * (WIDTH - 400)) // 8
 box_y = (HEIGHT - 600) // 2
@@ -0,0 +1,134 @@
+"""
+Heads-up display of the game scenes: the player's health and reason, and the inventory hotbar.
+
+The HUD keeps the stats text and the hotbar with the items already rendered. It listens to the event bus and
+only renders them again after a `StatChanged` or an `InventoryChanged` event, so a frame of the game only blits
+three cached surfaces. The hotbar image is loaded and scaled once for the whole game, not once per scene.
+
+Classes:
+    - HUD: Draws the cached stats and hotbar of the player.
+"""
+
+import pygame
+
+from settings import HEIGHT, TEXT_COLOR
+from src.engine.events import event_bus, StatChanged, InventoryChanged
+from src.engine.assets import assets
+
+HOTBAR_PATH = "assets/ui/hotbar.png"
+HUD_FONT_PATH = "assets/fonts/Helvetica-Bold.ttf"
+
+
+class HUD:
+    """
+    Draws the player's stats and inventory, rendering them again only when they change.
+    """
+    def __init__(self, font_size: int = 20) -> None:
+        """
+        Initializes the HUD and subscribes to the changes of stats and inventory. The font and the hotbar are
+        loaded on the first draw.
+
+        Args:
+            font_size (int, optional): Size of the stats text. Defaults to 20.
+        """
+        self.font_size = font_size
+        self.font = None
+        self.hotbar = None  # Scaled hotbar image
+        self.stats = []  # Rendered stats, as (surface, position)
+        self.hotbar_surface = None  # Hotbar with the items drawn on it
+        self.stats_dirty = True
+        self.inventory_dirty = True
+        self.loads = 0  # Times the font and hotbar were loaded
+        self.renders = {"stats": 0, "inventory": 0}  # Times each part was rendered
+        event_bus.subscribe(StatChanged, self.stat_changed)
+        event_bus.subscribe(InventoryChanged, self.inventory_changed)
+
+    def stat_changed(self, event: StatChanged) -> None:
+        """
+        Marks the stats text to be rendered again.
+
+        Args:
+            event (StatChanged): The change of health or reason.
+        """
+        self.stats_dirty = True
+
+    def inventory_changed(self, event: InventoryChanged) -> None:
+        """
+        Marks the hotbar to be rendered again.
+
+        Args:
+            event (InventoryChanged): The item added or removed.
+        """
+        self.inventory_dirty = True
+
+    def load(self) -> None:
+        """
+        Loads the font and the scaled hotbar, if they are not loaded yet.
+        """
+        if self.font is not None:
+            return
+        self.font = assets.font(HUD_FONT_PATH, self.font_size)
+        hotbar = assets.image(HOTBAR_PATH)
+        self.hotbar = assets.image(HOTBAR_PATH, size=(3*hotbar.get_width() // 4, 3*hotbar.get_height() // 4))
+        assets.release(hotbar)
+        self.loads += 1
+        self.stats_dirty = self.inventory_dirty = True
+        # The font can not be used once pygame quits, it is loaded again if the HUD is drawn afterwards
+        pygame.register_quit(self.release)
+
+    def release(self) -> None:
+        """
+        Drops the font and the rendered surfaces.
+        """
+        for asset in (self.font, self.hotbar):
+            if asset is not None:
+                assets.release(asset)
+        self.font = None
+        self.hotbar = None
+        self.stats = []
+        self.hotbar_surface = None
+
+    def render_stats(self, player) -> None:
+        """
+        Renders the health and reason of the player.
+
+        Args:
+            player (Player): The player.
+        """
+        self.stats = [
+            (self.font.render(f"Health: {player.health}", True, TEXT_COLOR), (20, 18)),
+            (self.font.render(f"Reason: {player.reason}", True, TEXT_COLOR), (20, 44)),
+        ]
+        self.stats_dirty = False
+        self.renders["stats"] += 1
+
+    def render_inventory(self, player) -> None:
+        """
+        Draws the items of the player's inventory on a copy of the hotbar.
+
+        Args:
+            player (Player): The player.
+        """
+        self.hotbar_surface = self.hotbar.copy()
+        x_offset = 20
+        for item in player.inventory.items:
+            self.hotbar_surface.blit(item.image, (x_offset, 15))
+            x_offset += item.image.get_width() + 30
+        self.inventory_dirty = False
+        self.renders["inventory"] += 1
+
+    def draw(self, screen: pygame.Surface, player) -> None:
+        """
+        Draws the stats and the hotbar, rendering again the parts that changed.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            player (Player): The player whose stats and inventory are shown.
+        """
+        self.load()
+        if self.stats_dirty:
+            self.render_stats(player)
+        if self.inventory_dirty:
+            self.render_inventory(player)
+        screen.blits(self.stats, doreturn=False)
+        screen.blit(self.hotbar_surface, (20, HEIGHT - 80))
@@ -9,33 +9,23 @@ Classes:
     - DialogueManager: Manages the dialogue flow, including player choices and skill checks.
 
 Functions:
-    - get_key_to_node: Maps player choices to the next dialogue node.
-    - load_scene_interactions: Loads dialogue data for a scene from JSON files.
+    - get_key_to_node: Maps player choices to the next dialogue node (defined in `script_bundle`).
+    - load_scene_interactions: Loads the compiled dialogue graphs of a scene and creates dialogue managers.
 """
 
 import pygame
-import os
-import json
 
+from src.engine.assets import assets
+from src.engine.script_bundle import script_bundle, get_key_to_node, compile_script
+from src.engine.audio import ChannelManager, PRIORITY_UI
+from src.engine.profiler import profiler
 from src.ui.animated_sequence import vid_roll, vid_pass, vid_fail, video, video_in, video_out
 from src.characters.player import Player
 from settings import WIDTH, HEIGHT
 
 
-def get_key_to_node(interactions: dict) -> dict:
-    """Extracts the dialogue options and returns a mapping of titles to the next node keys.
-
-    Args:
-        interactions (dict): Dictionary containing the interactions data.
-
-    Returns:
-        dict: A mapping of interaction titles to the keys that point to the next dialogue node.
-    """
-    return {interaction['title']: interaction['key'] for interaction in interactions if 'key' in interaction}
-
-
 def load_scene_interactions(scripts_path: str, screen: pygame.Surface) -> dict:
-    """Loads all the interactions in a scene from JSON files and creates dialogue managers.
+    """Loads all the interactions in a scene from the compiled script bundle and creates dialogue managers.
 
     Args:
         scripts_path (str): Path to the folder containing the scene's interaction files.
@@ -44,22 +34,10 @@ def load_scene_interactions(scripts_path: str, screen: pygame.Surface) -> dict:
     Returns:
         dict: A dictionary containing dialogue managers for each interaction in the scene.
     """
-    interactions = {}
-    key_to_node = {}
     dialogue_managers = {}
-    # Iterate through all files in the provided directory to find JSON files.
-    for filename in os.listdir(scripts_path):
-        if filename.endswith('.json'):
-            file_path = os.path.join(scripts_path, filename)
-            # Open and load the interaction data from the JSON file.
-            with open(file_path, 'r', encoding="utf8") as file:
-                interaction = json.load(file)
-                key = filename.split('.')[0]
-                # Store the interaction data in the 'interactions' dictionary.
-                interactions[key] = interaction
-                # Generate the key-to-node mapping for dialogue navigation.
-                key_to_node[key] = get_key_to_node(interaction)
-                dialogue_managers[key] = DialogueManager(screen, interaction, key_to_node[key])
+    # The bundle only recompiles the scripts that changed since it was built
+    for key, graph in script_bundle.get_scene(scripts_path).items():
+        dialogue_managers[key] = DialogueManager(screen, graph['nodes'], graph['key_to_node'], graph['node_index'])
     return dialogue_managers
 
 
@@ -69,7 +47,39 @@ class DialogueBox:
 
     The `DialogueBox` class handles the rendering of the dialogue box and its text, 
     including wrapping the text to fit within the box and animating the text display.
+
+    Only one dialogue can be active at a time, so a single box is pooled per screen (see `for_screen`)
+    and bound to whichever `DialogueManager` is currently drawing. The pool is emptied when pygame quits,
+    as the screens and the fonts of the boxes can not be used afterwards.
     """
+    _pool = {}  # Screen -> shared DialogueBox
+
+    @classmethod
+    def for_screen(cls, screen: pygame.Surface) -> 'DialogueBox':
+        """
+        Returns the dialogue box shared by every dialogue manager drawing on a screen, creating it if needed.
+
+        Args:
+            screen (pygame.Surface): The surface (screen) where the dialogue box will be drawn.
+
+        Returns:
+            DialogueBox: The pooled dialogue box of the screen.
+        """
+        if screen not in cls._pool:
+            if not cls._pool:
+                pygame.register_quit(cls.clear_pool)
+            cls._pool[screen] = cls(screen)
+        return cls._pool[screen]
+
+    @classmethod
+    def clear_pool(cls) -> None:
+        """
+        Forgets the pooled dialogue boxes and releases their fonts, called when pygame quits.
+        """
+        for box in cls._pool.values():
+            assets.release(box.font)
+        cls._pool.clear()
+
     def __init__(self, screen: pygame.Surface) -> None:
         """
         Initializes the DialogueBox object.
@@ -82,20 +92,37 @@ class DialogueBox:
         self.box_height = 600
         self.box_x = (7 * (WIDTH - self.box_width)) // 8
         self.box_y = (HEIGHT - self.box_height) // 2
-        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 18)
+        self.font = assets.font("assets/fonts/Helvetica-Bold.ttf", 18)
         self.text = ""
         self.lines = []
+        self.line_surfaces = {}  # Index -> rendered line, for the lines fully revealed
         self.rendered_done = False
+        self.new_text = True
+        self.owner = None  # Dialogue manager currently using the box
+
+    def bind(self, owner: object) -> None:
+        """
+        Binds the dialogue box to a dialogue manager. Switching to another manager restarts the text animation.
+
+        Args:
+            owner (object): The dialogue manager that is going to draw with the box.
+        """
+        if self.owner is not owner:
+            self.owner = owner
+            self.new_text = True
+            self.rendered_done = False
 
     def set_text(self, text: str) -> None:
         """
-        Sets the text to be displayed in the dialogue box.
+        Sets the text to be displayed in the dialogue box. The text is only wrapped again if it changed.
 
         Args:
             text (str): The text to be shown in the dialogue box.
         """
-        self.text = text
-        self.lines = self.wrap_text(text)
+        if text != self.text or not self.lines:
+            self.text = text
+            self.lines = self.wrap_text(text)
+            self.line_surfaces = {}
 
     def wrap_text(self, text: str) -> list:
         """
@@ -153,11 +180,10 @@ class DialogueBox:
     def render_text(self) -> None: 
         """
         Renders the dialogue text with an animation effect, revealing characters gradually.
-        The speed at which the text is rendered can be adjusted.
+        The speed at which the text is rendered can be adjusted. The lines are drawn straight on the screen,
+        and a line is only rendered once it is fully revealed, only the line being revealed is rendered every frame.
         """
-        lines = self.wrap_text(self.text)  # Wrap the text to fit the box
-        text_surface = pygame.Surface((self.screen.get_width(), self.screen.get_height()), pygame.SRCALPHA)
-        text_surface.fill((0, 0, 0, 0))
+        lines = self.lines  # Text already wrapped to fit the box by set_text
         
         # Initialize time tracking if it's a new text or if it hasn't been set
         if (not hasattr(self, 'current_time')) or self.new_text:
@@ -171,14 +197,18 @@ class DialogueBox:
         current_chars = 0
         
         # Loop through each line and render part of the text
-        for line in lines:
-            if current_chars + len(line) < max_chars:
-                rendered_line = self.font.render(line, True, (255, 255, 255))
-                text_surface.blit(rendered_line, (20, 50 + lines.index(line) * 40))
+        for index, line in enumerate(lines):
+            position = (self.box_x + 20, self.box_y + 50 + index * 40)
+            if current_chars + len(line) <= max_chars:
+                if index not in self.line_surfaces:
+                    self.line_surfaces[index] = self.font.render(line, True, (255, 255, 255))
+                self.screen.blit(self.line_surfaces[index], position)
                 current_chars += len(line)
+                if current_chars == max_chars:
+                    break
             else:  # If the line should be cut off at max_chars
                 rendered_line = self.font.render(line[:max_chars - current_chars], True, (255, 255, 255))
-                text_surface.blit(rendered_line, (20, 50 + lines.index(line) * 40))
+                self.screen.blit(rendered_line, position)
                 current_chars += len(line[:max_chars - current_chars])
                 break
         
@@ -187,8 +217,6 @@ class DialogueBox:
             self.rendered_done = True
         else:
             self.rendered_done = False
-        
-        self.screen.blit(text_surface, (self.box_x, self.box_y))  # Finally, blit the surface with text
 
     def draw(self) -> None:
         """
@@ -204,9 +232,10 @@ class DialogueManager:
     Class that manages dialogue flow in the game.
 
     The DialogueManager handles the display of dialogue, transitions between nodes, and player interactions.
-    It manages dialogue boxes, animations, and updates player stats based on choices.
+    It only keeps the state of the dialogue graph: the rendering is done by the dialogue box shared by
+    every manager on the same screen, which the manager binds to when drawing.
     """
-    def __init__(self, screen: pygame.Surface, dialogue_data: list, key_to_node: dict) -> None:
+    def __init__(self, screen: pygame.Surface, dialogue_data: list, key_to_node: dict, node_index: dict|None = None) -> None:
         """Initializes the DialogueManager.
 
         Sets up the dialogue flow, initializing variables and linking the dialogue data with the screen.
@@ -215,13 +244,15 @@ class DialogueManager:
             screen (pygame.Surface): The game screen where dialogue will be displayed.
             dialogue_data (list): List of nodes that contain dialogue and interaction data.
             key_to_node (dict): Maps interaction choices (keys) to corresponding dialogue nodes.
+            node_index (dict | None, optional): Maps node titles to nodes, as compiled by the script bundle.
+                Built from `dialogue_data` if not given.
         """
         self.screen = screen
         self.key_to_node = key_to_node
         self.dialogue_data = dialogue_data
+        self.node_index = node_index if node_index is not None else compile_script(dialogue_data)['node_index']
         self.current_node = self.find_node("Start")
         self.next_node_title = None
-        self.dialogue_box = DialogueBox(screen)
         
         # Initialize state flags
         self.dialogue_active = False
@@ -233,6 +264,11 @@ class DialogueManager:
         self.nodes_with_body = [node for node in self.dialogue_data if 'body' in node]
         
         self.player = Player(self.screen) # Access singleton player object
+
+    @property
+    def dialogue_box(self) -> DialogueBox:
+        """DialogueBox: The dialogue box shared by every dialogue manager on the same screen."""
+        return DialogueBox.for_screen(self.screen)
     
     def find_node(self, title: str) -> dict|None:
         """Finds and returns a node based on its title.
@@ -243,10 +279,7 @@ class DialogueManager:
         Returns:
             dict | None: The node matching the title or None if not found.
         """
-        for node in self.dialogue_data:
-            if node['title'] == title:
-                return node
-        return None
+        return self.node_index.get(title)
 
     def handle_event(self, event: pygame.event.Event, condition: int = 1) -> None:
         """Handles dialogue and interaction events during the game.
@@ -255,6 +288,7 @@ class DialogueManager:
             event (pygame.event.Event): The current event to process.
             condition (int): Used to handle multiple "Start" nodes if applicable.
         """
+        self.dialogue_box.bind(self)
         if self.current_node['title'] == "Start":
             if self.start_count > 1:
                 self.current_node = self.find_node(f"Start{condition}")
@@ -272,17 +306,16 @@ class DialogueManager:
             difficulty_class = self.current_node.get('difficulty_class')
             if skill_name and difficulty_class:
                 check_result = self.player.roll_skill_check(skill_name, difficulty_class)
-                pygame.mixer.Channel(1).play(pygame.mixer.Sound('assets/sounds/check_roll.mp3'))
+                # Sounds come decoded from the sound bank, the pass/fail sound is queued after the roll
+                ChannelManager().play('check_roll', PRIORITY_UI, followed_by='check_pass' if check_result else 'check_fail')
                 
                 vid_roll.status = True
                 
                 if check_result == True:
-                    pygame.mixer.Channel(1).queue(pygame.mixer.Sound('assets/sounds/check_pass.mp3'))
                     vid_pass.status = True
                     self.next_node_title = self.current_node['title'].replace("Check", "Pass")
                 
                 elif check_result == False:
-                    pygame.mixer.Channel(1).queue(pygame.mixer.Sound('assets/sounds/check_fail.mp3'))
                     vid_fail.status = True
                     self.next_node_title = self.current_node['title'].replace("Check", "Fail")
                 
@@ -313,6 +346,7 @@ class DialogueManager:
         Handles rendering of the dialogue box, text, and animations (e.g., skill check videos).
         """
         if self.current_node in self.nodes_with_body:
+            self.dialogue_box.bind(self)
             self.dialogue_box.set_text(self.current_node['body'])
             # Render dialogue if it's active, and animate the text
             if not self.dialogue_ended or video_out.status:
@@ -323,14 +357,15 @@ class DialogueManager:
                 self.dialogue_ended = False
             
         # Render skill check animations based on current status
-        if vid_roll.status:
-            vid_roll.draw(self.screen)
-            vid_roll.animate()
-                
-        if vid_pass.status:
-            vid_pass.draw(self.screen)
-            vid_pass.animate()
-                
-        if vid_fail.status:
-            vid_fail.draw(self.screen)
-            vid_fail.animate()
+        with profiler.section("skill check"):
+            if vid_roll.status:
+                vid_roll.draw(self.screen)
+                vid_roll.animate()
+                    
+            if vid_pass.status:
+                vid_pass.draw(self.screen)
+                vid_pass.animate()
+                    
+            if vid_fail.status:
+                vid_fail.draw(self.screen)
+                vid_fail.animate()
@@ -11,6 +11,8 @@ Classes:
 
 import pygame
 from settings import *
+from src.engine.assets import assets
+from src.engine.events import event_bus, InventoryChanged
 
 class Item:
     """
@@ -23,17 +25,15 @@ class Item:
         """
         Initializes the item with a name and sprite image.
 
-        This method loads the image for the item, scales it to a fixed size of 32x32 pixels, 
-        and sets a transparency key to handle transparency in the image.
+        This method gets the image for the item from the asset registry, scaled to a fixed size of 32x32 pixels 
+        and with a transparency key to handle transparency in the image.
 
         Args:
             name (str): The name of the item.
             img_path (str): The path to the image file representing the item sprite.
         """
         self.name = name
-        self.image = pygame.image.load(img_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (32, 32))
-        self.image.set_colorkey(BLUE)
+        self.image = assets.image(img_path, size=(32, 32), colorkey=BLUE)
 
 
 class Inventory:
@@ -77,6 +77,7 @@ class Inventory:
         """
         if len(self.items) < self.capacity and not self.has_item(item):
             self.items.append(item)
+            event_bus.publish(InventoryChanged(item, True))
             return True
         return False
 
@@ -92,6 +93,7 @@ class Inventory:
         """
         if item in self.items:
             self.items.remove(item)
+            event_bus.publish(InventoryChanged(item, False))
             return True
         return False
     
@@ -101,7 +103,9 @@ class Inventory:
 
         This method removes all items from the inventory, resetting it to an empty state.
         """
-        self.items = []
+        items, self.items = self.items, []
+        for item in items:
+            event_bus.publish(InventoryChanged(item, False))
 
     def draw(self, screen: pygame.Surface) -> None:
         """
@@ -0,0 +1,123 @@
+"""
+Overlay of the frame profiler, toggled with F3: the rolling mean, p95 and p99 of every section of the frame, the
+draw calls of the last counted frame, and a graph of the last frame times. F4 adds the memory used by the surfaces,
+masks and sounds of each subsystem, from a `MemorySnapshot` taken on demand.
+
+The text is only rendered again every `refresh` frames, so that the overlay does not weigh on the frames it
+measures; its own drawing is timed in the "profiler" section.
+
+Classes:
+    - ProfilerOverlay: Draws the statistics of a `FrameProfiler` over the frame.
+"""
+
+import pygame
+
+from settings import WIDTH, FPS, TEXT_COLOR
+from src.engine.assets import assets
+from src.engine.profiler import profiler as game_profiler
+
+OVERLAY_FONT_PATH = "assets/fonts/Helvetica-Bold.ttf"
+PANEL_COLOR = (0, 0, 0, 180)
+GRAPH_COLOR = (120, 220, 120)
+BUDGET_COLOR = (220, 200, 80)  # Line of the frame period at `FPS`
+HITCH_COLOR = (220, 80, 80)  # Line of two frame periods
+
+
+class ProfilerOverlay:
+    """
+    Draws the statistics of the profiler in a panel at the top right of the screen.
+    """
+    def __init__(self, profiler=game_profiler, width: int = 320, graph_height: int = 60, font_size: int = 13,
+                 refresh: int = 10) -> None:
+        """
+        Initializes the overlay. The font and the panel are created on the first draw.
+
+        Args:
+            profiler (FrameProfiler, optional): The profiler shown. Defaults to the game's profiler.
+            width (int, optional): Width of the panel. Defaults to 320.
+            graph_height (int, optional): Height of the frame time graph. Defaults to 60.
+            font_size (int, optional): Size of the text. Defaults to 13.
+            refresh (int, optional): Frames between two renders of the text. Defaults to 10.
+        """
+        self.profiler = profiler
+        self.width = width
+        self.graph_height = graph_height
+        self.font_size = font_size
+        self.refresh = refresh
+        self.font = None
+        self.text = None  # Panel with the rendered statistics
+        self.memory = None  # Last MemorySnapshot shown, taken with F4
+        self.frames = 0
+
+    def rows(self) -> list[list[str]]:
+        """
+        Formats the statistics of the profiler.
+
+        Returns:
+            list[list[str]]: A header, a row per section with its name indented by its nesting level, the
+                counts of the last counted frame, and the memory of each subsystem if a snapshot was taken.
+        """
+        rows = [["ms", "mean", "p95", "p99"]]
+        for name, mean, p95, p99 in self.profiler.stats():
+            rows.append(["  " * self.profiler.depths.get(name, 0) + name, f"{mean:.2f}", f"{p95:.2f}", f"{p99:.2f}"])
+        counts = self.profiler.counts
+        rows.append([f"blits {counts['blits']}   renders {counts['renders']}   surfaces {counts['surfaces']}"])
+        if self.memory is not None:
+            rows.append([f"memory {self.memory.nbytes / 2**20:.1f} MiB", "", "items", "KiB"])
+            for subsystem, (count, nbytes) in self.memory.by_subsystem().items():
+                rows.append(["  " + subsystem, "", str(count), f"{nbytes / 1024:.0f}"])
+        return rows
+
+    def render(self) -> None:
+        """
+        Renders the statistics on a semi-transparent panel, the numbers right-aligned in their columns.
+        """
+        if self.font is None:
+            self.font = assets.font(OVERLAY_FONT_PATH, self.font_size)
+        rows = self.rows()
+        line_height = self.font.get_linesize()
+        height = len(rows) * line_height + self.graph_height + 12
+        self.text = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        self.text.fill(PANEL_COLOR)
+        for i, row in enumerate(rows):
+            y = 4 + i * line_height
+            self.text.blit(self.font.render(row[0], True, TEXT_COLOR), (6, y))
+            for column, cell in enumerate(row[1:], 1):
+                cell = self.font.render(cell, True, TEXT_COLOR)
+                self.text.blit(cell, cell.get_rect(topright=(self.width - 6 - (3 - column) * 60, y)))
+
+    def draw_graph(self, screen: pygame.Surface, rect: pygame.Rect) -> None:
+        """
+        Draws the last frame times, scaled so that the graph spans three frame periods.
+
+        Args:
+            screen (pygame.Surface): The surface drawn on.
+            rect (pygame.Rect): The area of the graph.
+        """
+        period = 1000 / FPS
+        scale = rect.height / (3 * period)
+        for ms, color in ((period, BUDGET_COLOR), (2 * period, HITCH_COLOR)):
+            y = rect.bottom - int(ms * scale)
+            pygame.draw.line(screen, color, (rect.left, y), (rect.right - 1, y))
+        times = list(self.profiler.frame_times)[-rect.width:]
+        if len(times) > 1:
+            step = rect.width / (self.profiler.window - 1)
+            points = [(rect.left + i * step, rect.bottom - min(rect.height, int(ms * scale)))
+                      for i, ms in enumerate(times)]
+            pygame.draw.lines(screen, GRAPH_COLOR, False, points)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draws the overlay, rendering the text again every `refresh` frames.
+
+        Args:
+            screen (pygame.Surface): The surface drawn on.
+        """
+        if self.text is None or self.frames % self.refresh == 0:
+            self.render()
+        self.frames += 1
+        left = WIDTH - self.width - 8
+        screen.blit(self.text, (left, 8))
+        graph = pygame.Rect(left + 6, 8 + self.text.get_height() - self.graph_height - 6, self.width - 12,
+                            self.graph_height)
+        self.draw_graph(screen, graph)
@@ -0,0 +1,319 @@
+"""
+Retained-mode widgets for the menus.
+
+A widget keeps its text rendered and laid out between frames: drawing it only blits surfaces that are already
+positioned, and a widget is rendered again only when its text, selection or value changes. Every change also
+records the areas of the screen that have to be redrawn, returned by `pop_dirty_rects`.
+
+Classes:
+    - Widget: Base class of the widgets.
+    - Label: A single line of text.
+    - Paragraph: Several lines of text, split on new lines.
+    - OptionList: A vertical list of options with a highlighted selection.
+    - Slider: A horizontal bar with a handle, for values between 0 and 1.
+
+Functions:
+    - draw_widgets: Draws widgets and returns the areas they changed.
+"""
+
+import pygame
+
+
+class Widget:
+    """
+    Base class of the widgets: holds the laid-out surfaces, the dirty rects and the number of renders.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty, visible widget.
+        """
+        self.items = []  # Laid-out surfaces, as (surface, rect)
+        self.visible = True
+        self.renders = 0  # Number of texts (or shapes) rendered
+        self.dirty_rects = []
+
+    def bounds(self) -> list[pygame.Rect]:
+        """
+        Returns the areas covered by the widget.
+
+        Returns:
+            list[pygame.Rect]: The rects of the laid-out surfaces.
+        """
+        return [rect.copy() for _, rect in self.items]
+
+    def set_items(self, items: list[tuple[pygame.Surface, pygame.Rect]]) -> None:
+        """
+        Replaces the laid-out surfaces, marking the old and new areas as dirty.
+
+        Args:
+            items (list[tuple[pygame.Surface, pygame.Rect]]): The new surfaces and their positions.
+        """
+        self.dirty_rects.extend(self.bounds())
+        self.items = items
+        self.dirty_rects.extend(self.bounds())
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Shows or hides the widget.
+
+        Args:
+            visible (bool): Whether the widget is drawn.
+        """
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty_rects.extend(self.bounds())
+
+    def pop_dirty_rects(self) -> list[pygame.Rect]:
+        """
+        Returns the areas changed since the last call, and forgets them.
+
+        Returns:
+            list[pygame.Rect]: The dirty rects.
+        """
+        rects, self.dirty_rects = self.dirty_rects, []
+        return rects
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Blits the laid-out surfaces of the widget.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+        """
+        if self.visible:
+            screen.blits(self.items, doreturn=False)
+
+
+class Label(Widget):
+    """
+    A single line of text, positioned by its center or its top left corner.
+    """
+    def __init__(self, font: pygame.font.Font, text: str, color: tuple[int, int, int] = (255, 255, 255),
+                 center: tuple[int, int]|None = None, topleft: tuple[int, int]|None = None) -> None:
+        """
+        Renders the label.
+
+        Args:
+            font (pygame.font.Font): Font of the text.
+            text (str): The text.
+            color (tuple[int, int, int], optional): Color of the text. Defaults to white.
+            center (tuple[int, int] | None, optional): Position of the center of the text. Defaults to None.
+            topleft (tuple[int, int] | None, optional): Position of the top left corner, used if `center` is None.
+        """
+        super().__init__()
+        self.font = font
+        self.text = None
+        self.color = color
+        self.position = {"center": center} if center is not None else {"topleft": topleft or (0, 0)}
+        self.set_text(text)
+
+    def set_text(self, text: str, color: tuple[int, int, int]|None = None) -> None:
+        """
+        Changes the text (and its color), rendering it again only if it changed.
+
+        Args:
+            text (str): The new text.
+            color (tuple[int, int, int] | None, optional): The new color, None to keep it. Defaults to None.
+        """
+        color = color if color is not None else self.color
+        if text == self.text and color == self.color:
+            return
+        self.text, self.color = text, color
+        surface = self.font.render(text, True, color)
+        self.renders += 1
+        self.set_items([(surface, surface.get_rect(**self.position))])
+
+
+class Paragraph(Widget):
+    """
+    Several lines of text, one below the other, aligned on the left or centered.
+    """
+    def __init__(self, font: pygame.font.Font, text: str, position: tuple[int, int], line_height: int,
+                 color: tuple[int, int, int] = (255, 255, 255), align: str = "left") -> None:
+        """
+        Renders the paragraph.
+
+        Args:
+            font (pygame.font.Font): Font of the text.
+            text (str): The text, with a new line between the lines.
+            position (tuple[int, int]): Top left corner of the first line, or its center if the text is centered.
+            line_height (int): Distance between the lines.
+            color (tuple[int, int, int], optional): Color of the text. Defaults to white.
+            align (str, optional): "left" or "center". Defaults to "left".
+        """
+        super().__init__()
+        self.font = font
+        self.text = None
+        self.position = position
+        self.line_height = line_height
+        self.color = color
+        self.align = align
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        """
+        Changes the text, rendering its lines again only if it changed.
+
+        Args:
+            text (str): The new text, with a new line between the lines.
+        """
+        if text == self.text:
+            return
+        self.text = text
+        x, y = self.position
+        items = []
+        for i, line in enumerate(text.split('\n')):
+            surface = self.font.render(line, True, self.color)
+            self.renders += 1
+            if self.align == "center":
+                rect = surface.get_rect(center=(x, y + i * self.line_height))
+            else:
+                rect = surface.get_rect(topleft=(x, y + i * self.line_height))
+            items.append((surface, rect))
+        self.set_items(items)
+
+
+class OptionList(Widget):
+    """
+    A vertical list of options, the selected one drawn in a different color. Both versions of every option
+    are rendered once, so changing the selection does not render anything.
+    """
+    def __init__(self, font: pygame.font.Font, options: list[str], position: tuple[int, int], spacing: int,
+                 color: tuple[int, int, int] = (255, 255, 255), dim_color: tuple[int, int, int] = (100, 100, 100),
+                 align: str = "center", selected: int = 0) -> None:
+        """
+        Renders the options.
+
+        Args:
+            font (pygame.font.Font): Font of the options.
+            options (list[str]): The texts of the options.
+            position (tuple[int, int]): Center of the first option, or its top left corner if aligned on the left.
+            spacing (int): Distance between the options.
+            color (tuple[int, int, int], optional): Color of the selected option. Defaults to white.
+            dim_color (tuple[int, int, int], optional): Color of the other options. Defaults to grey.
+            align (str, optional): "center" or "left". Defaults to "center".
+            selected (int, optional): Index of the selected option. Defaults to 0.
+        """
+        super().__init__()
+        self.font = font
+        self.position = position
+        self.spacing = spacing
+        self.color = color
+        self.dim_color = dim_color
+        self.align = align
+        self.selected = selected
+        self.options = []
+        self.rendered = []  # (dim surface, selected surface, rect) of every option
+        for option in options:
+            self.options.append(None)
+            self.rendered.append(None)
+            self.set_option(len(self.options) - 1, option)
+
+    def set_option(self, index: int, text: str) -> None:
+        """
+        Changes the text of an option, rendering it again only if it changed.
+
+        Args:
+            index (int): Index of the option.
+            text (str): The new text.
+        """
+        if self.options[index] == text:
+            return
+        self.options[index] = text
+        dim = self.font.render(text, True, self.dim_color)
+        bright = self.font.render(text, True, self.color)
+        self.renders += 2
+        x, y = self.position
+        if self.align == "center":
+            rect = dim.get_rect(center=(x, y + index * self.spacing))
+        else:
+            rect = dim.get_rect(topleft=(x, y + index * self.spacing))
+        self.rendered[index] = (dim, bright, rect)
+        self.layout()
+
+    def select(self, index: int) -> None:
+        """
+        Changes the selected option.
+
+        Args:
+            index (int): Index of the option to select.
+        """
+        if index != self.selected:
+            self.selected = index
+            self.layout()
+
+    def layout(self) -> None:
+        """
+        Picks the surface of every option according to the selection.
+        """
+        if None in self.rendered:
+            return  # Still adding the options
+        self.set_items([(bright if i == self.selected else dim, rect)
+                        for i, (dim, bright, rect) in enumerate(self.rendered)])
+
+
+class Slider(Widget):
+    """
+    A horizontal bar with a handle showing a value between 0 and 1.
+    """
+    def __init__(self, center: tuple[int, int], width: int, value: float,
+                 bar_color: tuple[int, int, int] = (255, 255, 255), handle_color: tuple[int, int, int] = (162, 0, 220),
+                 bar_height: int = 10, handle_size: tuple[int, int] = (10, 20)) -> None:
+        """
+        Renders the slider.
+
+        Args:
+            center (tuple[int, int]): Position of the center of the bar, its top edge is at `center[1]`.
+            width (int): Width of the bar.
+            value (float): The value, from 0.0 to 1.0.
+            bar_color (tuple[int, int, int], optional): Color of the bar. Defaults to white.
+            handle_color (tuple[int, int, int], optional): Color of the handle. Defaults to purple.
+            bar_height (int, optional): Height of the bar. Defaults to 10.
+            handle_size (tuple[int, int], optional): Width and height of the handle. Defaults to (10, 20).
+        """
+        super().__init__()
+        self.center = center
+        self.width = width
+        self.bar_color = bar_color
+        self.handle_color = handle_color
+        self.bar_height = bar_height
+        self.handle_size = handle_size
+        self.value = None
+        self.set_value(value)
+
+    def set_value(self, value: float) -> None:
+        """
+        Changes the value, drawing the slider again only if it changed.
+
+        Args:
+            value (float): The new value, from 0.0 to 1.0.
+        """
+        if value == self.value:
+            return
+        self.value = value
+        handle_width, handle_height = self.handle_size
+        offset = (handle_height - self.bar_height) // 2  # The handle goes above and below the bar
+        surface = pygame.Surface((self.width + handle_width, handle_height), pygame.SRCALPHA)
+        pygame.draw.rect(surface, self.bar_color, (0, offset, self.width, self.bar_height))
+        pygame.draw.rect(surface, self.handle_color, (int(value * self.width), 0, handle_width, handle_height))
+        self.renders += 1
+        rect = surface.get_rect(topleft=(self.center[0] - self.width // 2, self.center[1] - offset))
+        self.set_items([(surface, rect)])
+
+
+def draw_widgets(screen: pygame.Surface, widgets: list[Widget]) -> list[pygame.Rect]:
+    """
+    Draws widgets on a surface.
+
+    Args:
+        screen (pygame.Surface): The surface to draw on.
+        widgets (list[Widget]): The widgets, drawn in order.
+
+    Returns:
+        list[pygame.Rect]: The areas changed by the widgets since they were last drawn.
+    """
+    rects = []
+    for widget in widgets:
+        widget.draw(screen)
+        rects.extend(widget.pop_dirty_rects())
+    return rects
@@ -0,0 +1,59 @@
+"""
+Test module for the `allocations` module.
+
+Tests that the blocks allocated during a frame are counted by call site and the objects by type, and that the
+tracker stops tracing when it started it.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gc
+import unittest
+import tracemalloc
+from src.engine.allocations import AllocationTracker
+
+
+class Allocated:
+    pass
+
+
+class TestAllocationTracker(unittest.TestCase):
+
+    def setUp(self):
+        gc.disable()  # The young generation counts the objects of the frame, as with the GCScheduler
+        gc.collect()
+        self.tracker = AllocationTracker()
+        self.tracker.start()
+
+    def tearDown(self):
+        self.tracker.stop()
+        gc.enable()
+
+    def test_frame_allocations(self):
+        self.tracker.begin_frame()
+        kept = [Allocated() for _ in range(200)]
+        frame = self.tracker.end_frame(16.0, {})
+        self.assertGreaterEqual(frame["types"]["Allocated"], 200)
+        site = max(frame["sites"], key=frame["sites"].get)
+        self.assertTrue(site.startswith(os.path.join("tests", "test_allocations.py")))
+        self.assertGreater(frame["bytes"], 0)
+        self.assertEqual(len(kept), 200)
+        report = self.tracker.report()
+        self.assertIn("Allocated", report)
+        self.assertIn("test_allocations.py", report)
+
+    def test_skipped_frame(self):
+        self.tracker.begin_frame()
+        self.assertIsNone(self.tracker.end_frame(16.0, {}, skip=True))
+        self.assertEqual(self.tracker.frames, 0)
+
+    def test_stop(self):
+        self.tracker.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.tracker.begin_frame()
+        self.assertIsNone(self.tracker.end_frame(16.0, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Test module for the `assets` module.
+
+Tests that the `AssetRegistry` loads each asset once per set of load parameters, counts the references to it,
+forgets it when the last one is released, and reports the memory used.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import tempfile
+from unittest.mock import patch
+import pygame
+from src.engine.assets import AssetRegistry
+from src.engine.bake import AssetBaker
+
+HITBOX = 'assets/images/characters/player_hitbox.png'
+FONT = 'assets/fonts/Helvetica-Bold.ttf'
+
+
+class TestAssetRegistry(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.registry = AssetRegistry()
+        # Loads from the sources, whether the assets were baked or not
+        self.bake_dir = tempfile.TemporaryDirectory()
+        self.baked = patch('src.engine.assets.baked_assets', AssetBaker(bake_dir=self.bake_dir.name))
+        self.baked.start()
+
+    def tearDown(self):
+        self.baked.stop()
+        self.bake_dir.cleanup()
+
+    def test_image_loaded_once(self):
+        with patch('src.engine.assets.pygame.image.load', wraps=pygame.image.load) as load:
+            first = self.registry.image(HITBOX)
+            second = self.registry.image(HITBOX)
+        self.assertIs(first, second)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual((self.registry.loads, self.registry.hits), (1, 1))
+
+    def test_decoded_image_is_converted_without_reading_again(self):
+        self.registry.decode(HITBOX)
+        self.registry.decode(HITBOX)
+        self.assertEqual(self.registry.decodes, 1)
+        with patch('src.engine.assets.pygame.image.load', wraps=pygame.image.load) as load:
+            image = self.registry.image(HITBOX)
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(self.registry.decoded, {})
+        self.assertEqual(image.get_size(), pygame.image.load(HITBOX).get_size())
+
+    def test_parameters_are_part_of_the_key(self):
+        image = self.registry.image(HITBOX)
+        scaled = self.registry.image(HITBOX, size=(32, 32), colorkey=(0, 0, 255))
+        self.assertIsNot(image, scaled)
+        self.assertEqual(scaled.get_size(), (32, 32))
+        self.assertEqual(scaled.get_colorkey()[:3], (0, 0, 255))
+        self.assertIsNot(self.registry.font(FONT, 20), self.registry.font(FONT, 26))
+
+    def test_release_forgets_unreferenced_assets(self):
+        image = self.registry.image(HITBOX)
+        self.registry.image(HITBOX)
+        self.assertFalse(self.registry.release(image))
+        self.assertTrue(self.registry.release(image))
+        self.assertEqual(self.registry.entries, {})
+        self.assertFalse(self.registry.release(image))
+
+    def test_mask_does_not_keep_its_image(self):
+        mask = self.registry.mask(HITBOX)
+        self.assertIs(self.registry.mask(HITBOX), mask)
+        self.assertEqual([entry.kind for entry in self.registry.entries.values()], ["mask"])
+
+    def test_report(self):
+        image = self.registry.image(HITBOX)
+        self.registry.font(FONT, 20)
+        expected = image.get_pitch() * image.get_height() + os.path.getsize(FONT)
+        self.assertEqual(self.registry.resident_bytes, expected)
+        report = self.registry.report()
+        self.assertIn(HITBOX, report)
+        self.assertIn(f"2 assets, {expected} bytes", report)
+
+    def test_cleared_when_pygame_quits(self):
+        self.registry.font(FONT, 20)
+        pygame.quit()
+        self.assertEqual(self.registry.entries, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Test module for the `audio` module.
+
+Tests that the `SoundBank` decodes each sound effect only once, and that the `ChannelManager` respects
+the voice limits and priorities of its channel groups.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from unittest.mock import patch, MagicMock
+import pygame
+from src.engine.assets import assets
+from src.engine.audio import SoundBank, ChannelManager, PRIORITY_AMBIENT, PRIORITY_EVENT, PRIORITY_UI
+
+
+class TestSoundBank(unittest.TestCase):
+
+    def setUp(self):
+        self.bank = SoundBank()
+        self.saved_sounds, self.saved_late_loads = self.bank.sounds, self.bank.late_loads
+        self.bank.sounds, self.bank.late_loads = {}, 0
+        assets.clear()  # Decode the sounds again instead of sharing the ones loaded by other tests
+
+    def tearDown(self):
+        self.bank.sounds, self.bank.late_loads = self.saved_sounds, self.saved_late_loads
+        assets.clear()  # Forget the mocked sounds
+
+    @patch('src.engine.audio.pygame.mixer.Sound')
+    def test_preload_decodes_once(self, mock_sound):
+        """
+        Tests that preloading decodes every sound once, and that getting them afterwards does not decode anything.
+        """
+        self.bank.preload()
+        self.bank.preload()
+        self.assertEqual(mock_sound.call_count, len(self.bank.paths))
+        self.bank.get('check_roll')
+        self.assertEqual(mock_sound.call_count, len(self.bank.paths))
+        self.assertEqual(self.bank.late_loads, 0)
+
+    @patch('src.engine.audio.pygame.mixer.Sound')
+    def test_get_without_preload_counts_late_load(self, mock_sound):
+        self.bank.get('check_pass')
+        self.bank.get('check_pass')
+        self.assertEqual(mock_sound.call_count, 1)
+        self.assertEqual(self.bank.late_loads, 1)
+
+
+class TestChannelManager(unittest.TestCase):
+
+    def setUp(self):
+        pygame.mixer.init()
+        self.manager = ChannelManager()
+        self.manager.add_group('test', 1)
+        self.channel_id = self.manager.groups['test'][0]
+        self.channels = {}
+        self.busy = set()
+        self.manager.bank = MagicMock()
+
+    def tearDown(self):
+        del self.manager.groups['test']
+        self.manager.bank = SoundBank()
+
+    def fake_channel(self, channel_id):
+        """Returns a mocked channel, busy if its id is in `self.busy`."""
+        if channel_id not in self.channels:
+            channel = MagicMock()
+            channel.get_busy.side_effect = lambda: channel_id in self.busy
+            self.channels[channel_id] = channel
+        return self.channels[channel_id]
+
+    def test_free_channel_is_used(self):
+        with patch('src.engine.audio.pygame.mixer.Channel', side_effect=self.fake_channel):
+            channel = self.manager.play('check_roll', PRIORITY_EVENT, followed_by='check_pass', group='test')
+        self.assertIs(channel, self.channels[self.channel_id])
+        channel.play.assert_called_once()
+        channel.queue.assert_called_once()
+
+    def test_voice_limit_and_priorities(self):
+        """
+        Tests that with every channel busy, a lower or equal priority sound is dropped and a higher one cuts it off.
+        """
+        with patch('src.engine.audio.pygame.mixer.Channel', side_effect=self.fake_channel):
+            self.manager.play('door_knock_angry', PRIORITY_EVENT, group='test')
+            self.busy.add(self.channel_id)
+            dropped = self.manager.dropped
+            self.assertIsNone(self.manager.play('check_roll', PRIORITY_AMBIENT, group='test'))
+            self.assertIsNone(self.manager.play('check_roll', PRIORITY_EVENT, group='test'))
+            self.assertEqual(self.manager.dropped, dropped + 2)
+            self.assertIsNotNone(self.manager.play('check_roll', PRIORITY_UI, group='test'))
+            self.assertEqual(self.manager.priorities[self.channel_id], PRIORITY_UI)
+
+if __name__ == '__main__':
+    unittest.main()
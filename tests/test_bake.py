@@ -0,0 +1,100 @@
+"""
+Test module for the `bake` module.
+
+Tests that the baked images and masks are identical to the ones loaded from the sources, that baking again only
+rebuilds the artifacts whose source changed, and that the asset registry falls back to the sources.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import shutil
+import tempfile
+from unittest.mock import patch
+import pygame
+from settings import BLUE
+from src.engine.bake import AssetBaker, mask_to_bytes, mask_from_bytes
+from src.engine.assets import AssetRegistry
+
+SOURCES = [
+    'images/items/coffee.png',
+    'images/backgrounds/room_collision.png',
+    'images/characters/player_hitbox.png',
+]
+
+
+class TestAssetBaker(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        self.temp = tempfile.TemporaryDirectory()
+        self.assets_dir = os.path.join(self.temp.name, 'assets')
+        for source in SOURCES:
+            os.makedirs(os.path.dirname(os.path.join(self.assets_dir, source)), exist_ok=True)
+            shutil.copy(os.path.join('assets', source), os.path.join(self.assets_dir, source))
+        self.bake_dir = os.path.join(self.temp.name, 'baked')
+        self.baker = AssetBaker(self.assets_dir, self.bake_dir)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def path(self, source):
+        return os.path.join(self.assets_dir, source)
+
+    def test_mask_bits_round_trip(self):
+        surface = pygame.image.load(self.path(SOURCES[1])).convert_alpha()
+        surface.set_colorkey(BLUE)
+        mask = pygame.mask.from_surface(surface)
+        unpacked = mask_from_bytes(mask_to_bytes(mask), mask.get_size())
+        self.assertEqual(unpacked.get_size(), mask.get_size())
+        self.assertEqual(unpacked.overlap_area(mask, (0, 0)), mask.count())
+        self.assertEqual(unpacked.count(), mask.count())
+
+    def test_build_is_incremental(self):
+        self.assertEqual(self.baker.build(), 6)  # 3 images, the scaled icon and 2 masks
+        self.assertEqual(AssetBaker(self.assets_dir, self.bake_dir).build(), 0)
+        os.utime(self.path(SOURCES[0]))  # Touched, same content
+        self.assertEqual(AssetBaker(self.assets_dir, self.bake_dir).build(), 0)
+        shutil.copy('assets/images/items/books.png', self.path(SOURCES[0]))
+        self.assertEqual(AssetBaker(self.assets_dir, self.bake_dir).build(), 2)
+
+    def test_removed_sources_are_forgotten(self):
+        self.baker.build()
+        os.remove(self.path(SOURCES[2]))
+        self.baker.build()
+        self.assertEqual(len(self.baker.entries), 4)  # The image and the mask of the hitbox are removed
+        self.assertEqual(len(os.listdir(self.bake_dir)), 5)  # And the manifest
+
+    def test_baked_icon_is_scaled(self):
+        self.baker.build()
+        icon = self.baker.image(self.path(SOURCES[0]), (32, 32))
+        self.assertEqual(icon.get_size(), (32, 32))
+        self.assertIsNone(self.baker.image(self.path(SOURCES[0]), (64, 64)))
+
+    def test_changed_source_is_not_used(self):
+        self.baker.build()
+        shutil.copy('assets/images/items/books.png', self.path(SOURCES[0]))
+        baker = AssetBaker(self.assets_dir, self.bake_dir)
+        self.assertIsNone(baker.image(self.path(SOURCES[0])))
+        self.assertEqual(baker.misses, 1)
+
+    def test_registry_prefers_baked_artifacts(self):
+        self.baker.build()
+        registry = AssetRegistry()
+        with patch('src.engine.assets.baked_assets', self.baker), \
+             patch('src.engine.assets.pygame.image.load', wraps=pygame.image.load) as load:
+            icon = registry.image(self.path(SOURCES[0]), size=(32, 32), colorkey=BLUE)
+            mask = registry.mask(self.path(SOURCES[1]), colorkey=BLUE)
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(icon.get_colorkey()[:3], BLUE)
+        source = pygame.transform.scale(pygame.image.load(self.path(SOURCES[0])).convert_alpha(), (32, 32))
+        source.set_colorkey(BLUE)
+        self.assertEqual(pygame.image.tobytes(icon, "RGBA"), pygame.image.tobytes(source, "RGBA"))
+        self.assertEqual(mask.get_size(), pygame.image.load(self.path(SOURCES[1])).get_size())
+        self.assertEqual(self.baker.hits, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Test module for the `bench_engine` benchmarks.
+
+Tests that a case is timed in rounds, that the results files are checked when read, and that the comparison with a
+baseline flags the cases slower than the threshold.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import json
+import unittest
+import tempfile
+from bench_engine import measure, compare, load_results
+
+
+def results(**medians):
+    return {"results": {name: {"median_ms": ms} for name, ms in medians.items()}}
+
+
+class TestBenchEngine(unittest.TestCase):
+
+    def test_measure(self):
+        calls = []
+        timings = measure(lambda: calls.append(None), repeat=3, round_seconds=0.001)
+        self.assertEqual(timings["rounds"], 3)
+        self.assertEqual(len(calls), 1 + 3 * timings["number"])
+        self.assertLessEqual(timings["min_ms"], timings["median_ms"])
+        self.assertLessEqual(timings["median_ms"], timings["max_ms"])
+
+    def test_compare_flags_regressions(self):
+        baseline = results(draw=10.0, wrap=1.0, removed=1.0)
+        lines, regressions = compare(results(draw=10.5, wrap=1.5, added=1.0), baseline, threshold=10)
+        self.assertEqual(len(lines), 2)  # The cases found in both
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("wrap"))
+        self.assertIn("+50.0%", regressions[0])
+
+    def test_compare_faster(self):
+        lines, regressions = compare(results(draw=5.0), results(draw=10.0))
+        self.assertEqual(regressions, [])
+        self.assertIn("-50.0%", lines[0])
+
+    def test_load_results(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "results.json")
+            with self.assertRaisesRegex(ValueError, "cannot read"):
+                load_results(path)
+            for content in ("{", json.dumps({"results": {"draw": {}}})):
+                with open(path, 'w', encoding='utf8') as file:
+                    file.write(content)
+                with self.assertRaises(ValueError):
+                    load_results(path)
+            with open(path, 'w', encoding='utf8') as file:
+                json.dump(results(draw=10.0), file)
+            self.assertEqual(load_results(path), results(draw=10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Test module for the `dialogue_analysis` module.
+
+Checks the skill allocations of the character creation, the conversion of dialogue graphs into arrays and
+the statistics of the Monte Carlo simulation on small graphs whose outcome is known.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.engine.script_bundle import compile_script
+from src.engine.dialogue_analysis import skill_allocations, compile_arrays, analyse_script
+
+
+def make_graph(difficulty_class: int, fail_health: int = -1) -> dict:
+    """Builds a small dialogue: a choice between a skill check and leaving, then pass or fail nodes."""
+    return compile_script([
+        {'title': 'Start'},
+        {'title': 'Start1', 'body': 'Hi', 'key': {'1': 'DoorCheck', '2': 'End'}},
+        {'title': 'DoorCheck', 'check_skill': 'Forbearance', 'difficulty_class': difficulty_class},
+        {'title': 'DoorPass', 'body': 'Open', 'key': {'1': 'End'}},
+        {'title': 'DoorFail', 'body': 'Ouch', 'key': {'1': 'End'}, 'health': fail_health},
+        {'title': 'End', 'body': ''},
+        {'title': 'Start2', 'body': 'Again', 'key': {'1': 'End'}}
+    ])
+
+
+class TestSkillAllocations(unittest.TestCase):
+
+    def test_allocations_spend_all_points(self):
+        """
+        Tests that every allocation spends exactly the points, and that all of them are listed.
+        """
+        allocations = skill_allocations(8)
+        self.assertTrue(np.all(allocations.sum(axis=1) == 8))
+        self.assertEqual(len(allocations), 165)  # Compositions of 8 into 4 non-negative parts
+
+    def test_allocations_with_unspent_points(self):
+        allocations = skill_allocations(2, spend_all=False)
+        self.assertEqual(len(allocations), 15)
+        self.assertTrue(np.all(allocations.sum(axis=1) <= 2))
+
+
+class TestCompileArrays(unittest.TestCase):
+
+    def test_compile_arrays(self):
+        """
+        Tests that choices, checks, stat changes and the starting node are converted correctly.
+        """
+        arrays = compile_arrays(make_graph(10), condition=2)
+        titles = arrays['titles']
+        self.assertEqual(arrays['start'], titles.index('Start2'))
+        check = titles.index('DoorCheck')
+        self.assertEqual(arrays['check_skill'][check], 2)  # Forbearance
+        self.assertEqual(arrays['check_dc'][check], 10)
+        self.assertEqual(arrays['pass_target'][check], titles.index('DoorPass'))
+        self.assertEqual(arrays['fail_target'][check], titles.index('DoorFail'))
+        self.assertEqual(arrays['choice_count'][titles.index('Start1')], 2)
+        self.assertEqual(arrays['health_delta'][titles.index('DoorFail')], -1)
+        self.assertEqual(arrays['choice_count'][titles.index('End')], 0)
+
+
+class TestAnalyseScript(unittest.TestCase):
+
+    def rows(self, report):
+        return {row['title']: row for row in report['nodes']}
+
+    def test_easy_check_always_passes(self):
+        """
+        Tests reach probabilities when the check can't fail: half the runs choose the check, and all of them pass.
+        """
+        report = analyse_script(make_graph(1), runs=20_000, seed=0)
+        rows = self.rows(report)
+        self.assertEqual(rows['Start1']['reach'], 1.0)
+        self.assertAlmostEqual(rows['DoorCheck']['reach'], 0.5, delta=0.02)
+        self.assertEqual(rows['DoorPass']['reach'], rows['DoorCheck']['reach'])
+        self.assertEqual(rows['DoorFail']['reach'], 0.0)
+        self.assertEqual(rows['End']['reach'], 1.0)
+        self.assertEqual(report['death_rate'], 0.0)
+
+    def test_failed_check_kills(self):
+        """
+        Tests death rates and health deltas when failing the check always kills the player.
+        """
+        report = analyse_script(make_graph(100, fail_health=-10), runs=20_000, seed=0)
+        rows = self.rows(report)
+        self.assertEqual(rows['DoorPass']['reach'], 0.0)
+        self.assertEqual(rows['DoorFail']['death_rate'], 1.0)
+        self.assertAlmostEqual(report['death_rate'], rows['DoorFail']['reach'])
+        self.assertAlmostEqual(rows['End']['reach'], 1.0 - report['death_rate'])
+
+    def test_health_delta_is_applied_when_leaving_node(self):
+        """
+        Tests that the health change of a node shows up in the nodes reached after it.
+        """
+        report = analyse_script(make_graph(100, fail_health=-1), runs=20_000, seed=0)
+        rows = self.rows(report)
+        self.assertEqual(rows['DoorFail']['health'], 0.0)
+        self.assertAlmostEqual(rows['End']['health'], -rows['DoorFail']['reach'], places=6)
+
+    def test_seed_is_reproducible_across_workers(self):
+        """
+        Tests that the same seed gives the same report, whether the batches run in one or several processes.
+        """
+        graph = make_graph(12)
+        report = analyse_script(graph, runs=20_000, seed=3, batch_size=5_000)
+        parallel_report = analyse_script(graph, runs=20_000, seed=3, batch_size=5_000, workers=2)
+        self.assertEqual(report, parallel_report)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Test module for the `events` module.
+
+Tests that the `EventBus` calls the synchronous subscribers when an event is published, delivers the queued
+ones on `flush`, and that the inventory and the player publish their changes.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from types import SimpleNamespace
+import pygame
+from src.engine.events import EventBus, event_bus, GameEvent, ConditionChanged, InventoryChanged, StatChanged
+from src.ui.inventory import Inventory
+from src.characters.player import Player
+
+
+class TestEventBus(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.received = []
+
+    def test_sync_and_queued_delivery(self):
+        self.bus.subscribe(ConditionChanged, lambda event: self.received.append(('sync', event)))
+        self.bus.subscribe(ConditionChanged, lambda event: self.received.append(('queued', event)), queued=True)
+        event = ConditionChanged('floor_1', 'bookshelf', 1, 2)
+        self.bus.publish(event)
+        self.assertEqual(self.received, [('sync', event)])
+        self.assertEqual(self.bus.flush(), 1)
+        self.assertEqual(self.received, [('sync', event), ('queued', event)])
+        self.assertEqual(self.bus.flush(), 0)
+
+    def test_base_class_receives_every_event(self):
+        self.bus.subscribe(GameEvent, self.received.append)
+        self.bus.subscribe(StatChanged, self.received.append)
+        self.bus.publish(InventoryChanged(SimpleNamespace(name='books'), True))
+        self.bus.publish(StatChanged('health', 4, 3))
+        self.assertEqual(len(self.received), 3)
+        self.assertEqual(self.bus.published, {'InventoryChanged': 1, 'StatChanged': 1})
+
+    def test_unsubscribe(self):
+        self.bus.subscribe(InventoryChanged, self.received.append)
+        self.bus.unsubscribe(InventoryChanged, self.received.append)
+        self.bus.publish(InventoryChanged(SimpleNamespace(name='books'), True))
+        self.assertEqual(self.received, [])
+
+    def test_events_published_while_flushing_are_delivered(self):
+        def republish(event):
+            if event.new < 3:
+                self.bus.publish(StatChanged('health', event.new, event.new + 1))
+        self.bus.subscribe(StatChanged, republish, queued=True)
+        self.bus.publish(StatChanged('health', 0, 1))
+        self.assertEqual(self.bus.flush(), 3)
+
+
+class TestPublishers(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        event_bus.subscribe(GameEvent, self.received.append)
+
+    def tearDown(self):
+        event_bus.unsubscribe(GameEvent, self.received.append)
+
+    def test_inventory_publishes_changes(self):
+        inventory = Inventory()
+        books, coffee = SimpleNamespace(name='books'), SimpleNamespace(name='coffee')
+        inventory.add_item(books)
+        inventory.add_item(books)  # Already in the inventory, nothing changes
+        inventory.add_item(coffee)
+        inventory.clear_inventory()
+        self.assertEqual(self.received, [InventoryChanged(books, True), InventoryChanged(coffee, True),
+                                         InventoryChanged(books, False), InventoryChanged(coffee, False)])
+
+    def test_player_publishes_stat_changes(self):
+        pygame.init()
+        player = Player(pygame.display.set_mode((800, 600)))
+        health = player.health
+        player.health -= 1
+        player.health = player.health  # Unchanged
+        player.health = health
+        self.assertEqual(self.received, [StatChanged('health', health, health - 1), StatChanged('health', health - 1, health)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test module for the `gc_scheduler` module.
+
+Tests that the automatic collections are disabled while the scheduler runs, that the due collection only runs
+when it fits in the idle time unless it is overdue, and that freezing collects then freezes the survivors.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gc
+import time
+import unittest
+from src.engine.gc_scheduler import GCScheduler
+
+
+class TestGCScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.thresholds = gc.get_threshold()
+        self.scheduler = GCScheduler(frame_ms=10, force_factor=3)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        gc.set_threshold(*self.thresholds)
+        gc.unfreeze()
+        gc.enable()
+
+    def allocate(self, count):
+        return [[] for _ in range(count)]
+
+    def test_start_and_stop(self):
+        self.scheduler.start()
+        self.assertFalse(gc.isenabled())
+        self.assertTrue(self.scheduler.freeze_pending)
+        self.scheduler.stop()
+        self.assertTrue(gc.isenabled())
+
+    def test_freeze_after_loading(self):
+        self.scheduler.start()
+        self.scheduler.begin_frame()
+        self.assertEqual(self.scheduler.idle(), -1)
+        self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertFalse(self.scheduler.freeze_pending)
+        self.scheduler.request_freeze(None)  # As an event callback
+        self.assertTrue(self.scheduler.freeze_pending)
+
+    def test_collects_when_idle(self):
+        self.scheduler.start()
+        self.scheduler.freeze()
+        gc.set_threshold(100, 10, 10)
+        kept = self.allocate(150)
+        self.assertEqual(self.scheduler.due_generation(), 0)
+        self.scheduler.begin_frame()
+        self.assertEqual(self.scheduler.idle(), 0)
+        self.assertEqual(self.scheduler.collections[0], 1)
+        self.assertIsNone(self.scheduler.due_generation())
+        self.assertEqual(len(kept), 150)
+
+    def test_waits_for_idle_time_unless_overdue(self):
+        self.scheduler.start()
+        self.scheduler.freeze()
+        gc.set_threshold(100, 10, 10)
+        self.scheduler.costs[0] = 5.0
+        kept = self.allocate(150)
+        self.scheduler.frame_start = time.perf_counter() - 0.008  # 2 ms left in the frame
+        self.assertIsNone(self.scheduler.idle())
+        kept += self.allocate(200)  # 3 times the threshold
+        self.assertEqual(self.scheduler.idle(), 0)
+        self.assertEqual(self.scheduler.forced, 1)
+
+    def test_stopped_scheduler_does_nothing(self):
+        self.scheduler.begin_frame()
+        self.assertIsNone(self.scheduler.idle())
+        self.assertTrue(gc.isenabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
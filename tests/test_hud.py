@@ -0,0 +1,73 @@
+"""
+Test module for the `hud` module.
+
+Tests that the HUD only renders the stats and the hotbar again after the player's stats or inventory change.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import pygame
+from src.ui.hud import HUD
+from src.engine.events import event_bus, StatChanged, InventoryChanged
+
+
+class FakeInventory:
+    def __init__(self):
+        self.items = []
+
+
+class FakePlayer:
+    def __init__(self):
+        self.health = 4
+        self.reason = 3
+        self.inventory = FakeInventory()
+
+
+class TestHUD(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.hud = HUD()
+        self.player = FakePlayer()
+
+    def tearDown(self):
+        event_bus.unsubscribe(StatChanged, self.hud.stat_changed)
+        event_bus.unsubscribe(InventoryChanged, self.hud.inventory_changed)
+
+    def test_still_frames_do_not_render(self):
+        for _ in range(3):
+            self.hud.draw(self.screen, self.player)
+        self.assertEqual(self.hud.loads, 1)
+        self.assertEqual(self.hud.renders, {"stats": 1, "inventory": 1})
+
+    def test_stat_change_renders_stats(self):
+        self.hud.draw(self.screen, self.player)
+        self.player.health = 3
+        event_bus.publish(StatChanged("health", 4, 3))
+        self.hud.draw(self.screen, self.player)
+        self.assertEqual(self.hud.renders, {"stats": 2, "inventory": 1})
+
+    def test_inventory_change_renders_hotbar(self):
+        self.hud.draw(self.screen, self.player)
+        item = type("Item", (), {"image": pygame.Surface((32, 32))})()
+        self.player.inventory.items.append(item)
+        event_bus.publish(InventoryChanged(item, True))
+        self.hud.draw(self.screen, self.player)
+        self.assertEqual(self.hud.renders, {"stats": 1, "inventory": 2})
+        self.assertEqual(self.hud.hotbar_surface.get_size(), self.hud.hotbar.get_size())
+
+    def test_reloads_after_quit(self):
+        self.hud.draw(self.screen, self.player)
+        pygame.quit()
+        self.assertIsNone(self.hud.font)
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.hud.draw(self.screen, self.player)
+        self.assertEqual(self.hud.loads, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
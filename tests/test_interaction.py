@@ -11,44 +11,39 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import unittest
-from unittest.mock import patch, mock_open, MagicMock
-import os
+from unittest.mock import patch, MagicMock
 import pygame
-from src.ui.interaction import load_scene_interactions, get_key_to_node, DialogueManager
+from src.ui.interaction import load_scene_interactions, get_key_to_node, DialogueManager, DialogueBox
 
 
 class TestLoadSceneInteractions(unittest.TestCase):
     """
     Unit test class for the `load_scene_interactions` function in the `interaction` module.
 
-    Tests the loading and processing of interaction data from JSON files using mocking to 
-    simulate file operations and external dependencies.
+    Tests the creation of dialogue managers from the compiled script bundle, using mocking to 
+    simulate the bundle and external dependencies.
     """
 
-    @patch('src.ui.interaction.os.listdir')
-    @patch('src.ui.interaction.open', new_callable=mock_open)
-    @patch('src.ui.interaction.json.load')
+    @patch('src.ui.interaction.script_bundle')
     @patch('src.ui.interaction.DialogueManager')
-    def test_load_scene_interactions(self, mock_dialogue_manager, mock_json_load, mock_open, mock_listdir):
+    def test_load_scene_interactions(self, mock_dialogue_manager, mock_script_bundle):
         """
         Test for the `load_scene_interactions` function.
 
-        Mocks file operations to simulate reading multiple JSON interaction files. 
-        Verifies the correct loading of interactions, including file opening and JSON parsing.
+        Mocks the script bundle to simulate a scene with two compiled interaction scripts.
+        Verifies that one dialogue manager is created per script, with the compiled graph.
 
         Assertions:
             - Verifies the number of interactions loaded.
             - Checks that the correct interaction keys are present in the result.
-            - Ensures the function interacts with file reading and JSON loading correctly.
+            - Ensures the scene graphs are requested from the bundle once.
         """
         # Setup
         scripts_path = 'fake_path'
         screen = MagicMock(spec=pygame.Surface)
-        mock_listdir.return_value = ['interaction1.json', 'interaction2.json']
-        mock_json_load.side_effect = [
-            {'title': 'Start', 'body': 'Hello'},
-            {'title': 'End', 'body': 'Goodbye'}
-        ]
+        graph1 = {'nodes': [{'title': 'Start', 'body': 'Hello'}], 'key_to_node': {}, 'node_index': {}}
+        graph2 = {'nodes': [{'title': 'End', 'body': 'Goodbye'}], 'key_to_node': {}, 'node_index': {}}
+        mock_script_bundle.get_scene.return_value = {'interaction1': graph1, 'interaction2': graph2}
 
         # Execute
         result = load_scene_interactions(scripts_path, screen)
@@ -57,10 +52,8 @@ class TestLoadSceneInteractions(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertIn('interaction1', result)
         self.assertIn('interaction2', result)
-        mock_listdir.assert_called_once_with(scripts_path)
-        mock_open.assert_any_call(os.path.join(scripts_path, 'interaction1.json'), 'r', encoding='utf8')
-        mock_open.assert_any_call(os.path.join(scripts_path, 'interaction2.json'), 'r', encoding='utf8')
-        self.assertEqual(mock_json_load.call_count, 2)
+        mock_script_bundle.get_scene.assert_called_once_with(scripts_path)
+        mock_dialogue_manager.assert_any_call(screen, graph1['nodes'], graph1['key_to_node'], graph1['node_index'])
         self.assertEqual(mock_dialogue_manager.call_count, 2)
       
         
@@ -199,5 +192,78 @@ class TestDialogueManager(unittest.TestCase):
         self.assertIsNotNone(node)
         self.assertEqual(node['title'], 'End')
 
+
+class TestDialogueBoxPool(unittest.TestCase):
+    """
+    Test suite for the dialogue box shared by the `DialogueManager`s of a screen.
+    """
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((800, 600))
+        self.dialogue_data = [{'title': 'Start', 'body': 'Hello'}, {'title': 'End', 'body': 'Goodbye'}]
+
+    def test_managers_share_dialogue_box(self):
+        """
+        Tests that every manager drawing on the same screen uses one dialogue box, and another screen gets its own.
+        """
+        manager1 = DialogueManager(self.screen, self.dialogue_data, {})
+        manager2 = DialogueManager(self.screen, self.dialogue_data, {})
+        other_manager = DialogueManager(pygame.Surface((800, 600)), self.dialogue_data, {})
+        self.assertIs(manager1.dialogue_box, manager2.dialogue_box)
+        self.assertIsNot(manager1.dialogue_box, other_manager.dialogue_box)
+
+    def test_bind_restarts_text(self):
+        """
+        Tests that binding the box to another manager restarts the text animation, but binding the same one does not.
+        """
+        manager1 = DialogueManager(self.screen, self.dialogue_data, {})
+        manager2 = DialogueManager(self.screen, self.dialogue_data, {})
+        box = manager1.dialogue_box
+        box.bind(manager1)
+        box.rendered_done = True
+        box.new_text = False
+        box.bind(manager1)
+        self.assertTrue(box.rendered_done)
+        box.bind(manager2)
+        self.assertIs(box.owner, manager2)
+        self.assertFalse(box.rendered_done)
+        self.assertTrue(box.new_text)
+
+    def test_revealed_lines_rendered_once(self):
+        """
+        Tests that the lines fully revealed are rendered once and drawn straight on the screen, and that new text
+        renders them again.
+        """
+        box = DialogueManager(self.screen, self.dialogue_data, {}).dialogue_box
+        box.set_text("Hello there")
+        box.new_text = False
+        box.current_time = pygame.time.get_ticks() - 10_000  # The whole text is revealed
+        box.render_text()
+        self.assertTrue(box.rendered_done)
+        self.assertEqual(list(box.line_surfaces), [0])
+        font = box.font
+        box.font = MagicMock(wraps=font)
+        box.render_text()
+        box.font.render.assert_not_called()
+        box.font = font
+        box.set_text("Goodbye")
+        self.assertEqual(box.line_surfaces, {})
+
+    def test_pool_emptied_on_quit(self):
+        """
+        Tests that quitting pygame forgets the pooled boxes, and that after initializing it again a screen gets a
+        new box whose font works.
+        """
+        old_box = DialogueBox.for_screen(self.screen)
+        pygame.quit()
+        self.assertEqual(DialogueBox._pool, {})
+        pygame.init()
+        screen = pygame.Surface((800, 600))
+        box = DialogueBox.for_screen(screen)
+        self.assertIsNot(box, old_box)
+        self.assertEqual(box.wrap_text("Hello there"), ["Hello there"])
+        self.assertIs(DialogueBox.for_screen(screen), box)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
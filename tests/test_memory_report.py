@@ -0,0 +1,114 @@
+"""
+Test module for the `memory_report` module.
+
+Tests that the surfaces, masks and sounds reachable from the roots are recorded once with their owner and
+subsystem, that the snapshots are totalled and diffed by owner, and that the tracker diffs them at every change
+of scene.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import unittest
+import pygame
+from src.engine.memory_report import take_memory_snapshot, MemoryTracker, subsystem_of, describe
+from src.engine.events import event_bus, SceneChanged
+from src.ui.animated_sequence import Video
+from src.ui.profiler_overlay import ProfilerOverlay
+
+
+class TestMemoryReport(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.video = Video(None, 0, 0, 'assets/ui/Check')
+        self.video.frames = [pygame.Surface((10, 10), pygame.SRCALPHA), pygame.Surface((20, 10))]
+
+    def test_items_have_their_owner(self):
+        snapshot = take_memory_snapshot([{"videos": [self.video]}])
+        self.assertEqual(len(snapshot.items), 2)
+        item = snapshot.items[0]
+        self.assertEqual(item.owner, "Video(assets/ui/Check).frames")
+        self.assertEqual(item.subsystem, "videos")
+        self.assertEqual(item.size, (10, 10))
+        self.assertEqual(item.format, "32 bit alpha")
+        self.assertEqual(snapshot.by_subsystem(), {"videos": (2, snapshot.nbytes)})
+
+    def test_subsurfaces_share_their_parent(self):
+        parent = self.video.frames[1]
+        snapshot = take_memory_snapshot([[parent.subsurface((0, 0, 5, 5))]])
+        self.assertEqual(snapshot.items[0].nbytes, 0)
+        self.assertIn("subsurface", snapshot.items[0].format)
+
+    def test_masks_and_objects_recorded_once(self):
+        mask = pygame.mask.Mask((16, 16))
+        self.video.mask = mask
+        shared = [self.video.frames[0], mask]
+        snapshot = take_memory_snapshot([self.video, shared])
+        self.assertEqual([item.kind for item in snapshot.items].count("mask"), 1)
+        self.assertEqual(len(snapshot.items), 3)
+        self.assertTrue(all(item.owner.startswith("Video") for item in snapshot.items))
+
+    def test_later_roots_own_what_earlier_roots_do_not_reach(self):
+        cache = [pygame.Surface((4, 4))]
+        self.video.cache = cache  # The first root references the second one
+        snapshot = take_memory_snapshot([self.video, cache])
+        self.assertEqual(snapshot.items[-1].owner, "list")
+
+    def test_diff_by_owner(self):
+        before = take_memory_snapshot([self.video])
+        self.video.frames.append(pygame.Surface((30, 30)))
+        diff = take_memory_snapshot([self.video]).diff(before)
+        self.assertIn("Video(assets/ui/Check).frames", diff)
+        self.assertIn("+1", diff)
+        self.assertIn("videos", diff)
+
+    def test_report(self):
+        report = take_memory_snapshot([self.video]).report()
+        self.assertIn("2 surfaces, 0 masks, 0 sounds", report)
+        self.assertIn("10x10 32 bit alpha", report)
+
+    def test_subsystem_and_label(self):
+        self.assertEqual(subsystem_of(None), "other")
+        self.assertEqual(subsystem_of(self.video), "videos")
+        self.assertEqual(describe(self.video), "Video(assets/ui/Check)")
+
+    def test_tracker_diffs_changes_of_scene(self):
+        out = io.StringIO()
+        tracker = MemoryTracker(lambda: take_memory_snapshot([self.video]), out)
+        tracker.start()
+        try:
+            self.video.frames.append(pygame.Surface((30, 30)))
+            event_bus.publish(SceneChanged("floor_1", "floor_0"))
+            event_bus.flush()
+            self.assertEqual(tracker.diffs, [])  # Diffed once the frame is over
+            tracker.end_frame()
+            tracker.end_frame()
+        finally:
+            tracker.stop()
+        self.assertEqual(len(tracker.diffs), 1)
+        self.assertEqual(tracker.diffs[0][:2], ("floor_1", "floor_0"))
+        self.assertIn("memory after floor_1 -> floor_0", out.getvalue())
+        self.assertIn("3 surfaces", out.getvalue())
+
+    def test_items_found_while_surface_is_rebound(self):
+        surface_class = pygame.Surface
+        pygame.Surface = type("OtherSurface", (surface_class,), {})
+        try:
+            snapshot = take_memory_snapshot([self.video])
+        finally:
+            pygame.Surface = surface_class
+        self.assertEqual(len(snapshot.items), 2)
+
+    def test_overlay_rows(self):
+        overlay = ProfilerOverlay()
+        overlay.memory = take_memory_snapshot([self.video])
+        rows = overlay.rows()
+        self.assertTrue(rows[-2][0].startswith("memory"))
+        self.assertEqual(rows[-1][0].strip(), "videos")
+        self.assertEqual(rows[-1][2], "2")
+
+
+if __name__ == '__main__':
+    unittest.main()
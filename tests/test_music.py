@@ -0,0 +1,149 @@
+"""
+Test module for the `music` module.
+
+Tests that the `MusicManager` follows the game states, crossfades between its two channels,
+starts a track once its background decode completes, keeps a bounded number of tracks decoded, and recovers
+from a track that cannot be decoded.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import threading
+from unittest.mock import patch, MagicMock
+import pygame
+from src.engine.assets import assets
+from src.engine.music import MusicManager
+
+
+class TestMusicManager(unittest.TestCase):
+
+    def setUp(self):
+        pygame.mixer.init()
+        self.music = MusicManager()
+        self.saved = self.music.sounds, self.music.current, self.music.pending, self.music.paused
+        self.music.sounds, self.music.current, self.music.pending, self.music.paused = {}, None, None, False
+        assets.clear()  # Decode the tracks again instead of sharing the ones loaded by other tests
+        self.channels = {}
+        channel_patcher = patch('src.engine.music.pygame.mixer.Channel', side_effect=self.fake_channel)
+        sound_patcher = patch('src.engine.music.pygame.mixer.Sound', side_effect=lambda path: MagicMock(name=path))
+        channel_patcher.start()
+        self.mock_sound = sound_patcher.start()
+        self.addCleanup(channel_patcher.stop)
+        self.addCleanup(sound_patcher.stop)
+
+    def tearDown(self):
+        for thread in list(self.music.loading.values()):
+            thread.join()
+        self.music.sounds, self.music.current, self.music.pending, self.music.paused = self.saved
+        assets.clear()  # Forget the mocked tracks
+
+    def fake_channel(self, channel_id):
+        """Returns the same mocked channel for every id."""
+        return self.channels.setdefault(channel_id, MagicMock())
+
+    def wait_for_decodes(self):
+        for thread in list(self.music.loading.values()):
+            thread.join()
+
+    def test_singleton_pattern(self):
+        self.assertIs(MusicManager(), self.music)
+
+    def test_play_starts_after_decode(self):
+        """
+        Tests that playing a track that is not decoded returns at once and starts it from the loader thread.
+        """
+        self.music.play('main')
+        self.wait_for_decodes()
+        self.assertEqual(self.music.current, 'main')
+        self.assertIsNone(self.music.pending)
+        channel = self.channels[self.music.channel_ids[self.music.active]]
+        channel.play.assert_called_once_with(self.music.sounds['main'], loops=-1, fade_ms=self.music.fade_ms)
+
+    def test_crossfade_uses_other_channel(self):
+        self.music.play('main')
+        self.wait_for_decodes()
+        first = self.music.channel_ids[self.music.active]
+        self.music.play('hotel')
+        self.wait_for_decodes()
+        second = self.music.channel_ids[self.music.active]
+        self.assertNotEqual(first, second)
+        self.channels[first].fadeout.assert_called_once_with(self.music.fade_ms)
+        self.channels[second].play.assert_called_once()
+
+    def test_replaying_current_track_does_nothing(self):
+        self.music.play('main')
+        self.wait_for_decodes()
+        self.music.play('main')
+        self.assertEqual(self.mock_sound.call_count, 1)
+        self.assertEqual(sum(channel.play.call_count for channel in self.channels.values()), 1)
+
+    def test_current_track_kept_while_other_decodes(self):
+        """
+        Tests that asking for the track playing while another one is decoded keeps it playing, without restarting
+        it, and that the other one does not start once decoded.
+        """
+        self.music.play('main')
+        self.wait_for_decodes()
+        decoding = threading.Event()
+        sound = assets.sound
+
+        def slow_sound(*args, **kwargs):
+            decoding.wait(5)
+            return sound(*args, **kwargs)
+
+        with patch('src.engine.music.assets.sound', side_effect=slow_sound):
+            self.music.play('hotel')
+            self.music.play('main')
+            self.assertIsNone(self.music.pending)
+            decoding.set()
+            self.wait_for_decodes()
+        self.assertEqual(self.music.current, 'main')
+        self.assertEqual(sum(channel.play.call_count for channel in self.channels.values()), 1)
+
+    def test_change_state(self):
+        """
+        Tests that the states pick their track, prefetch the next one, and that the pause menu pauses the music.
+        """
+        self.music.change_state('main')
+        self.wait_for_decodes()
+        self.assertEqual(self.music.current, 'main')
+        self.assertIn('new_game', self.music.sounds)  # Prefetched
+
+        self.music.change_state('game')
+        self.music.change_state('pause')
+        self.assertTrue(self.music.paused)
+        self.music.change_state('options')
+        self.assertTrue(self.music.paused)
+        self.music.change_state('pause')
+        self.music.change_state('game')
+        self.assertFalse(self.music.paused)
+
+    def test_decoded_tracks_are_bounded(self):
+        for name in ['main', 'new_game', 'hotel', 'credits']:
+            self.music.play(name)
+            self.wait_for_decodes()
+        self.assertLessEqual(len(self.music.sounds), self.music.max_resident + 1)
+        self.assertIn('credits', self.music.sounds)
+        self.assertNotIn('main', self.music.sounds)
+
+    def test_decode_failure_is_not_pending(self):
+        """
+        Tests that a track failing to decode is forgotten, so that it can be requested again.
+        """
+        with patch('src.engine.music.assets.sound', side_effect=pygame.error("corrupt file")):
+            with self.assertLogs('src.engine.music', level='ERROR'):
+                self.music.play('credits')
+                self.wait_for_decodes()
+        self.assertNotIn('credits', self.music.loading)
+        self.assertNotIn('credits', self.music.sounds)
+        self.assertIsNone(self.music.pending)
+        self.assertIsNone(self.music.current)
+
+        self.music.play('credits')
+        self.wait_for_decodes()
+        self.assertEqual(self.music.current, 'credits')
+
+if __name__ == '__main__':
+    unittest.main()
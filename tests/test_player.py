@@ -71,12 +71,12 @@ class TestPlayer(unittest.TestCase):
         self.player.set_skills(new_skills)
         self.assertEqual(self.player.get_skills(), new_skills)
     
-    @patch('numpy.random.randint')
+    @patch('src.engine.rng.RandomStream.d20')
     def test_roll_skill_check(self, mock_randint):
         """Tests the `roll_skill_check` method of the Player class.
 
         Args:
-            mock_randint: Mock for the `numpy.random.randint` function to control the random result.
+            mock_randint: Mock for the `RandomStream.d20` method to control the random result.
 
         Asserts:
             - The skill check passes when the random roll plus the skill level exceeds the difficulty.
@@ -0,0 +1,76 @@
+"""
+Test module for the `preloader` module.
+
+Tests that the groups are decoded on the workers and converted on the main thread within the frame budget,
+that `wait` finishes a group right away, and that the progress follows the steps done.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import threading
+from concurrent.futures import wait
+import pygame
+from src.engine.preloader import Preloader, PreloadGroup, video_steps, PRELOADED
+from src.engine.assets import assets
+from src.ui.animated_sequence import Video
+
+
+class TestPreloader(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        assets.clear()
+        self.threads = []
+        self.converts = []
+        decode = lambda: self.threads.append(threading.current_thread().name)
+        self.preloader = Preloader([
+            PreloadGroup("first", [decode, decode], [lambda: self.converts.append("first")]),
+            PreloadGroup("second", [decode], [lambda: self.converts.append("second")] * 3),
+        ])
+
+    def tearDown(self):
+        self.preloader.stop()
+        assets.clear()
+
+    def test_decode_on_workers_convert_on_update(self):
+        self.preloader.start()
+        wait(future for futures in self.preloader.futures.values() for future in futures)
+        self.assertTrue(all(name.startswith("preload") for name in self.threads))
+        self.assertEqual(self.converts, [])
+        self.assertTrue(pygame.event.get(PRELOADED))
+        self.preloader.update()
+        self.assertEqual(self.converts, ["first", "second", "second", "second"])
+        self.assertTrue(self.preloader.ready("second"))
+        self.assertEqual(self.preloader.progress(), 1.0)
+
+    def test_frame_budget(self):
+        self.preloader.frame_budget_ms = 0
+        self.preloader.start()
+        wait(future for futures in self.preloader.futures.values() for future in futures)
+        self.preloader.update()
+        self.assertEqual(self.converts, [])
+        self.assertFalse(self.preloader.ready("first"))
+
+    def test_wait_without_workers(self):
+        self.assertEqual(self.preloader.progress("second"), 0.0)
+        self.preloader.wait("second")
+        self.assertEqual(self.threads, [threading.current_thread().name])
+        self.assertTrue(self.preloader.ready("second"))
+        self.assertFalse(self.preloader.ready("first"))
+        self.assertEqual(self.preloader.progress("second"), 1.0)
+
+    def test_video_steps(self):
+        video = Video(self.screen, 0, 0, 'assets/ui/StatsBar')
+        preloader = Preloader([PreloadGroup("videos", *video_steps([video]))])
+        self.assertFalse(video.loaded)
+        preloader.wait("videos")
+        self.assertTrue(video.loaded)
+        self.assertEqual(len(video.sequence), len(video.paths))
+        self.assertEqual(assets.decoded, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
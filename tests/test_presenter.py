@@ -0,0 +1,55 @@
+"""
+Test module for the `presenter` module.
+
+Tests that the `FramePresenter` presents each frame once, and that in debug mode presenting the display
+from anywhere else raises a `StrayPresentError`.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import pygame
+from src.engine.presenter import FramePresenter, StrayPresentError
+from src.scenes.main_menu import MainMenu
+from src.scenes.pause_menu import PauseMenu
+
+
+class TestFramePresenter(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.presenter = FramePresenter(debug=True)
+
+    def tearDown(self):
+        self.presenter.uninstall_guard()
+
+    def test_present_counts(self):
+        self.presenter.present()
+        self.presenter.present([pygame.Rect(0, 0, 10, 10)])
+        self.assertEqual(self.presenter.presents, 2)
+        self.assertEqual(self.presenter.render_mode, "update")
+        self.assertEqual(self.presenter.updates, 2)
+
+    def test_stray_flip_raises_in_debug(self):
+        with self.assertRaises(StrayPresentError):
+            pygame.display.flip()
+        with self.assertRaises(StrayPresentError):
+            pygame.display.update()
+
+    def test_menus_do_not_present(self):
+        """
+        Tests that the menus only draw into the back buffer.
+        """
+        MainMenu(self.screen).draw()
+        PauseMenu(self.screen).draw()
+        self.assertEqual(self.presenter.presents, 0)
+
+    def test_uninstall_guard(self):
+        self.presenter.uninstall_guard()
+        pygame.display.flip()
+        self.assertFalse(self.presenter.guarded)
+
+if __name__ == '__main__':
+    unittest.main()
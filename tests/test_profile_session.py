@@ -0,0 +1,112 @@
+"""
+Test module for the `profile_session` module.
+
+Tests that the frames are profiled in a profile per activity, that the scene filter and the duration are
+respected, and that the sampled stacks are written in the collapsed format.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import pstats
+import signal
+import unittest
+import tempfile
+import pygame
+from src.engine.profile_session import create_session, ProfileSession, CProfileSession
+from src.engine.profiler import FrameProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfileSession(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.temp = tempfile.TemporaryDirectory()
+        self.context = {"activity": "main_menu", "scene": None}
+        self.profiler = FrameProfiler()
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def session(self, mode, **kwargs):
+        session = create_session(mode, self.temp.name, context=lambda: dict(self.context), **kwargs)
+        session.start()
+        self.profiler.watch(session)
+        return session
+
+    def frame(self, seconds=0.0):
+        self.profiler.begin_frame()
+        with self.profiler.section("update"):
+            busy(seconds)
+        self.profiler.end_frame()
+
+    def test_cprofile_by_activity(self):
+        session = self.session("cprofile")
+        self.frame()
+        self.context = {"activity": "world", "scene": "room_101"}
+        self.frame()
+        self.frame()
+        self.assertIsNone(sys.getprofile())  # Only the frames are profiled
+        paths = session.stop()
+        self.assertEqual(sorted(os.path.basename(path) for path in paths), ["main_menu.pstats", "world.pstats"])
+        self.assertEqual(session.frames, {"main_menu": 1, "world": 2})
+        functions = {name for _, _, name in pstats.Stats(os.path.join(self.temp.name, "world.pstats")).stats}
+        self.assertIn("busy", functions)
+
+    def test_no_draw_call_counting_under_cprofile(self):
+        self.profiler.count_every = 1
+        self.profiler.toggle()
+        self.session("cprofile")
+        self.frame()
+        self.assertEqual(self.profiler.counts, {"blits": 0, "renders": 0, "surfaces": 0})
+        self.assertEqual(len(self.profiler.frame_times), 1)
+
+    def test_scene_filter(self):
+        session = self.session("cprofile", scene="floor_1")
+        self.context = {"activity": "world", "scene": "room_101"}
+        self.frame()
+        self.context = {"activity": "dialogue", "scene": "floor_1"}
+        self.frame()
+        self.assertEqual(session.frames, {"dialogue": 1})
+
+    def test_duration_quits(self):
+        pygame.event.clear()
+        session = self.session("cprofile", seconds=0.01)
+        self.frame()
+        self.assertFalse(pygame.event.get(pygame.QUIT))
+        self.frame(0.02)
+        self.assertTrue(pygame.event.get(pygame.QUIT))
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "timer signals are only available on Unix")
+    def test_sample_collapsed_stacks(self):
+        session = self.session("sample")
+        self.frame(0.03)
+        paths = session.stop()
+        self.assertEqual([os.path.basename(path) for path in paths], ["main_menu.collapsed"])
+        with open(paths[0], encoding='utf8') as file:
+            lines = file.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any(line.rsplit(" ", 1)[0].endswith(":busy") for line in lines))
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            create_session("line")
+        self.assertIsInstance(create_session("cprofile"), CProfileSession)
+
+    def test_base_session_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ProfileSession(self.temp.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
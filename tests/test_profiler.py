@@ -0,0 +1,103 @@
+"""
+Test module for the `profiler` module and the profiler overlay.
+
+Tests that the sections are timed only while the profiler is enabled, that the statistics follow the window,
+that the counted frames count the blits, renders and surfaces without changing pygame, and that the overlay draws.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import pygame
+from src.engine.profiler import FrameProfiler, percentile
+from src.ui.profiler_overlay import ProfilerOverlay
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.profiler = FrameProfiler(window=4, count_every=1000)
+
+    def tearDown(self):
+        self.profiler.stop_counting()
+
+    def frame(self, *names):
+        self.profiler.begin_frame()
+        for name in names:
+            with self.profiler.section(name):
+                pass
+        self.profiler.end_frame()
+
+    def test_disabled_profiler_records_nothing(self):
+        self.frame("update")
+        self.assertIs(self.profiler.section("update"), self.profiler.section("draw"))
+        self.assertEqual(self.profiler.sections, {})
+        self.assertEqual(len(self.profiler.frame_times), 0)
+
+    def test_sections_are_timed_over_the_window(self):
+        self.profiler.toggle()
+        for _ in range(6):
+            self.frame("update", "draw", "draw")
+        self.assertEqual(list(self.profiler.sections), ["update", "draw"])
+        self.assertEqual(len(self.profiler.sections["draw"]), 4)
+        names = [row[0] for row in self.profiler.stats()]
+        self.assertEqual(names, ["frame", "update", "draw"])
+
+    def test_nested_sections(self):
+        self.profiler.toggle()
+        self.profiler.begin_frame()
+        with self.profiler.section("update"):
+            with self.profiler.section("camera"):
+                pass
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.depths, {"update": 0, "camera": 1})
+        self.assertGreaterEqual(self.profiler.sections["update"][0], self.profiler.sections["camera"][0])
+
+    def test_percentile(self):
+        durations = list(range(1, 101))
+        self.assertEqual(percentile(durations, 95), 95)
+        self.assertEqual(percentile(durations, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_counted_frame(self):
+        profiler = FrameProfiler(count_every=1)
+        profiler.toggle()
+        surface_class = pygame.Surface
+        font = pygame.font.Font(None, 12)
+        profiler.begin_frame()
+        surface = pygame.Surface((10, 10))
+        self.assertIs(pygame.Surface, surface_class)
+        self.assertIsInstance(self.screen, pygame.Surface)  # Surfaces created before the frame keep their type
+        self.screen.blit(surface, (0, 0))
+        self.screen.blit(font.render("text", True, (255, 255, 255)), (0, 0))
+        pygame.transform.scale(surface, (20, 20))
+        profiler.end_frame()
+        self.assertEqual(profiler.counts, {"blits": 2, "renders": 1, "surfaces": 2})
+        self.assertIs(pygame.Surface, surface_class)
+        self.assertIsNone(sys.getprofile())
+        self.assertEqual(len(profiler.frame_times), 0)  # The counted frames are not timed
+
+    def test_disabled_during_counted_frame(self):
+        profiler = FrameProfiler(count_every=1)
+        profiler.toggle()
+        profiler.begin_frame()
+        profiler.toggle()
+        profiler.end_frame()
+        self.assertIsNone(sys.getprofile())
+        self.assertFalse(profiler.counting)
+
+    def test_overlay_draws(self):
+        self.profiler.toggle()
+        for _ in range(3):
+            self.frame("update")
+        overlay = ProfilerOverlay(self.profiler)
+        overlay.draw(self.screen)
+        self.assertEqual(len(overlay.rows()), 4)  # Header, frame, update and counts
+        self.assertEqual(overlay.text.get_width(), overlay.width)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Test module for the `rng` module.
+
+Tests that the random streams are reproducible from the seed, independent from each other,
+generated in blocks, and that snapshots of the service replay the exact same draws.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from src.engine.rng import RandomStream, RNGService
+
+
+class TestRandomStream(unittest.TestCase):
+
+    def test_same_seed_same_rolls(self):
+        """
+        Tests that two streams with the same seed and name draw the same values, within the die's range.
+        """
+        stream1, stream2 = RandomStream(42, "skill_checks"), RandomStream(42, "skill_checks")
+        rolls1 = [stream1.d20() for _ in range(200)]
+        rolls2 = [stream2.d20() for _ in range(200)]
+        self.assertEqual(rolls1, rolls2)
+        self.assertTrue(all(1 <= roll <= 20 for roll in rolls1))
+
+    def test_streams_are_independent(self):
+        """
+        Tests that streams with different names draw different values.
+        """
+        checks = RandomStream(42, "skill_checks")
+        ambient = RandomStream(42, "ambient")
+        self.assertNotEqual([checks.roll(0, 1000) for _ in range(20)], [ambient.roll(0, 1000) for _ in range(20)])
+
+    def test_rolls_are_generated_in_blocks(self):
+        """
+        Tests that the generator is only called once per block of rolls.
+        """
+        stream = RandomStream(1, "skill_checks", block_size=16)
+        for _ in range(16):
+            stream.d20()
+        self.assertEqual(stream.refills, 1)
+        stream.d20()
+        self.assertEqual(stream.refills, 2)
+
+
+class TestRNGService(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = RNGService()
+        self.rng.reseed(1234)
+
+    def test_singleton_pattern(self):
+        self.assertIs(RNGService(), self.rng)
+        self.assertEqual(RNGService(99).seed, 1234)  # Already initialized, the seed is kept
+
+    def test_stream_does_not_depend_on_creation_order(self):
+        """
+        Tests that creating another stream first does not change the values of a stream.
+        """
+        rolls = [self.rng.stream("skill_checks").d20() for _ in range(10)]
+        self.rng.reseed(1234)
+        self.rng.stream("ambient").d20()
+        self.assertEqual([self.rng.stream("skill_checks").d20() for _ in range(10)], rolls)
+
+    def test_snapshot_and_restore(self):
+        """
+        Tests that restoring a snapshot taken in the middle of a block replays the same rolls.
+        """
+        stream = self.rng.stream("skill_checks")
+        for _ in range(5):
+            stream.d20()
+        snapshot = self.rng.get_state()
+        expected = [self.rng.stream("skill_checks").d20() for _ in range(100)]
+
+        self.rng.reseed(999)
+        self.rng.set_state(snapshot)
+        self.assertEqual(self.rng.seed, 1234)
+        self.assertEqual([self.rng.stream("skill_checks").d20() for _ in range(100)], expected)
+
+    def test_random_seed_is_explicit(self):
+        self.rng.reseed(None)
+        self.assertIsInstance(self.rng.seed, int)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test module for the `rules` module.
+
+Tests that the quest rules of `scripts/rules.json` reproduce the item trades of the game, and that a rule
+is only evaluated when one of its inputs changes.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from types import SimpleNamespace
+from src.engine.rules import RuleEngine, load_rules
+from src.engine.events import event_bus, ConditionChanged
+from src.ui.inventory import Inventory
+
+
+class FakeScene:
+    """Scene with dialogue conditions publishing their changes like `Scene.change_conditions`."""
+
+    def __init__(self, game, name, conditions):
+        self.game, self.name, self.dialogue_conditions = game, name, conditions
+
+    def change_conditions(self, condition_name, value):
+        if self.dialogue_conditions[condition_name] != value:
+            old, self.dialogue_conditions[condition_name] = self.dialogue_conditions[condition_name], value
+            event_bus.publish(ConditionChanged(self.name, condition_name, old, value))
+
+
+class TestRuleEngine(unittest.TestCase):
+
+    def setUp(self):
+        game = SimpleNamespace(elevator_fixed=False)
+        for item in ['books', 'zip_tie', 'toolbox', 'coffee']:
+            setattr(game, item, SimpleNamespace(name=item))
+        game.room_101 = FakeScene(game, 'room_101', {'bed': 1, 'mirror': 1, 'tv': 1})
+        game.floor_1 = FakeScene(game, 'floor_1', {'npc_tabastan': 1, 'npc_camellia': 1, 'bookshelf': 1, 'stairs_up': 1})
+        game.floor_0 = FakeScene(game, 'floor_0', {'npc_vorakh': 1, 'npc_efrim': 1, 'npc_ersilia': 1, 'sofa': 1, 'door': 1})
+        game.scenes = SimpleNamespace(state=lambda name: getattr(game, name))
+        game.player = SimpleNamespace(inventory=Inventory())
+        game.rules = RuleEngine(game, load_rules())
+        game.rules.start()
+        self.game = game
+
+    def tearDown(self):
+        self.game.rules.stop()
+
+    def items(self):
+        return [item.name for item in self.game.player.inventory.items]
+
+    def test_quest_line(self):
+        """
+        Tests the whole quest: books traded for the zip tie, toolbox, coffee, and Vorakh fixing the elevator.
+        """
+        game = self.game
+        game.floor_1.change_conditions('bookshelf', 2)
+        self.assertEqual(self.items(), ['books'])
+        game.floor_1.change_conditions('npc_camellia', 2)
+        self.assertEqual(game.floor_1.dialogue_conditions['npc_camellia'], 3)
+        game.floor_1.change_conditions('npc_camellia', 4)
+        self.assertEqual(self.items(), ['zip_tie'])
+
+        game.room_101.change_conditions('bed', 2)
+        game.floor_0.change_conditions('npc_efrim', 2)
+        self.assertEqual(sorted(self.items()), ['coffee', 'toolbox', 'zip_tie'])
+        self.assertEqual(game.floor_0.dialogue_conditions['npc_vorakh'], 1)  # Not talked to yet
+        game.floor_0.change_conditions('npc_vorakh', 2)
+        self.assertEqual(game.floor_0.dialogue_conditions['npc_vorakh'], 3)
+
+        game.floor_0.change_conditions('npc_vorakh', 4)
+        self.assertTrue(game.elevator_fixed)
+        self.assertEqual(game.floor_0.dialogue_conditions['door'], 2)
+        self.assertEqual(self.items(), [])
+
+    def test_only_dependent_rules_are_evaluated(self):
+        rules = self.game.rules
+        before = dict(rules.evaluations)
+        self.game.floor_0.change_conditions('sofa', 2)  # No rule reads the sofa
+        self.game.floor_0.change_conditions('npc_efrim', 1)  # Unchanged
+        self.assertEqual(rules.evaluations, before)
+
+        self.game.room_101.change_conditions('bed', 2)
+        changed = {name for name in rules.evaluations if rules.evaluations[name] != before[name]}
+        self.assertIn('take_toolbox', changed)
+        self.assertNotIn('trade_books_for_zip_tie', changed)
+        self.assertIn('take_toolbox', rules.report())
+
+    def test_inactive_engine_ignores_changes(self):
+        rules = RuleEngine(self.game, load_rules())
+        self.game.floor_1.change_conditions('bookshelf', 2)
+        self.assertEqual(sum(rules.evaluations.values()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
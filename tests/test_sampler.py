@@ -0,0 +1,71 @@
+"""
+Test module for the `sampler` module.
+
+Tests that the timer signal samples the stacks of the main thread, that pausing stops the samples, and that the
+stacks are collapsed for the flamegraph tools.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import signal
+import unittest
+from src.engine.sampler import StackSampler, collapse
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@unittest.skipUnless(hasattr(signal, "setitimer"), "timer signals are only available on Unix")
+class TestStackSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.sampler = StackSampler(interval=0.001)
+
+    def tearDown(self):
+        self.sampler.stop()
+
+    def test_samples_the_running_function(self):
+        handler = signal.getsignal(signal.SIGALRM)
+        self.assertTrue(self.sampler.start())
+        busy(0.05)
+        self.sampler.stop()
+        samples = self.sampler.take()
+        self.assertGreater(len(samples), 5)
+        self.assertTrue(any(stack[-1][1] == "busy" for stack in samples))
+        self.assertEqual(signal.getsignal(signal.SIGALRM), handler)
+        self.assertEqual(self.sampler.take(), [])
+
+    def test_pause(self):
+        self.sampler.start()
+        self.sampler.pause()
+        busy(0.02)
+        self.assertEqual(self.sampler.take(), [])
+        self.sampler.resume()
+        busy(0.02)
+        self.assertTrue(self.sampler.take())
+
+    def test_max_samples(self):
+        self.sampler.max_samples = 2
+        self.sampler.start()
+        busy(0.03)
+        self.sampler.stop()
+        self.assertEqual(len(self.sampler.samples), 2)
+        self.assertGreater(self.sampler.dropped, 0)
+
+    def test_collapse(self):
+        stack = (("/game/main.py", "run", 10), ("/game/main.py", "draw", 20))
+        collapsed = collapse([stack, stack], lines=True)
+        self.assertEqual(len(collapsed), 1)
+        line, count = collapsed.popitem()
+        self.assertEqual(count, 2)
+        self.assertTrue(line.endswith("main.py:run:10;" + os.path.relpath("/game/main.py") + ":draw:20"))
+        self.assertEqual(list(collapse([stack])), [";".join(os.path.relpath(f) + ":" + n for f, n, _ in stack)])
+
+
+if __name__ == '__main__':
+    unittest.main()
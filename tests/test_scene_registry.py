@@ -0,0 +1,126 @@
+"""
+Test module for the `scene_registry` module.
+
+Tests that the scenes are built when needed, that the neighbours of the current scene are preloaded one per frame,
+that the far scenes are unloaded under a small budget and that their dialogue state survives the unloading.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from unittest.mock import patch
+from types import SimpleNamespace
+from concurrent.futures import wait
+import pygame
+from settings import WIDTH, HEIGHT, ROOM_WIDTH, ROOM_HEIGHT
+from src.scenes.scene_registry import SceneRegistry
+from src.engine.events import event_bus, SceneChanged
+from src.engine.assets import assets
+
+
+class TestSceneRegistry(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.registry = SceneRegistry(SimpleNamespace(screen=self.screen))
+
+    def tearDown(self):
+        self.registry.close()
+
+    def enter(self, name, old=None):
+        event_bus.publish(SceneChanged(old, name))
+
+    def test_start_builds_only_first_scene(self):
+        scene = self.registry.start("room_101")
+        self.assertEqual(scene.name, "room_101")
+        self.assertEqual(list(self.registry.loaded), ["room_101"])
+        self.assertEqual(self.registry.builds, 1)
+
+    def test_transitions(self):
+        graph = self.registry.transitions()
+        self.assertEqual(graph["room_101"], {"floor_1"})
+        self.assertEqual(graph["floor_1"], {"room_101", "floor_0"})
+        self.assertEqual(graph["floor_0"], {"floor_1", "underground"})
+        self.assertEqual(self.registry.distances("room_101")["underground"], 3)
+
+    def test_sizes_follow_layout(self):
+        room = (ROOM_WIDTH, ROOM_HEIGHT - 400)
+        floor_1 = ((WIDTH - room[0]) // 2 + 500, (HEIGHT - room[1]) // 2 - 600)
+        self.assertEqual(self.registry.size("room_101"), room)
+        self.assertEqual(self.registry.size("floor_1"), floor_1)
+
+    def test_neighbours_preloaded_one_per_frame(self):
+        self.registry.start("room_101")
+        self.enter("room_101")
+        self.assertEqual(list(self.registry.queue), ["floor_1"])
+        wait(self.registry.pending.values())
+        self.registry.update()
+        self.assertIn("floor_1", self.registry.loaded)
+        self.registry.update()
+        self.assertEqual(self.registry.builds, 2)
+        self.registry.get("floor_1")
+        self.assertEqual(self.registry.late_builds, 0)
+
+    def test_first_scene_neighbours_decoded_on_pool(self):
+        self.registry.start("room_101")
+        self.assertEqual(list(self.registry.pending), ["floor_1"])
+        self.assertEqual(list(self.registry.timings), ["room_101"])
+        self.assertGreater(self.registry.timings["room_101"]["decode"], 0)
+
+    def test_load_builds_from_decoded_images(self):
+        self.registry.start("room_101")
+        scenes = self.registry.load(["floor_1", "floor_0"])
+        self.assertEqual([scene.name for scene in scenes], ["floor_1", "floor_0"])
+        self.assertEqual(self.registry.pending, {})
+        for name in ("room_101", "floor_1", "floor_0"):
+            for path in self.registry.paths(name)[1:]:
+                self.assertNotIn(path, assets.decoded)  # Every decoded image was converted
+        self.assertIn("floor_0", self.registry.report())
+
+    def test_far_scenes_unloaded_over_budget(self):
+        self.registry.budget = 0
+        self.registry.start("room_101")
+        self.registry.get("floor_1")
+        self.registry.get("floor_0")
+        self.enter("floor_0", "floor_1")
+        self.assertNotIn("room_101", self.registry.loaded)
+        self.assertIn("floor_1", self.registry.loaded)  # Neighbours are kept whatever the budget
+        self.assertEqual(self.registry.unloads, 1)
+
+    def test_state_survives_unloading(self):
+        room = self.registry.start("room_101")
+        room.dialogue_conditions["tv"] = 2
+        managers = room.dialogue_managers
+        self.registry.unload("room_101")
+        self.assertEqual(self.registry.state("room_101").dialogue_conditions["tv"], 2)
+        room = self.registry.get("room_101")
+        self.assertEqual(room.dialogue_conditions["tv"], 2)
+        self.assertIs(room.dialogue_managers, managers)
+
+    def test_rebuilt_scene_keeps_its_dialogue_managers(self):
+        self.registry.start("room_101")
+        self.registry.unload("room_101")
+        with patch('src.scenes.hotel_scenes.load_scene_interactions') as load_scene_interactions:
+            self.registry.get("room_101")
+        load_scene_interactions.assert_not_called()
+
+    def test_close_stops_following_scene_changes(self):
+        self.registry.start("room_101")
+        self.registry.close()
+        self.enter("floor_1", "room_101")
+        self.assertIsNone(self.registry.current)
+        self.assertEqual(list(self.registry.queue), [])
+        self.assertIsNone(self.registry.pool)
+        callbacks = [callback for callback, queued in event_bus.subscribers.get(SceneChanged, [])]
+        self.assertNotIn(self.registry.scene_changed, callbacks)
+
+    def test_state_of_unbuilt_scene(self):
+        self.registry.start("room_101")
+        self.registry.state("floor_1").change_conditions("bookshelf", 2)
+        self.assertEqual(self.registry.get("floor_1").dialogue_conditions["bookshelf"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test module for the `scheduler` module.
+
+Tests that the `FrameScheduler` sleeps until the deadline of a static state, never sleeps for a state that
+has to be updated every frame, and stops rendering while the window is in the background.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from unittest.mock import patch, MagicMock
+import pygame
+from src.engine.scheduler import FrameScheduler
+
+NO_EVENT = pygame.event.Event(pygame.NOEVENT)
+KEY_Z = pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_z})
+FOCUS_LOST = pygame.event.Event(pygame.WINDOWFOCUSLOST)
+FOCUS_GAINED = pygame.event.Event(pygame.WINDOWFOCUSGAINED)
+
+
+@patch('src.engine.scheduler.pygame.event.wait', return_value=NO_EVENT)
+@patch('src.engine.scheduler.pygame.event.get', side_effect=lambda: [])
+class TestFrameScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FrameScheduler(max_wait_ms=500)
+        self.states = MagicMock()
+        self.states.needs_redraw.return_value = False
+
+    def test_static_state_waits_until_deadline(self, mock_get, mock_wait):
+        self.states.idle_timeout.return_value = 240
+        self.assertEqual(self.scheduler.get_events(self.states), [])
+        mock_wait.assert_called_once_with(240)
+        self.assertEqual(self.scheduler.waits, 1)
+
+    def test_dynamic_state_never_waits(self, mock_get, mock_wait):
+        self.states.idle_timeout.return_value = None
+        self.scheduler.get_events(self.states)
+        mock_wait.assert_not_called()
+
+    def test_pending_events_are_not_delayed(self, mock_get, mock_wait):
+        mock_get.side_effect = lambda: [KEY_Z]
+        self.states.idle_timeout.return_value = 240
+        self.assertEqual(self.scheduler.get_events(self.states), [KEY_Z])
+        mock_wait.assert_not_called()
+
+    def test_unfocused_window_is_not_rendered(self, mock_get, mock_wait):
+        """
+        Tests that losing the focus stops the rendering and makes the loop sleep, even for a dynamic state.
+        """
+        mock_get.side_effect = lambda: [FOCUS_LOST]
+        self.states.needs_redraw.return_value = True
+        self.states.idle_timeout.return_value = None
+        self.scheduler.get_events(self.states)
+        self.assertFalse(self.scheduler.should_render(self.states))
+
+        mock_get.side_effect = lambda: []
+        mock_wait.return_value = FOCUS_GAINED
+        self.assertEqual(self.scheduler.get_events(self.states), [FOCUS_GAINED])
+        mock_wait.assert_called_once_with(500)
+        self.assertTrue(self.scheduler.should_render(self.states))
+        self.assertEqual((self.scheduler.rendered, self.scheduler.skipped), (1, 1))
+        self.assertIs(self.states.current.full_redraw, True)  # The window content may have been lost
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Test module for the `script_bundle` module.
+
+This module tests the compilation of dialogue scripts into graphs and the incremental rebuild of the bundle:
+scripts are compiled once, read back from the bundle, and compiled again only when their content changes.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+from src.engine.script_bundle import ScriptBundle, compile_script
+
+
+class TestCompileScript(unittest.TestCase):
+    """
+    Test cases for the `compile_script` function.
+    """
+    def test_compile_script(self):
+        """
+        Tests that the compiled graph indexes the nodes by title and keeps the key-to-node mapping.
+        """
+        nodes = [
+            {'title': 'Start', 'body': 'Hello', 'key': {'1': 'End'}},
+            {'title': 'End', 'body': 'Goodbye'},
+            {'title': 'End', 'body': 'Duplicate'}
+        ]
+        graph = compile_script(nodes)
+        self.assertIs(graph['nodes'], nodes)
+        self.assertEqual(graph['key_to_node'], {'Start': {'1': 'End'}})
+        self.assertIs(graph['node_index']['Start'], nodes[0])
+        self.assertIs(graph['node_index']['End'], nodes[1])  # First node with the title wins
+
+
+class TestScriptBundle(unittest.TestCase):
+    """
+    Test cases for the `ScriptBundle` class, using a temporary scripts folder and bundle file.
+    """
+    def setUp(self):
+        """
+        Creates a temporary scripts folder with one scene containing two scripts.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.temp_dir.name, 'scripts')
+        self.scene_dir = os.path.join(self.scripts_dir, 'scene')
+        self.bundle_path = os.path.join(self.temp_dir.name, 'cache', 'scripts.bundle')
+        os.makedirs(self.scene_dir)
+        self.write_script('door.json', [{'title': 'Start', 'body': 'A door.'}])
+        self.write_script('sofa.json', [{'title': 'Start', 'body': 'A sofa.'}])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_script(self, filename, nodes):
+        with open(os.path.join(self.scene_dir, filename), 'w', encoding='utf8') as file:
+            json.dump(nodes, file)
+
+    def test_get_scene_compiles_and_saves(self):
+        """
+        Tests that the first request compiles every script of the scene and writes the bundle.
+        """
+        bundle = ScriptBundle(self.scripts_dir, self.bundle_path)
+        graphs = bundle.get_scene(self.scene_dir)
+        self.assertEqual(sorted(graphs), ['door', 'sofa'])
+        self.assertEqual(graphs['door']['node_index']['Start']['body'], 'A door.')
+        self.assertEqual(bundle.compiled_count, 2)
+        self.assertTrue(os.path.exists(self.bundle_path))
+
+    def test_reload_uses_bundle(self):
+        """
+        Tests that a new bundle instance reads the graphs back without compiling anything.
+        """
+        ScriptBundle(self.scripts_dir, self.bundle_path).build()
+        bundle = ScriptBundle(self.scripts_dir, self.bundle_path)
+        graphs = bundle.get_scene(self.scene_dir)
+        self.assertEqual(sorted(graphs), ['door', 'sofa'])
+        self.assertEqual(bundle.compiled_count, 0)
+
+    def test_only_changed_scripts_are_recompiled(self):
+        """
+        Tests that only the modified script is compiled again, and that touching a file without
+        changing its content does not trigger a compilation.
+        """
+        ScriptBundle(self.scripts_dir, self.bundle_path).build()
+        self.write_script('door.json', [{'title': 'Start', 'body': 'A locked door.'}])
+        sofa_path = os.path.join(self.scene_dir, 'sofa.json')
+        os.utime(sofa_path, ns=(0, 0))
+
+        bundle = ScriptBundle(self.scripts_dir, self.bundle_path)
+        graphs = bundle.get_scene(self.scene_dir)
+        self.assertEqual(bundle.compiled_count, 1)
+        self.assertEqual(graphs['door']['node_index']['Start']['body'], 'A locked door.')
+
+    def test_new_script_is_picked_up(self):
+        """
+        Tests that a script added to a scene folder after the build is found and compiled.
+        """
+        ScriptBundle(self.scripts_dir, self.bundle_path).build()
+        self.write_script('clock.json', [{'title': 'Start', 'body': 'A clock.'}])
+        os.utime(self.scene_dir, ns=(1, 1))  # Make sure the folder mtime changes
+
+        bundle = ScriptBundle(self.scripts_dir, self.bundle_path)
+        graphs = bundle.get_scene(self.scene_dir)
+        self.assertIn('clock', graphs)
+        self.assertEqual(bundle.compiled_count, 1)
+
+    def test_corrupted_bundle_is_rebuilt(self):
+        """
+        Tests that a corrupted bundle file is discarded and the scripts are compiled again.
+        """
+        os.makedirs(os.path.dirname(self.bundle_path))
+        with open(self.bundle_path, 'wb') as file:
+            file.write(b'not a bundle')
+        bundle = ScriptBundle(self.scripts_dir, self.bundle_path)
+        self.assertEqual(len(bundle.get_scene(self.scene_dir)), 2)
+        self.assertEqual(bundle.compiled_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Test module for the `startup_trace` module.
+
+Tests that the trace times the init steps and the imports, nested ones included, and that it stops and reports
+at the first frame.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import tempfile
+from src.engine.startup_trace import StartupTrace
+
+
+class TestStartupTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.trace = StartupTrace()
+        self.modules = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.modules.name, "traced_outer.py"), "w") as file:
+            file.write("import traced_inner\n")
+        with open(os.path.join(self.modules.name, "traced_inner.py"), "w") as file:
+            file.write("VALUE = 1\n")
+        sys.path.insert(0, self.modules.name)
+
+    def tearDown(self):
+        self.trace.stop()
+        sys.path.remove(self.modules.name)
+        for name in ("traced_outer", "traced_inner"):
+            sys.modules.pop(name, None)
+        self.modules.cleanup()
+
+    def test_inactive_trace_records_nothing(self):
+        with self.trace.step("menus"):
+            pass
+        self.assertEqual(self.trace.records, [])
+        self.trace.frame_presented()
+        self.assertIsNone(self.trace.first_frame)
+
+    def test_imports_are_timed_and_nested(self):
+        self.trace.start()
+        with self.trace.step("scenes"):
+            import traced_outer
+        records = {record.name: record for record in self.trace.records}
+        self.assertEqual(records["traced_outer"].kind, "import")
+        self.assertEqual(records["traced_inner"].depth, records["traced_outer"].depth + 1)
+        self.assertEqual(records["scenes"].depth, 0)
+        self.assertGreaterEqual(records["scenes"].duration, records["traced_outer"].duration)
+        self.assertAlmostEqual(records["traced_outer"].nested, records["traced_inner"].duration)
+
+    def test_first_frame_stops_and_reports(self):
+        self.trace.start()
+        with self.trace.step("display"):
+            pass
+        self.trace.frame_presented()
+        self.assertFalse(self.trace.active)
+        self.assertNotIn(self.trace.timer, sys.meta_path)
+        self.assertIsNotNone(self.trace.first_frame)
+        report = self.trace.report()
+        self.assertTrue(report.startswith("first frame after"))
+        self.assertIn("display", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test module for the `state_machine` module.
+
+Tests that the `StateMachine` dispatches to the current state, runs the enter and exit hooks once per
+transition, only redraws static states when they are dirty, and returns the areas a static state changed when
+it is not redrawn whole.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from unittest.mock import MagicMock
+import pygame
+from src.engine.state_machine import State, StateMachine
+from src.scenes.game_states import MenuState
+from src.ui.animated_sequence import black_bg
+
+
+class RecordingState(State):
+    """State recording the calls to its hooks, going to `next_state` on any event."""
+
+    def __init__(self, name, next_state=None, static=False):
+        super().__init__(name)
+        self.next_state = next_state
+        self.static = static
+        self.calls = []
+        self.rects = [pygame.Rect(0, 0, 10, 10)]
+
+    def enter(self, previous):
+        self.calls.append(('enter', previous))
+
+    def exit(self, next_state):
+        self.calls.append(('exit', next_state))
+
+    def handle_event(self, event):
+        self.calls.append(('event', event.type))
+        return self.next_state
+
+    def draw(self):
+        self.calls.append(('draw',))
+        return self.rects
+
+
+class TestStateMachine(unittest.TestCase):
+
+    def setUp(self):
+        self.on_change = MagicMock()
+        self.machine = StateMachine(on_change=self.on_change)
+        self.menu = self.machine.add(RecordingState('menu', next_state='play', static=True))
+        self.play = self.machine.add(RecordingState('play'))
+        self.machine.change('menu')
+
+    def test_enter_and_exit_run_once(self):
+        event = pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_z})
+        self.machine.handle_event(event)
+        self.machine.change('play')  # Already current, nothing happens
+        self.assertEqual(self.menu.calls, [('enter', None), ('event', pygame.KEYDOWN), ('exit', 'play')])
+        self.assertEqual(self.play.calls, [('enter', 'menu')])
+        self.assertEqual(self.machine.current_name, 'play')
+        self.assertEqual(self.machine.transitions, 2)
+        self.on_change.assert_called_with('play')
+
+    def test_static_state_redraws_only_when_dirty(self):
+        self.assertTrue(self.machine.needs_redraw())  # Just entered
+        self.machine.draw()
+        self.assertFalse(self.machine.needs_redraw())
+        self.menu.next_state = None
+        self.machine.handle_event(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_DOWN}))
+        self.assertTrue(self.machine.needs_redraw())
+
+    def test_dynamic_state_always_redraws(self):
+        self.machine.change('play')
+        self.machine.draw()
+        self.assertTrue(self.machine.needs_redraw())
+        self.assertTrue(self.machine.needs_full_redraw())
+
+    def test_static_state_returns_its_dirty_rects(self):
+        self.assertTrue(self.machine.needs_full_redraw())  # Just entered
+        self.assertEqual(self.machine.draw(), self.menu.rects)
+        self.assertFalse(self.machine.needs_full_redraw())
+        self.machine.change('play')
+        self.machine.change('menu')
+        self.assertTrue(self.machine.needs_full_redraw())
+
+    def test_menu_redrawn_whole_on_new_background_frame(self):
+        menu = MenuState('menu', MagicMock())
+        count = black_bg.count
+        try:
+            menu.draw()
+            menu.full_redraw = False
+            self.assertFalse(menu.needs_full_redraw())
+            black_bg.count += 1
+            self.assertTrue(menu.needs_full_redraw())
+        finally:
+            black_bg.count = count
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Test module for the `watchdog` module.
+
+Tests that only the frames over the budget are logged, with their sections, context and sampled stacks, that the
+counted frames of the profiler are skipped, and that the log is rotated.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+import unittest
+import tempfile
+from src.engine.watchdog import FrameWatchdog, read_slow_frames
+from src.engine.profiler import FrameProfiler
+
+
+class TestFrameWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp.name, 'logs', 'slow_frames.jsonl')
+        self.watchdog = FrameWatchdog(self.path, budget_ms=10, sample_ms=1, context=lambda: {"state": "game"})
+        self.profiler = FrameProfiler()
+        self.profiler.watch(self.watchdog)
+        self.watchdog.start()
+
+    def tearDown(self):
+        self.watchdog.stop()
+        self.temp.cleanup()
+
+    def frame(self, seconds):
+        self.profiler.begin_frame()
+        with self.profiler.section("update"):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                pass
+        self.profiler.end_frame()
+
+    def test_only_slow_frames_are_logged(self):
+        self.frame(0)
+        self.frame(0.03)
+        self.frame(0)
+        self.watchdog.stop()
+        records = read_slow_frames(self.path)
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["frame"], 2)
+        self.assertEqual(record["state"], "game")
+        self.assertGreater(record["duration_ms"], 10)
+        self.assertIn("update", record["sections"])
+        if self.watchdog.sampler.available:
+            self.assertGreater(record["samples"], 0)
+            self.assertTrue(any(":frame:" in stack for stack in record["stacks"]))
+
+    def test_sections_timed_while_overlay_hidden(self):
+        self.assertFalse(self.profiler.enabled)
+        self.profiler.begin_frame()
+        self.assertIsNot(self.profiler.section("update"), self.profiler.section("draw"))
+        self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.frame_times), 0)  # The statistics are only kept for the overlay
+
+    def test_counted_frames_are_skipped(self):
+        self.assertIsNone(self.watchdog.end_frame(50, {}, skip=True))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_log_rotation(self):
+        watchdog = FrameWatchdog(self.path, budget_ms=0, max_bytes=200, backups=2)
+        for _ in range(10):
+            watchdog.end_frame(5, {"update": 5.0})
+        watchdog.stop()
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
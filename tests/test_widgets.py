@@ -0,0 +1,113 @@
+"""
+Test module for the `widgets` module.
+
+Tests that the widgets only render their text again when it, the selection or the value changes, that they
+report the areas to redraw, and that the menus ported onto them do not render anything on a still frame.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import pygame
+from src.ui.widgets import Label, Paragraph, OptionList, Slider, draw_widgets
+from src.scenes.main_menu import MainMenu
+from src.scenes.options_menu import OptionsMenu
+from src.scenes.death_menu import DeathMenu
+
+
+class TestWidgets(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+        self.font = pygame.font.Font("assets/fonts/Helvetica-Bold.ttf", 26)
+
+    def test_label_renders_only_on_change(self):
+        label = Label(self.font, "Newsun", center=(400, 150))
+        self.assertEqual(label.items[0][1].center, (400, 150))
+        label.set_text("Newsun")
+        self.assertEqual(label.renders, 1)
+        label.pop_dirty_rects()
+        label.set_text("Newsun!")
+        self.assertEqual(label.renders, 2)
+        self.assertEqual(len(label.pop_dirty_rects()), 2)  # Old and new area
+        self.assertEqual(label.pop_dirty_rects(), [])
+
+    def test_paragraph_lines(self):
+        paragraph = Paragraph(self.font, "one\ntwo\nthree", (50, 100), 30)
+        self.assertEqual([rect.topleft for _, rect in paragraph.items], [(50, 100), (50, 130), (50, 160)])
+        paragraph.set_text("one\ntwo\nthree")
+        self.assertEqual(paragraph.renders, 3)
+
+    def test_option_list_selection_does_not_render(self):
+        options = OptionList(self.font, ["Resume", "Options", "Exit"], (400, 250), 50)
+        renders = options.renders
+        options.pop_dirty_rects()
+        options.select(2)
+        self.assertEqual(options.renders, renders)
+        self.assertTrue(options.pop_dirty_rects())
+        self.assertIs(options.items[2][0], options.rendered[2][1])  # Bright surface for the selected option
+        self.assertIs(options.items[0][0], options.rendered[0][0])
+        options.set_option(0, "Back")
+        self.assertEqual(options.renders, renders + 2)
+
+    def test_slider_value(self):
+        slider = Slider((400, 350), 200, 0.3)
+        self.assertEqual(slider.items[0][1].topleft, (300, 345))
+        slider.set_value(0.3)
+        self.assertEqual(slider.renders, 1)
+        slider.set_value(0.4)
+        self.assertEqual(slider.renders, 2)
+
+    def test_hidden_widget_is_not_drawn(self):
+        slider = Slider((400, 350), 200, 1.0)
+        slider.set_visible(False)
+        self.screen.fill((0, 0, 0))
+        draw_widgets(self.screen, [slider])
+        self.assertEqual(self.screen.get_at((300, 350))[:3], (0, 0, 0))
+        slider.set_visible(True)
+        draw_widgets(self.screen, [slider])
+        self.assertEqual(self.screen.get_at((300, 350))[:3], (255, 255, 255))
+
+
+class TestMenusRetained(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((800, 600))
+
+    def renders(self, menu):
+        return sum(widget.renders for widget in menu.widgets)
+
+    def test_main_menu_still_frame(self):
+        menu = MainMenu(self.screen)
+        menu.draw()
+        renders = self.renders(menu)
+        self.assertEqual(menu.draw(), [])
+        menu.selected_option = 1
+        self.assertTrue(menu.draw())
+        self.assertEqual(self.renders(menu), renders)
+
+    def test_options_menu_volume(self):
+        menu = OptionsMenu(self.screen)
+        menu.draw()
+        renders = self.renders(menu)
+        menu.volume = 0.5
+        menu.draw()
+        self.assertEqual(menu.option_list.options[0], "Volume: 50%")
+        self.assertEqual(self.renders(menu), renders + 3)  # Both versions of the option, and the slider
+        menu.selected_option = 1
+        menu.draw()
+        self.assertFalse(menu.slider.visible)
+
+    def test_death_menu_type(self):
+        menu = DeathMenu(self.screen)
+        self.assertEqual(menu.death_text.text, "You lost.")
+        menu.d_type = "health"
+        menu.draw()
+        self.assertEqual(len(menu.death_text.items), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()